@@ -1,45 +1,99 @@
 import sys
-import tkinter as tk
-import requests
-from ttkHyperlinkLabel import HyperlinkLabel
-import myNotebook as nb
-from config import config
-import json
-from os import path
-import tkinter.ttk as ttk
-from datetime import datetime
 import time
+_importStarted = time.perf_counter()  # Measured against the end of this file for the startup budget
+
+# Only cheap modules are imported here; tkinter, requests, EDMC modules and friends are imported
+# where they are first used so loading the plugin does not add to EDMC's launch time
+import json
+import marshal
+import os
+import queue
+# threading is imported here on purpose: queue imports it anyway, and the webhook Condition and status
+# Lock must exist before any thread could race to create them
 import threading
+from bisect import bisect_left
+from collections import deque
+from os import path
 
+this = sys.modules[__name__]  # For holding module globals
 
+def debug_log(message, *args):
+	"""Queue a debug message for debug.log; args are only formatted into message when logging is enabled"""
+	if not this.enableDebugLogging:
+		return  # Costs one attribute lookup when logging is disabled
+	if args:
+		try:
+			message = message.format(*args)
+		except Exception:
+			message = f"{message} {args!r}"
+	this.logQueue.put((time.time(), message))
+
+def start_log_writer():
+	"""Start the thread that owns debug.log, if it is not already running"""
+	if this.logWriter is not None and this.logWriter.is_alive():
+		return
+	this.logWriter = threading.Thread(target=write_debug_log, args=(path.join(get_plugin_path(), "debug.log"),), name="CargoManifestLog", daemon=True)
+	this.logWriter.start()
 
-this = sys.modules[__name__]  # For holding module globals
+def stop_log_writer():
+	"""Flush queued debug messages and stop the writer thread"""
+	if this.logWriter is None:
+		return
+	this.logQueue.put(None)
+	this.logWriter.join(timeout=2)
+	this.logWriter = None
 
-def debug_log(message):
-	"""Write debug messages to a log file"""
-	# Check if debug logging is enabled - check both the global setting and the UI variable
-	debug_enabled = False
-	if hasattr(this, 'enableDebugLogging'):
-		debug_enabled = this.enableDebugLogging
-	if hasattr(this, 'enableDebugLoggingVar'):
-		debug_enabled = debug_enabled or this.enableDebugLoggingVar.get()
-	
-	if not debug_enabled:
-		return  # Skip logging if debug logging is disabled
-	
+def write_debug_log(logPath):
+	"""Writer thread: append queued messages to logPath through one open handle, rotating it by size"""
 	try:
-		directoryName = path.basename(path.dirname(__file__)) or 'CargoManifest'
-		pluginPath = path.join(config.plugin_dir, directoryName)
-		logPath = path.join(pluginPath, "debug.log")
-		timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-		with open(logPath, 'a', encoding='utf-8') as f:
-			f.write(f"[{timestamp}] {message}\n")
-	except:
-		pass  # Silently fail if logging doesn't work
+		f = open(logPath, 'a', encoding='utf-8')
+	except OSError:
+		stop_debug_logging()  # Nowhere to log; messages are dropped as they always were
+		return
+	try:
+		while True:
+			record = this.logQueue.get()
+			lines = []
+			# Drain everything that queued up while we were writing in one go
+			while record is not None:
+				timestamp, message = record
+				lines.append(f"[{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))}] {message}\n")
+				try:
+					record = this.logQueue.get_nowait()
+				except queue.Empty:
+					break
+			if lines:
+				f.write(''.join(lines))
+				f.flush()
+				if f.tell() >= LOG_MAX_BYTES:
+					f.close()
+					rotate_debug_log(logPath)
+					f = open(logPath, 'a', encoding='utf-8')
+			if record is None:
+				return
+	except Exception:
+		stop_debug_logging()  # Silently fail if logging doesn't work
+	finally:
+		f.close()
+
+def stop_debug_logging():
+	"""Turn debug logging off after the writer thread failed, so nothing piles up in a queue no one reads"""
+	this.enableDebugLogging = False
+	try:
+		while True:
+			this.logQueue.get_nowait()
+	except queue.Empty:
+		pass
+
+def rotate_debug_log(logPath):
+	"""Shift debug.log to debug.log.1, debug.log.1 to debug.log.2 and so on, keeping LOG_BACKUPS old files"""
+	for index in range(LOG_BACKUPS - 1, 0, -1):
+		if path.exists(f"{logPath}.{index}"):
+			os.replace(f"{logPath}.{index}", f"{logPath}.{index + 1}")
+	os.replace(logPath, f"{logPath}.1")
 
 # Discord Rich Presence - using native implementation
 DISCORD_RPC_AVAILABLE = True
-debug_log("Discord Rich Presence available (native implementation)")
 
 this.cargoDict = {}
 this.eddbData = {}
@@ -57,35 +111,281 @@ this.currentStation = "Unknown"
 this.currentSystem = "Unknown"
 this.currentShipName = "Unknown"
 this.currentShipType = "Unknown"
-this.purchaseHistory = {}  # Track cargo purchases: {cargo_name: {quantity: int, avg_price: float, total_cost: int}}
+this.purchaseHistory = {}  # Track cargo purchases: {cargo_name: {quantity: int, avg_price: float, total_cost: int, lots: deque of [quantity, unit cost]}}
+this.costBasis = 'fifo'  # Which purchase lots a sale is costed against, one of COST_BASIS_POLICIES
 this.commanderName = "Unknown"
 this.webhookAvatar = ""  # Custom avatar URL for webhook
 this.webhookBotName = "Cargo Manifest Bot"  # Custom bot name for webhook
 this.webhookBotImage = ""  # Custom bot image URL for webhook
+this.webhookBatchWindow = 3.0  # Seconds trade embeds wait to be sent together in one message
 this.totalTradeProfit = 0  # Track total trade profits/losses
 this.enableDiscordRPC = False  # Discord Status Updates setting
 this.discordStatusWebhook = ""  # Separate webhook URL for status updates
 this.discordRPCThread = None  # Thread for Discord status updates
 this.lastStatusUpdate = 0  # Timestamp of last status update for rate limiting
+this.statusMinInterval = 15.0  # Fewest seconds between two status updates; changes in between are coalesced
+this.lastStatusFingerprint = None  # Fingerprint of the last status sent, to skip identical ones
+this.pendingStatus = None  # (webhook URL, embed, fingerprint) held back by the minimum interval; newest wins
+this.statusTimer = None  # threading.Timer that sends pendingStatus once the interval is up
+this.statusLock = threading.Lock()  # Guards the status fields above; the timer runs on its own thread
+this.statusMessages = {}  # Webhook URL -> id of the status message edited in place, loaded from status_messages.json by open_outbox()
+this.statusMessagesLock = threading.Lock()  # Guards statusMessages and its file; sender threads share them
 this.budgetGoal = 0  # Credit goal for budget tracking
 this.budgetEnabled = False  # Whether budget tracking is enabled
 this.cargoRacks = []  # List of equipped cargo racks with their details
 this.enableDebugLogging = False  # Whether debug logging is enabled
+this.logQueue = queue.SimpleQueue()  # (time, message) records waiting for the debug.log writer thread
+this.logWriter = None  # Thread started by start_log_writer() while debug logging is enabled
+this.ledgerQueue = queue.SimpleQueue()  # Trade rows waiting for the ledger.db writer thread
+this.ledgerWriter = None  # Thread started by the first trade, see start_ledger_writer()
+this.ledgerWritten = 0  # Trade rows committed to ledger.db this session
+this.ledgerFailed = False  # Set when ledger.db could not be opened; trades are not queued for it for the rest of the session
+this.tradeBackfill = False  # Rebuild purchaseHistory/totalTradeProfit from past journals on startup
+this.backfillPending = None  # (entry, trade context) for live MarketBuy/MarketSell seen while the backfill runs, replayed on top of its result
 
 this.version = 'v3.0.3'
+this.items = {}  # Commodity catalog keyed by lowercased FDev symbol
+this.catalog = {'symbol': {}, 'id': {}, 'name': {}, 'category': {}}  # Lookup indexes built by set_catalog()
+this.itemsHash = None  # SHA-1 of the FDevIDs CSVs the catalog was built from
+this.newest = -1  # Result of checkVersion(): -1 unknown/error, 0 update available, 1 newest
+this.uiQueue = queue.SimpleQueue()  # Callbacks waiting to run on the Tk main thread
+this.dirtySections = set()  # Dropdown sections whose labels are stale and need redrawing
+this.renderScheduled = False  # Whether flush_render() is already queued for the next idle cycle
+this.visibleSection = "Manifest"  # Dropdown section currently shown
+this.journalHandlers = {}  # Journal event name -> handler(entry, state), filled by @journal_handler
+this.journalStats = {}  # Journal event name -> [calls, cumulative handler seconds]
+this.lastTraceDump = None  # time.monotonic() of the last dump triggered by an error
+this.latency = {}  # (kind, name) -> [bucket counts, samples, max seconds], filled by record_latency()
+this.diagnosticsTimer = None  # Tk after() id of the pending Diagnostics refresh
+this.webhookLanes = {}  # (webhook URL, kind) -> deque of deliveries waiting for the worker, oldest first; dict order is the round-robin order
+this.webhookQueued = 0  # Deliveries across all lanes
+this.webhookCondition = threading.Condition()  # Guards the lanes and rate limits and wakes the worker
+this.webhookWorker = None  # Dispatcher thread draining webhookLanes, started on the first send
+this.sendQueue = queue.Queue()  # Deliveries handed from the dispatcher to the sender threads
+this.webhookInFlight = set()  # Destinations with a delivery being sent; each gets one at a time so its order is kept
+this.sinks = []  # Extra notification destinations from sinks.json, see load_sinks()
+this.sinkStats = {}  # Destination -> {'sent': n, 'failed': n}, shown in Diagnostics
+this.rateLimits = {}  # Webhook route -> [requests remaining, time.monotonic() the bucket resets], from Discord's X-RateLimit-* headers
+this.globalRateLimitUntil = 0.0  # time.monotonic() before which Discord asked for no requests at all
+this.webhookBackoff = {}  # Webhook route -> seconds to wait before retrying after the last failed send
+this.outbox = None  # sqlite3 connection to outbox.db holding trade payloads until Discord accepts them
+this.outboxUnsaved = []  # Trade deliveries queued since the worker last wrote the outbox
+this.outboxAcked = 0  # Rows acknowledged since the last compaction
+this.webhookStopping = False  # Set by plugin_stop(); the worker drains what is left and exits
+this.httpSessions = {}  # Host -> pooled keep-alive requests.Session used for webhook traffic
+this.webhookStats = {'queued': 0, 'sent': 0, 'failed': 0, 'dropped': 0, 'expired': 0, 'paced': 0, 'rateLimited': 0, 'batched': 0, 'retried': 0, 'statusUnchanged': 0, 'statusCoalesced': 0, 'statusSuperseded': 0, 'statusEdited': 0}  # Delivery counters shown in Diagnostics
+this.offline = False  # Skip network fetches; set by tools/replay.py when replaying journals
+this.startupTimings = {'import': None, 'plugin_start3': None}  # Seconds, reported by tools/startup_timing.py
+
+FDEVIDS_COMMODITY_URL = 'https://raw.githubusercontent.com/EDCD/FDevIDs/master/commodity.csv'
+FDEVIDS_RARE_URL = 'https://raw.githubusercontent.com/EDCD/FDevIDs/master/rare_commodity.csv'
+RELEASES_URL = 'https://api.github.com/repos/inerdy/cargo-manifest-remastered/releases/latest'
+FETCH_TIMEOUT = (5, 15)  # (connect, read) timeout in seconds for each background request
+FETCH_DEADLINE = 30  # Hard limit in seconds for the whole background refresh
+ITEMS_CACHE_VERSION = 1  # Bump when the layout of items.cache changes
+TRADE_BACKFILL_VERSION = 2  # Bump when the layout of trade_backfill.json changes
+COST_BASIS_POLICIES = {'fifo': "First in, first out", 'lifo': "Last in, first out", 'average': "Average cost"}  # Setting value -> label
+TRADE_EVENTS = ('MarketBuy', 'MarketSell')  # Journal events that feed purchaseHistory/totalTradeProfit
+JOURNAL_POOL_MIN_BYTES = 64 * 1024 * 1024  # Below this a journal scan is faster than starting worker processes
+LOG_MAX_BYTES = 2 * 1024 * 1024  # debug.log is rotated once it grows past this
+LOG_BACKUPS = 3  # Rotated debug.log.N files kept
+TRACE_SIZE = 2000  # Records kept in the in-memory trace ring buffer
+TRACE_FIELDS = ('Type', 'Count', 'StarSystem', 'StationName', 'Ship', 'Name', 'MarketID')  # Entry keys copied into trace records
+TRACE_DUMPS_KEPT = 5  # trace-*.jsonl files kept in the traces folder
+TRACE_DUMP_INTERVAL = 60  # Minimum seconds between dumps caused by errors
+LATENCY_BOUNDS = tuple(1e-6 * 2 ** (i / 2) for i in range(56))  # Histogram bucket upper bounds in seconds, 1 us to ~3 min, sqrt(2) apart
+DIAGNOSTICS_REFRESH_MS = 2000  # How often the Diagnostics section redraws while it is shown
+WEBHOOK_QUEUE_SIZE = 1000  # Deliveries held in memory before the overflow policy kicks in
+WEBHOOK_OVERFLOW = {'trade': 'drop_oldest', 'status': 'drop_newest'}  # What a full queue gives up for each kind, after queued status updates
+WEBHOOK_TIMEOUT = (5, 10)  # (connect, read) timeout in seconds for each webhook request
+WEBHOOK_POOL_SIZE = 4  # Keep-alive connections kept open per webhook host
+WEBHOOK_BATCH_SIZE = 10  # Most embeds Discord accepts in one webhook message
+WEBHOOK_MAX_AGE = {'status': 300, 'trade': 7 * 24 * 3600}  # Seconds after which a queued delivery is stale and dropped
+WEBHOOK_RETRY_MIN = 2  # First wait in seconds before retrying a webhook that failed, doubled on each failure
+WEBHOOK_RETRY_MAX = 300  # Longest wait between retries while Discord or the network is down
+OUTBOX_VERSION = 2  # Bump when the outbox.db schema changes
+OUTBOX_COMPACT_EVERY = 200  # Acknowledged rows allowed to pile up before they are deleted
+LEDGER_VERSION = 1  # Bump when the ledger.db schema changes; older tables are kept under another name
+WEBHOOK_SHUTDOWN_TIMEOUT = 3  # Seconds plugin_stop() waits for queued webhooks to go out
+WEBHOOK_SENDERS = 4  # Threads sending to different destinations at once, so a slow one never holds up the rest
+SINK_TYPES = ('discord', 'http', 'file')  # Destination types sinks.json can name
+SINK_EVENTS = ('buy', 'sell', 'status')  # Notifications a sink can filter on
+
+this.traceBuffer = deque(maxlen=TRACE_SIZE)  # Recent (time, kind, name, handler, seconds, fields, error) records, see dump_trace()
+
+def get_plugin_path():
+	"""Return the plugin folder that holds items.json and other local data"""
+	from config import config
+	directoryName = path.basename(path.dirname(__file__)) or 'CargoManifest'
+	return path.join(config.plugin_dir, directoryName)
 
-def checkVersion():
+def load_http_cache():
+	"""Load the ETag/Last-Modified validators saved by the last background refresh"""
 	try:
-		req = requests.get(url='https://api.github.com/repos/inerdy/cargo-manifest-remastered/releases/latest')
+		with open(path.join(get_plugin_path(), "http_cache.json"), 'r') as f:
+			return json.load(f)
+	except Exception:
+		return {}
+
+def save_http_cache(cache):
+	"""Persist validators so the next startup can make conditional requests"""
+	try:
+		write_file_atomic(path.join(get_plugin_path(), "http_cache.json"), json.dumps(cache, indent=4, sort_keys=True))
+	except Exception as e:
+		debug_log("Error saving HTTP cache: {}", e)
+
+def write_file_atomic(filePath, data):
+	"""Write text or bytes to a temporary file and swap it into place so readers never see a partial file"""
+	tmpPath = f"{filePath}.{os.getpid()}.{threading.get_ident()}.tmp"  # Unique, so concurrent writers never share one
+	with (open(tmpPath, 'wb') if isinstance(data, bytes) else open(tmpPath, 'w', encoding='utf-8')) as f:
+		f.write(data)
+	os.replace(tmpPath, filePath)
+
+def conditional_get(url, cache, conditional=True, stream=False):
+	"""GET url with a timeout, sending cached validators so unchanged resources answer 304"""
+	import requests
+	headers = {}
+	cached = cache.get(url, {})
+	if conditional and cached.get('etag'):
+		headers['If-None-Match'] = cached['etag']
+	if conditional and cached.get('last_modified'):
+		headers['If-Modified-Since'] = cached['last_modified']
+	return requests.get(url, headers=headers, timeout=FETCH_TIMEOUT, stream=stream)
+
+def remember_validators(cache, url, response, **extra):
+	"""Store a response's validators (and any extra data) for the next conditional request"""
+	cache[url] = {
+		'etag': response.headers.get('ETag'),
+		'last_modified': response.headers.get('Last-Modified'),
+		**extra
+	}
+
+def checkVersion(cache=None):
+	import requests
+	if cache is None:
+		cache = {}
+	try:
+		req = conditional_get(RELEASES_URL, cache)
 	except:
 		return -1
-	if not req.status_code == requests.codes.ok:
+	if req.status_code == 304:
+		tag_name = cache.get(RELEASES_URL, {}).get('tag_name')
+	elif req.status_code == requests.codes.ok:
+		tag_name = req.json().get('tag_name')
+		remember_validators(cache, RELEASES_URL, req, tag_name=tag_name)
+	else:
 		return -1 # Error
-	data = req.json()
-	if data['tag_name'] == this.version:
+	if tag_name is None:
+		return -1
+	if tag_name == this.version:
 		return 1 # Newest
 	return 0 # Newer version available
 
+def load_local_items():
+	"""Load the commodity catalog saved by the last successful refresh"""
+	# The compact cache is tried first; items.json is the human-readable fallback
+	cached = load_items_cache()
+	if cached is not None:
+		this.itemsHash, items = cached
+		return items
+	try:
+		with open(path.join(get_plugin_path(), "items.json"), 'r') as f:
+			items = json.load(f)
+	except Exception as e:
+		debug_log("Error loading local items.json: {}", e)
+		return {}
+	save_items_cache(None, items)
+	return items
+
+def load_items_cache():
+	"""Return (content_hash, items) from items.cache, or None if it is missing or stale"""
+	try:
+		with open(path.join(get_plugin_path(), "items.cache"), 'rb') as f:
+			cacheVersion, marshalVersion, contentHash, items = marshal.loads(f.read())
+	except Exception:
+		return None
+	if cacheVersion != ITEMS_CACHE_VERSION or marshalVersion != marshal.version or not isinstance(items, dict):
+		return None
+	return contentHash, items
+
+def save_items_cache(contentHash, items):
+	"""Write the catalog as a versioned marshal blob keyed by the hash of the FDevIDs CSVs"""
+	filePath = path.join(get_plugin_path(), "items.cache")
+	try:
+		write_file_atomic(filePath, marshal.dumps((ITEMS_CACHE_VERSION, marshal.version, contentHash, items)))
+	except Exception as e:
+		debug_log("Error saving items.cache: {}", e)
+
+def refresh_remote_data():
+	"""Fetch the commodity catalog and latest release concurrently, off EDMC's startup thread"""
+	cache = load_http_cache()
+	results = {}
+
+	def fetch(name, function):
+		# Each fetch gets its own copy of the cache, so one still running past the deadline cannot change what is saved
+		fetchCache = dict(cache)
+		try:
+			results[name] = (function(fetchCache), fetchCache)
+		except Exception as e:
+			debug_log("Error in {} refresh: {}", name, e)
+
+	# Daemon threads, so a fetch stuck past the deadline never holds up EDMC's exit
+	threads = [threading.Thread(target=fetch, args=(name, function), name=f"CargoManifestFetch-{name}", daemon=True) for name, function in (('items', pullItems), ('version', checkVersion))]
+	for thread in threads:
+		thread.start()
+	deadline = time.monotonic() + FETCH_DEADLINE
+	for thread in threads:
+		thread.join(max(deadline - time.monotonic(), 0))
+	finished = dict(results)
+	for _, fetchCache in finished.values():
+		# Only take the entries this fetch replaced, not its stale copies of the other fetch's
+		cache.update({url: entry for url, entry in fetchCache.items() if cache.get(url) is not entry})
+
+	pulled = finished['items'][0] if 'items' in finished else -1
+	newest = finished['version'][0] if 'version' in finished else -1
+
+	if pulled == -1:
+		debug_log("Commodity refresh failed or timed out, keeping local catalog")
+	elif pulled is None:
+		debug_log("Commodity data not modified since last refresh")
+	elif pulled[0] == this.itemsHash:
+		debug_log("Commodity data content unchanged, skipping catalog rewrite")
+	else:
+		contentHash, items = pulled
+		# Swap in the complete catalog so readers never see a partial one
+		set_catalog(items)
+		this.itemsHash = contentHash
+		save_items_cache(contentHash, items)
+		try:
+			write_file_atomic(path.join(get_plugin_path(), "items.json"), json.dumps(items, indent=4, sort_keys=True))
+		except Exception as e:
+			debug_log("Error saving items.json: {}", e)
+		debug_log("Commodity catalog refreshed with {} items", len(items))
+	this.newest = newest
+	save_http_cache(cache)
+	mark_dirty('Manifest')
+
+def run_on_ui(callback):
+	"""Queue callback to run on the Tk main thread; safe to call from any thread"""
+	this.uiQueue.put(callback)
+	if hasattr(this, 'frame'):
+		try:
+			this.frame.event_generate('<<CargoManifestUI>>', when='tail')
+		except Exception:
+			pass  # Frame is gone or Tk is shutting down
+
+def drain_ui_queue(event=None):
+	"""Run callbacks queued by worker threads"""
+	while True:
+		try:
+			callback = this.uiQueue.get_nowait()
+		except queue.Empty:
+			return
+		try:
+			callback()
+		except Exception as e:
+			debug_log("Error in UI callback: {}", e)
+
 def get_ship_type(ship_name):
 	"""Convert ship name to ship type"""
 	ship_type_map = {
@@ -181,17 +481,17 @@ def get_current_commander():
 		from config import config
 		current_cmdr = config.get_str('commander')
 		if current_cmdr and current_cmdr != "Unknown":
-			debug_log(f"Got commander name from EDMC config: {current_cmdr}")
+			debug_log("Got commander name from EDMC config: {}", current_cmdr)
 			return current_cmdr
 	except Exception as e:
-		debug_log(f"Error getting commander from EDMC config: {e}")
+		debug_log("Error getting commander from EDMC config: {}", e)
 	
 	# Try to get from environment or other sources
 	try:
 		import os
 		cmdr = os.environ.get('EDMC_COMMANDER')
 		if cmdr:
-			debug_log(f"Got commander name from environment: {cmdr}")
+			debug_log("Got commander name from environment: {}", cmdr)
 			return cmdr
 	except:
 		pass
@@ -200,25 +500,27 @@ def get_current_commander():
 	return "Unknown"
 
 def plugin_start3(plugin_dir):
+	from config import config
+	startStarted = time.perf_counter()
+	# Load debug logging setting first so the rest of startup can be logged
+	try:
+		this.enableDebugLogging = config.get_bool("cm_enableDebugLogging")
+	except:
+		this.enableDebugLogging = False
+	if this.enableDebugLogging:
+		start_log_writer()
 	debug_log("Plugin starting up...")
-	# Read in item names on startup
-	directoryName = path.basename(path.dirname(__file__)) or 'CargoManifest'
-	pluginPath = path.join(config.plugin_dir, directoryName)
-	filePath = path.join(pluginPath, "items.json")
-	this.items = pullItems()
-	if this.items == -1:
-		# If error reaching EDCD github, use local copy
-		this.items = json.loads(open(filePath, 'r').read())
-	else:
-		# If successful, save local copy
-		with open(filePath, 'w') as f:
-			f.write(json.dumps(this.items, indent=4, sort_keys=True))
-	this.newest = checkVersion()
+	debug_log("Startup - Loaded debug logging enabled: {}", this.enableDebugLogging)
+	debug_log("Discord Rich Presence available (native implementation)")
+	# Start from the local catalog and refresh it in the background so EDMC is never blocked on the network
+	set_catalog(load_local_items())
+	if not this.offline:
+		threading.Thread(target=refresh_remote_data, name="CargoManifestRefresh", daemon=True).start()
 	
 	# Load webhook settings on startup
 	try:
 		webhookUrlValue = config.get_str("cm_webhookUrl")
-		debug_log(f"Startup - Loaded webhook URL: {webhookUrlValue}")
+		debug_log("Startup - Loaded webhook URL: {}", webhookUrlValue)
 		this.webhookUrl = webhookUrlValue
 	except:
 		debug_log("Startup - No webhook URL found, using empty string")
@@ -226,7 +528,7 @@ def plugin_start3(plugin_dir):
 	
 	try:
 		enableWebhooksValue = config.get_bool("cm_enableWebhooks")
-		debug_log(f"Startup - Loaded enable webhooks: {enableWebhooksValue}")
+		debug_log("Startup - Loaded enable webhooks: {}", enableWebhooksValue)
 		this.enableWebhooks = enableWebhooksValue
 	except:
 		debug_log("Startup - No enable webhooks setting found, defaulting to False")
@@ -235,7 +537,7 @@ def plugin_start3(plugin_dir):
 	# Load avatar URL setting
 	try:
 		avatarUrlValue = config.get_str("cm_webhookAvatar")
-		debug_log(f"Startup - Loaded webhook avatar URL: {avatarUrlValue}")
+		debug_log("Startup - Loaded webhook avatar URL: {}", avatarUrlValue)
 		this.webhookAvatar = avatarUrlValue
 	except:
 		debug_log("Startup - No webhook avatar URL found, using empty string")
@@ -244,7 +546,7 @@ def plugin_start3(plugin_dir):
 	# Load bot name setting
 	try:
 		botNameValue = config.get_str("cm_webhookBotName")
-		debug_log(f"Startup - Loaded webhook bot name: {botNameValue}")
+		debug_log("Startup - Loaded webhook bot name: {}", botNameValue)
 		this.webhookBotName = botNameValue if botNameValue else "Cargo Manifest Bot"
 	except:
 		debug_log("Startup - No webhook bot name found, using default")
@@ -253,16 +555,23 @@ def plugin_start3(plugin_dir):
 	# Load bot image setting
 	try:
 		botImageValue = config.get_str("cm_webhookBotImage")
-		debug_log(f"Startup - Loaded webhook bot image URL: {botImageValue}")
+		debug_log("Startup - Loaded webhook bot image URL: {}", botImageValue)
 		this.webhookBotImage = botImageValue
 	except:
 		debug_log("Startup - No webhook bot image found, using empty string")
 		this.webhookBotImage = ""
 	
+	# Load trade embed batching window
+	try:
+		this.webhookBatchWindow = parse_seconds(config.get_str("cm_webhookBatchWindow"), 3.0, 10.0)
+		debug_log("Startup - Loaded webhook batch window: {}", this.webhookBatchWindow)
+	except:
+		this.webhookBatchWindow = 3.0
+	
 	# Load Discord RPC setting
 	try:
 		discordRPCValue = config.get_bool("cm_enableDiscordRPC")
-		debug_log(f"Startup - Loaded Discord RPC setting: {discordRPCValue}")
+		debug_log("Startup - Loaded Discord RPC setting: {}", discordRPCValue)
 		this.enableDiscordRPC = discordRPCValue
 	except:
 		debug_log("Startup - No Discord RPC setting found, defaulting to False")
@@ -271,16 +580,22 @@ def plugin_start3(plugin_dir):
 	# Load Discord Status Webhook setting
 	try:
 		statusWebhookValue = config.get_str("cm_discordStatusWebhook")
-		debug_log(f"Startup - Loaded Discord status webhook URL: {statusWebhookValue}")
+		debug_log("Startup - Loaded Discord status webhook URL: {}", statusWebhookValue)
 		this.discordStatusWebhook = statusWebhookValue
 	except:
 		debug_log("Startup - No Discord status webhook found, using empty string")
 		this.discordStatusWebhook = ""
 	
+	try:
+		this.statusMinInterval = parse_seconds(config.get_str("cm_statusMinInterval"), 15.0, 600.0)
+		debug_log("Startup - Loaded status minimum interval: {}", this.statusMinInterval)
+	except:
+		this.statusMinInterval = 15.0
+	
 	# Load budget settings
 	try:
 		budgetGoalValue = config.get_str("cm_budgetGoal")
-		debug_log(f"Startup - Loaded budget goal: {budgetGoalValue}")
+		debug_log("Startup - Loaded budget goal: {}", budgetGoalValue)
 		# Convert string to integer for budget goal, handling large numbers
 		try:
 			this.budgetGoal = int(budgetGoalValue.replace(',', ''))
@@ -292,20 +607,30 @@ def plugin_start3(plugin_dir):
 	
 	try:
 		budgetEnabledValue = config.get_bool("cm_budgetEnabled")
-		debug_log(f"Startup - Loaded budget enabled: {budgetEnabledValue}")
+		debug_log("Startup - Loaded budget enabled: {}", budgetEnabledValue)
 		this.budgetEnabled = budgetEnabledValue
 	except:
 		debug_log("Startup - No budget enabled setting found, defaulting to False")
 		this.budgetEnabled = False
 	
-	# Load debug logging setting
 	try:
-		debugLoggingValue = config.get_bool("cm_enableDebugLogging")
-		debug_log(f"Startup - Loaded debug logging enabled: {debugLoggingValue}")
-		this.enableDebugLogging = debugLoggingValue
+		costBasisValue = config.get_str("cm_costBasis")
+		this.costBasis = costBasisValue if costBasisValue in COST_BASIS_POLICIES else 'fifo'
 	except:
-		debug_log("Startup - No debug logging setting found, defaulting to False")
-		this.enableDebugLogging = False
+		this.costBasis = 'fifo'
+	
+	# Rebuild trade profit from the journals in the background if enabled
+	try:
+		this.tradeBackfill = config.get_bool("cm_tradeBackfill")
+	except:
+		this.tradeBackfill = False
+	if this.tradeBackfill:
+		start_trade_backfill()
+	
+	# Resend trade webhooks a previous session could not deliver
+	this.sinks = load_sinks()
+	if (this.enableWebhooks or this.sinks) and not this.offline:
+		start_webhook_worker()
 	
 	# Initialize community goals data
 	this.communityGoals = []
@@ -316,7 +641,6 @@ def plugin_start3(plugin_dir):
 	
 	# Set up periodic refresh of community goals (every 30 minutes)
 	def periodic_community_goals_refresh():
-		import threading
 		import time
 		
 		while True:
@@ -324,9 +648,9 @@ def plugin_start3(plugin_dir):
 				time.sleep(1800)  # 30 minutes
 				debug_log("Periodic community goals refresh triggered")
 				fetch_community_goals_fallback()
-				update_community_goals_display()
+				mark_dirty('Community Goals')
 			except Exception as e:
-				debug_log(f"Error in periodic community goals refresh: {e}")
+				debug_log("Error in periodic community goals refresh: {}", e)
 	
 	# Start the background thread
 	refresh_thread = threading.Thread(target=periodic_community_goals_refresh, daemon=True)
@@ -343,15 +667,20 @@ def plugin_start3(plugin_dir):
 	# Try to get commander name during startup
 	this.commanderName = get_current_commander()
 	
-	debug_log("Plugin startup complete")
+	this.startupTimings['plugin_start3'] = time.perf_counter() - startStarted
+	debug_log("Plugin startup complete (import {:.1f} ms, plugin_start3 {:.1f} ms)", this.startupTimings['import'] * 1000, this.startupTimings['plugin_start3'] * 1000)
 	return "Cargo Manifest Remastered"
 
 def plugin_stop():
 	"""Clean up when plugin is stopped"""
 	cleanup_discord_rpc()
+	stop_webhook_worker()
+	stop_ledger_writer()
 	debug_log("Plugin stopped")
+	stop_log_writer()
 
 def plugin_app(parent):
+    import tkinter as tk
     # Adds to the main page UI
     this.frame = tk.Frame(parent)
 
@@ -410,7 +739,7 @@ def plugin_app(parent):
     this.sectionDropdown = ttk.Combobox(
         this.frame,
         textvariable=this.sectionVar,
-        		values=["Manifest", "Captain Information", "Budget", "Cargo Racks", "Community Goals"],
+        		values=["Manifest", "Captain Information", "Budget", "Cargo Racks", "Community Goals", "Diagnostics"],
         state="readonly",
         width=20,
         style=combobox_style
@@ -443,53 +772,49 @@ def plugin_app(parent):
     this.communityGoalsLabel = tk.Label(this.communityGoalsFrame, justify="left", anchor="w", wraplength=400)
     this.communityGoalsLabel.pack(anchor="w", padx=4, pady=4)
 
-    # Show only the selected frame
+    # Diagnostics Frame
+    this.diagnosticsFrame = tk.Frame(this.frame)
+    this.diagnosticsLabel = tk.Label(this.diagnosticsFrame, justify="left", anchor="w", font="TkFixedFont")
+    this.diagnosticsLabel.pack(anchor="w", padx=4, pady=4)
+
+    # Dropdown section name -> frame holding its label
+    this.sectionFrames = {
+        "Manifest": this.cargoManifestFrame,
+        "Captain Information": this.captainInfoFrame,
+        "Budget": this.budgetFrame,
+        "Cargo Racks": this.cargoRacksFrame,
+        "Community Goals": this.communityGoalsFrame,
+        "Diagnostics": this.diagnosticsFrame
+    }
+    # Nothing has been drawn yet, so every section starts out stale
+    this.dirtySections.update(SECTION_RENDERERS)
+
+    # Show only the selected frame, drawing it first if it went stale while hidden
     def show_section(*_):
-        if this.sectionVar.get() == "Manifest":
-            this.captainInfoFrame.grid_forget()
-            this.budgetFrame.grid_forget()
-            this.cargoRacksFrame.grid_forget()
-            this.communityGoalsFrame.grid_forget()
-            this.cargoManifestFrame.grid(row=1, column=0, sticky="nsew")
-            update_cargo_manifest_display()
-        elif this.sectionVar.get() == "Captain Information":
-            this.cargoManifestFrame.grid_forget()
-            this.budgetFrame.grid_forget()
-            this.cargoRacksFrame.grid_forget()
-            this.communityGoalsFrame.grid_forget()
-            this.captainInfoFrame.grid(row=1, column=0, sticky="nsew")
-            update_captain_info_display()
-        elif this.sectionVar.get() == "Budget":
-            this.cargoManifestFrame.grid_forget()
-            this.captainInfoFrame.grid_forget()
-            this.cargoRacksFrame.grid_forget()
-            this.communityGoalsFrame.grid_forget()
-            this.budgetFrame.grid(row=1, column=0, sticky="nsew")
-            update_budget_display()
-        elif this.sectionVar.get() == "Cargo Racks":
-            this.cargoManifestFrame.grid_forget()
-            this.captainInfoFrame.grid_forget()
-            this.budgetFrame.grid_forget()
-            this.communityGoalsFrame.grid_forget()
-            this.cargoRacksFrame.grid(row=1, column=0, sticky="nsew")
-            update_cargo_racks_display()
-        elif this.sectionVar.get() == "Community Goals":
-            debug_log("Switching to Community Goals section")
-            this.cargoManifestFrame.grid_forget()
-            this.captainInfoFrame.grid_forget()
-            this.budgetFrame.grid_forget()
-            this.cargoRacksFrame.grid_forget()
-            this.communityGoalsFrame.grid(row=1, column=0, sticky="nsew")
-            update_community_goals_display()
+        this.visibleSection = this.sectionVar.get()
+        debug_log("Switching to {} section", this.visibleSection)
+        for section, sectionFrame in this.sectionFrames.items():
+            if section != this.visibleSection:
+                sectionFrame.grid_forget()
+        render_section(this.visibleSection)
+        this.sectionFrames[this.visibleSection].grid(row=1, column=0, sticky="nsew")
 
     this.sectionDropdown.bind("<<ComboboxSelected>>", show_section)
+    # Worker threads hand results back to Tk through this virtual event
+    this.frame.bind('<<CargoManifestUI>>', drain_ui_queue)
 
     # Initial display
     show_section()
+    drain_ui_queue()
 
     return this.frame
 
 def plugin_prefs(parent, cmdr, is_beta):
+	import tkinter as tk
+	import tkinter.ttk as ttk
+	import myNotebook as nb
+	from config import config
+	from ttkHyperlinkLabel import HyperlinkLabel
 	# Adds page to settings menu
 	frame = nb.Frame(parent)
 	
@@ -532,7 +857,7 @@ def plugin_prefs(parent, cmdr, is_beta):
 	# Handle webhook settings
 	try:
 		webhookUrlValue = config.get_str("cm_webhookUrl")
-		debug_log(f"Loaded webhook URL: {webhookUrlValue}")
+		debug_log("Loaded webhook URL: {}", webhookUrlValue)
 	except:
 		webhookUrlValue = ""
 		debug_log("No webhook URL found, using empty string")
@@ -540,7 +865,7 @@ def plugin_prefs(parent, cmdr, is_beta):
 	
 	try:
 		enableWebhooksValue = config.get_bool("cm_enableWebhooks")
-		debug_log(f"Loaded enable webhooks: {enableWebhooksValue}")
+		debug_log("Loaded enable webhooks: {}", enableWebhooksValue)
 	except:
 		enableWebhooksValue = False
 		debug_log("No enable webhooks setting found, defaulting to False")
@@ -549,7 +874,7 @@ def plugin_prefs(parent, cmdr, is_beta):
 	# Handle avatar URL setting
 	try:
 		avatarUrlValue = config.get_str("cm_webhookAvatar")
-		debug_log(f"Loaded webhook avatar URL: {avatarUrlValue}")
+		debug_log("Loaded webhook avatar URL: {}", avatarUrlValue)
 	except:
 		avatarUrlValue = ""
 		debug_log("No webhook avatar URL found, using empty string")
@@ -558,7 +883,7 @@ def plugin_prefs(parent, cmdr, is_beta):
 	# Handle bot name setting
 	try:
 		botNameValue = config.get_str("cm_webhookBotName")
-		debug_log(f"Loaded webhook bot name: {botNameValue}")
+		debug_log("Loaded webhook bot name: {}", botNameValue)
 	except:
 		botNameValue = "Cargo Manifest Bot"
 		debug_log("No webhook bot name found, using default")
@@ -567,16 +892,23 @@ def plugin_prefs(parent, cmdr, is_beta):
 	# Handle bot image setting
 	try:
 		botImageValue = config.get_str("cm_webhookBotImage")
-		debug_log(f"Loaded webhook bot image URL: {botImageValue}")
+		debug_log("Loaded webhook bot image URL: {}", botImageValue)
 	except:
 		botImageValue = ""
 		debug_log("No webhook bot image URL found, using empty string")
 	this.webhookBotImageVar = tk.StringVar(value=botImageValue)
 	
+	# Handle trade embed batching window
+	try:
+		batchWindowValue = config.get_str("cm_webhookBatchWindow")
+	except:
+		batchWindowValue = None
+	this.webhookBatchWindowVar = tk.StringVar(value=f"{parse_seconds(batchWindowValue, 3.0, 10.0):g}")
+	
 	# Handle Discord RPC setting
 	try:
 		discordRPCValue = config.get_bool("cm_enableDiscordRPC")
-		debug_log(f"Loaded Discord RPC setting: {discordRPCValue}")
+		debug_log("Loaded Discord RPC setting: {}", discordRPCValue)
 	except:
 		discordRPCValue = False
 		debug_log("No Discord RPC setting found, defaulting to False")
@@ -585,16 +917,23 @@ def plugin_prefs(parent, cmdr, is_beta):
 	# Handle Discord Status Webhook setting
 	try:
 		statusWebhookValue = config.get_str("cm_discordStatusWebhook")
-		debug_log(f"Loaded Discord status webhook URL: {statusWebhookValue}")
+		debug_log("Loaded Discord status webhook URL: {}", statusWebhookValue)
 	except:
 		statusWebhookValue = ""
 		debug_log("No Discord status webhook found, using empty string")
 	this.discordStatusWebhookVar = tk.StringVar(value=statusWebhookValue)
 	
+	# Handle status minimum interval
+	try:
+		statusIntervalValue = config.get_str("cm_statusMinInterval")
+	except:
+		statusIntervalValue = None
+	this.statusMinIntervalVar = tk.StringVar(value=f"{parse_seconds(statusIntervalValue, 15.0, 600.0):g}")
+	
 	# Handle budget settings
 	try:
 		budgetGoalValue = config.get_str("cm_budgetGoal")
-		debug_log(f"Loaded budget goal: {budgetGoalValue}")
+		debug_log("Loaded budget goal: {}", budgetGoalValue)
 	except:
 		budgetGoalValue = "0"
 		debug_log("No budget goal found, defaulting to 0")
@@ -602,16 +941,24 @@ def plugin_prefs(parent, cmdr, is_beta):
 	
 	try:
 		budgetEnabledValue = config.get_bool("cm_budgetEnabled")
-		debug_log(f"Loaded budget enabled: {budgetEnabledValue}")
+		debug_log("Loaded budget enabled: {}", budgetEnabledValue)
 	except:
 		budgetEnabledValue = False
 		debug_log("No budget enabled setting found, defaulting to False")
 	this.budgetEnabledVar = tk.BooleanVar(value=budgetEnabledValue)
 	
+	# Handle trade history backfill setting
+	try:
+		tradeBackfillValue = config.get_bool("cm_tradeBackfill")
+	except:
+		tradeBackfillValue = False
+	this.tradeBackfillVar = tk.BooleanVar(value=tradeBackfillValue)
+	this.costBasisVar = tk.StringVar(value=this.costBasis)
+	
 	# Handle debug logging setting
 	try:
 		debugLoggingValue = config.get_bool("cm_enableDebugLogging")
-		debug_log(f"Loaded debug logging enabled: {debugLoggingValue}")
+		debug_log("Loaded debug logging enabled: {}", debugLoggingValue)
 	except:
 		debugLoggingValue = False
 		debug_log("No debug logging setting found, defaulting to False")
@@ -647,6 +994,11 @@ def plugin_prefs(parent, cmdr, is_beta):
 	botImageEntry = tk.Entry(scrollable_frame, textvariable=this.webhookBotImageVar, width=50)
 	botImageEntry.grid(sticky="ew", pady=(2, 5))
 	
+	tk.Label(scrollable_frame, text="Combine trade notifications sent within (seconds):", background=nb.Label().cget('background')).grid(sticky="w", pady=(5, 0))
+	batchWindowEntry = tk.Entry(scrollable_frame, textvariable=this.webhookBatchWindowVar, width=10)
+	batchWindowEntry.grid(sticky="w", pady=(2, 5))
+	tk.Label(scrollable_frame, text="Up to 10 trades are sent as one message; 0 sends each trade right away", background=nb.Label().cget('background'), foreground="gray").grid(sticky="w", pady=(0, 5))
+	
 	# Discord Status Updates Settings
 	tk.Label(scrollable_frame, text="Discord Status Updates:", background=nb.Label().cget('background'), font=("TkDefaultFont", 9, "bold")).grid(sticky="w", pady=(15, 5))
 	tk.Checkbutton(scrollable_frame, text="Enable Discord Status Updates", variable=this.enableDiscordRPCVar, background=nb.Label().cget('background')).grid(sticky="w", pady=1)
@@ -654,6 +1006,10 @@ def plugin_prefs(parent, cmdr, is_beta):
 	statusWebhookEntry = tk.Entry(scrollable_frame, textvariable=this.discordStatusWebhookVar, width=50)
 	statusWebhookEntry.grid(sticky="ew", pady=(2, 5))
 	tk.Label(scrollable_frame, text="Separate webhook for status updates (optional)", background=nb.Label().cget('background'), foreground="gray").grid(sticky="w", pady=(0, 5))
+	tk.Label(scrollable_frame, text="Minimum seconds between status updates:", background=nb.Label().cget('background')).grid(sticky="w", pady=(5, 0))
+	statusIntervalEntry = tk.Entry(scrollable_frame, textvariable=this.statusMinIntervalVar, width=10)
+	statusIntervalEntry.grid(sticky="w", pady=(2, 5))
+	tk.Label(scrollable_frame, text="Changes in between are combined and only the latest status is sent", background=nb.Label().cget('background'), foreground="gray").grid(sticky="w", pady=(0, 5))
 	
 	# Budget Settings
 	tk.Label(scrollable_frame, text="Budget Tracking:", background=nb.Label().cget('background'), font=("TkDefaultFont", 9, "bold")).grid(sticky="w", pady=(15, 5))
@@ -663,10 +1019,25 @@ def plugin_prefs(parent, cmdr, is_beta):
 	budgetGoalEntry.grid(sticky="w", pady=(2, 5))
 	tk.Label(scrollable_frame, text="Set your target credit amount (supports large numbers like 1,000,000,000)", background=nb.Label().cget('background'), foreground="gray").grid(sticky="w", pady=(0, 5))
 	
+	# Trade History Settings
+	tk.Label(scrollable_frame, text="Trade History:", background=nb.Label().cget('background'), font=("TkDefaultFont", 9, "bold")).grid(sticky="w", pady=(15, 5))
+	tk.Checkbutton(scrollable_frame, text="Rebuild trade profit from past journals on startup", variable=this.tradeBackfillVar, background=nb.Label().cget('background')).grid(sticky="w", pady=1)
+	tk.Label(scrollable_frame, text="Only journal lines added since the last run are read after the first scan", background=nb.Label().cget('background'), foreground="gray").grid(sticky="w", pady=(0, 5))
+	tk.Label(scrollable_frame, text="Cost basis for sale profit:", background=nb.Label().cget('background')).grid(sticky="w", pady=(5, 0))
+	for policy, label in COST_BASIS_POLICIES.items():
+		tk.Radiobutton(scrollable_frame, text=label, variable=this.costBasisVar, value=policy, background=nb.Label().cget('background')).grid(sticky="w", pady=1)
+	tk.Label(scrollable_frame, text="Which purchases a sale is matched against when the same cargo was bought at different prices", background=nb.Label().cget('background'), foreground="gray").grid(sticky="w", pady=(0, 5))
+	
 	# Debug Settings
 	tk.Label(scrollable_frame, text="Debug Settings:", background=nb.Label().cget('background'), font=("TkDefaultFont", 9, "bold")).grid(sticky="w", pady=(15, 5))
 	tk.Checkbutton(scrollable_frame, text="Enable debug logging", variable=this.enableDebugLoggingVar, background=nb.Label().cget('background')).grid(sticky="w", pady=1)
 	tk.Label(scrollable_frame, text="Logs detailed information to debug.log for troubleshooting", background=nb.Label().cget('background'), foreground="gray").grid(sticky="w", pady=(0, 5))
+	traceStatus = tk.StringVar(value="Saves the last {} plugin events to the traces folder".format(TRACE_SIZE))
+	def save_trace():
+		filePath = dump_trace('user')
+		traceStatus.set("Saved to {}".format(filePath) if filePath else "Could not save trace")
+	tk.Button(scrollable_frame, text="Save diagnostic trace", command=save_trace).grid(sticky="w", pady=(5, 0))
+	tk.Label(scrollable_frame, textvariable=traceStatus, background=nb.Label().cget('background'), foreground="gray").grid(sticky="w", pady=(0, 5))
 	
 
 	
@@ -679,6 +1050,7 @@ def plugin_prefs(parent, cmdr, is_beta):
 	return frame
 
 def prefs_changed(cmdr, is_beta):
+	from config import config
 	# Safety check - only save settings if UI variables exist
 	if hasattr(this, 'hideUpdate'):
 		config.set("cm_hideUpdate", this.hideUpdate.get())
@@ -696,18 +1068,33 @@ def prefs_changed(cmdr, is_beta):
 		config.set("cm_webhookBotName", this.webhookBotNameVar.get())
 	if hasattr(this, 'webhookBotImageVar'):
 		config.set("cm_webhookBotImage", this.webhookBotImageVar.get())
+	if hasattr(this, 'webhookBatchWindowVar'):
+		this.webhookBatchWindow = parse_seconds(this.webhookBatchWindowVar.get(), 3.0, 10.0)
+		config.set("cm_webhookBatchWindow", f"{this.webhookBatchWindow:g}")
 	if hasattr(this, 'enableDiscordRPCVar'):
 		config.set("cm_enableDiscordRPC", this.enableDiscordRPCVar.get())
 	if hasattr(this, 'discordStatusWebhookVar'):
 		config.set("cm_discordStatusWebhook", this.discordStatusWebhookVar.get())
+	if hasattr(this, 'statusMinIntervalVar'):
+		this.statusMinInterval = parse_seconds(this.statusMinIntervalVar.get(), 15.0, 600.0)
+		config.set("cm_statusMinInterval", f"{this.statusMinInterval:g}")
 	if hasattr(this, 'budgetEnabledVar'):
 		config.set("cm_budgetEnabled", this.budgetEnabledVar.get())
 	if hasattr(this, 'budgetGoalVar'):
 		config.set("cm_budgetGoal", this.budgetGoalVar.get())
+	if hasattr(this, 'tradeBackfillVar'):
+		config.set("cm_tradeBackfill", this.tradeBackfillVar.get())
+		this.tradeBackfill = this.tradeBackfillVar.get()
+	if hasattr(this, 'costBasisVar') and this.costBasisVar.get() != this.costBasis:
+		this.costBasis = this.costBasisVar.get()
+		config.set("cm_costBasis", this.costBasis)
+		rebase_cost_basis(this.purchaseHistory)
 	if hasattr(this, 'enableDebugLoggingVar'):
 		config.set("cm_enableDebugLogging", this.enableDebugLoggingVar.get())
 		# Update the global setting immediately so debug_log() works right away
 		this.enableDebugLogging = this.enableDebugLoggingVar.get()
+		if this.enableDebugLogging:
+			start_log_writer()
 
 
 	
@@ -724,6 +1111,8 @@ def prefs_changed(cmdr, is_beta):
 		this.webhookBotImage = this.webhookBotImageVar.get()
 	if hasattr(this, 'discordStatusWebhookVar'):
 		this.discordStatusWebhook = this.discordStatusWebhookVar.get()
+	# Pick up edits to sinks.json without restarting EDMC
+	this.sinks = load_sinks()
 	if hasattr(this, 'budgetEnabledVar'):
 		this.budgetEnabled = this.budgetEnabledVar.get()
 	if hasattr(this, 'budgetGoalVar'):
@@ -745,540 +1134,705 @@ def prefs_changed(cmdr, is_beta):
 		elif not this.enableDiscordRPC and oldDiscordRPC:
 			cleanup_discord_rpc()
 	
-	debug_log(f"Settings saved - webhookUrl: {this.webhookUrl}, enableWebhooks: {this.enableWebhooks}, avatarUrl: {this.webhookAvatar}, botName: {this.webhookBotName}, botImage: {this.webhookBotImage}, discordRPC: {this.enableDiscordRPC}, statusWebhook: {this.discordStatusWebhook}")
+	debug_log("Settings saved - webhookUrl: {}, enableWebhooks: {}, avatarUrl: {}, botName: {}, botImage: {}, discordRPC: {}, statusWebhook: {}", this.webhookUrl, this.enableWebhooks, this.webhookAvatar, this.webhookBotName, this.webhookBotImage, this.enableDiscordRPC, this.discordStatusWebhook)
 	
+	# Display settings may have changed, so every section needs redrawing
 	update_display()
-	# Update budget display if settings changed
-	if this.budgetEnabled:
-		update_budget_display()
 
-def pullItems():
+def pullItems(cache=None):
+	"""Fetch the FDevIDs commodity lists; returns (content_hash, catalog), None if unchanged, or -1 on error"""
+	import hashlib
+	import requests
+	if cache is None:
+		cache = {}
 	items = {}
+	commodities = rareCommodities = None
 
-	# Fetch commodity data from EDCD github
+	# Fetch commodity data from EDCD github, sending validators from the last refresh
 	try:
-		commodities = requests.get('https://raw.githubusercontent.com/EDCD/FDevIDs/master/commodity.csv')
-		rareCommodities = requests.get('https://raw.githubusercontent.com/EDCD/FDevIDs/master/rare_commodity.csv')
-	except:
+		commodities = conditional_get(FDEVIDS_COMMODITY_URL, cache, stream=True)
+		rareCommodities = conditional_get(FDEVIDS_RARE_URL, cache, stream=True)
+		if commodities.status_code == 304 and rareCommodities.status_code == 304:
+			return None # Unchanged, local copy is current
+		# The catalog is built from both files, so re-fetch whichever one was not sent
+		if commodities.status_code == 304:
+			commodities.close()
+			commodities = conditional_get(FDEVIDS_COMMODITY_URL, cache, conditional=False, stream=True)
+		if rareCommodities.status_code == 304:
+			rareCommodities.close()
+			rareCommodities = conditional_get(FDEVIDS_RARE_URL, cache, conditional=False, stream=True)
+
+		if not commodities.status_code == requests.codes.ok or not rareCommodities.status_code == requests.codes.ok:
+			return -1 # Error
+
+		# Parse each file as it streams in, hashing the raw bytes for change detection
+		hasher = hashlib.sha1()
+		parse_fdevids_csv(iter_response_lines(commodities, hasher), items)
+		hasher.update(b'\0')
+		parse_fdevids_csv(iter_response_lines(rareCommodities, hasher), items)
+	except Exception as e:
+		debug_log("Error fetching FDevIDs commodity data: {}", e)
 		return -1
-
-	if not commodities.status_code == requests.codes.ok or not rareCommodities.status_code == requests.codes.ok:
-		return -1 # Error
-
-	for c in commodities.text.split('\n'):
-		line = c.strip().split(',')
-		if line[0] == 'id' or c == '':
+	finally:
+		for response in (commodities, rareCommodities):
+			if response is not None:
+				response.close()
+
+	remember_validators(cache, FDEVIDS_COMMODITY_URL, commodities)
+	remember_validators(cache, FDEVIDS_RARE_URL, rareCommodities)
+	return hasher.hexdigest(), items
+
+def iter_response_lines(response, hasher):
+	"""Yield decoded lines from a streamed response as its chunks arrive"""
+	import codecs
+	decoder = codecs.getincrementaldecoder('utf-8')()
+	pending = ''
+	for chunk in response.iter_content(chunk_size=8192):
+		hasher.update(chunk)
+		*lines, pending = (pending + decoder.decode(chunk)).split('\n')
+		for line in lines:
+			yield line + '\n'
+	pending += decoder.decode(b'', final=True)
+	if pending:
+		yield pending
+
+def parse_fdevids_csv(lines, items):
+	"""Add rows from an FDevIDs commodity.csv or rare_commodity.csv to items, keyed by symbol"""
+	import csv
+	# DictReader picks the columns by header, so both files share one parser and quoted commas are handled
+	for row in csv.DictReader(lines):
+		symbol = row.get('symbol')
+		if not symbol or not row.get('id'):
 			continue
-		items[line[1].lower()] = {'id':line[0], 'category':line[2], 'name':line[3]}
+		items[symbol.lower()] = {'id': row['id'], 'category': row.get('category', ''), 'name': row.get('name', symbol)}
+
+def set_catalog(items):
+	"""Swap in a commodity catalog along with its symbol, FDev id, display name and category indexes"""
+	byId = {}
+	byName = {}
+	byCategory = {}
+	for symbol, item in items.items():
+		byId[item['id']] = symbol
+		byName[item['name'].lower()] = symbol
+		byCategory.setdefault(item['category'], []).append(symbol)
+	this.catalog = {'symbol': items, 'id': byId, 'name': byName, 'category': byCategory}
+	this.items = items
+
+def commodity_symbol(name):
+	"""Normalise a journal commodity name such as '$Gold_Name;' or 'Gold' to its catalog symbol"""
+	symbol = name.lower()
+	if symbol.startswith('$') and symbol.endswith('_name;'):
+		symbol = symbol[1:-6]
+	return symbol
+
+def commodity_display_name(name, localised=None):
+	"""Resolve a journal commodity to its display name with O(1) catalog lookups"""
+	catalog = this.catalog
+	if name:
+		symbol = commodity_symbol(name)
+		if symbol in catalog['symbol']:
+			return catalog['symbol'][symbol]['name']
+		if symbol in catalog['id']:
+			return catalog['symbol'][catalog['id'][symbol]]['name']
+	if localised:
+		symbol = catalog['name'].get(localised.lower())
+		if symbol is not None:
+			return catalog['symbol'][symbol]['name']
+		return ' '.join(word.capitalize() for word in localised.split())
+	return name or 'Unknown'
+
+def journal_sort_key(fileName):
+	"""Sort key putting old (Journal.YYMMDDHHMMSS.01.log) and new (Journal.YYYY-MM-DDTHHMMSS.01.log) names in time order"""
+	parts = fileName.split('.')
+	stamp = parts[1] if len(parts) > 1 else ''
+	if len(stamp) == 12 and stamp.isdigit():
+		stamp = f"20{stamp[0:2]}-{stamp[2:4]}-{stamp[4:6]}T{stamp[6:]}"
+	return stamp, parts[2:]
+
+def list_journal_files(directory):
+	"""Return the paths of the Journal.*.log files in directory, oldest first"""
+	try:
+		names = [name for name in os.listdir(directory) if name.startswith('Journal.') and name.endswith('.log')]
+	except OSError as e:
+		debug_log("Error listing journal directory {}: {}", directory, e)
+		return []
+	return [path.join(directory, name) for name in sorted(names, key=journal_sort_key)]
+
+def trace(kind, name, handler=None, seconds=0.0, fields=None, error=None):
+	"""Add a record to the trace ring buffer; cheap enough to call on every event"""
+	this.traceBuffer.append((time.time(), kind, name, handler, seconds, fields, error))
+
+def trace_fields(entry):
+	"""Pick the few entry values worth keeping in a trace record"""
+	return {key: entry[key] for key in TRACE_FIELDS if key in entry}
+
+def dump_trace(reason):
+	"""Save the trace buffer to traces/trace-*.jsonl in the background; returns the file path, or None if skipped"""
+	if reason == 'error':
+		# A handler failing on every event should not write a file for each one
+		now = time.monotonic()
+		if this.lastTraceDump is not None and now - this.lastTraceDump < TRACE_DUMP_INTERVAL:
+			return None
+		this.lastTraceDump = now
+	records = list(this.traceBuffer)
+	try:
+		filePath = path.join(get_plugin_path(), "traces", time.strftime(f"trace-%Y%m%d-%H%M%S-{reason}.jsonl"))
+	except Exception as e:
+		debug_log("Error locating trace folder: {}", e)
+		return None
+	threading.Thread(target=write_trace, args=(filePath, reason, records), name="CargoManifestTrace", daemon=True).start()
+	return filePath
 
-	for c in rareCommodities.text.split('\n'):
-		line = c.strip().split(',')
-		if line[0] == 'id' or c == '':
-			continue
-		items[line[1].lower()] = {'id':line[0], 'category':line[3], 'name':line[4]}
-	return items
+def write_trace(filePath, reason, records):
+	"""Write trace records as JSON lines, newest last, and prune old dumps"""
+	try:
+		traceDir = path.dirname(filePath)
+		os.makedirs(traceDir, exist_ok=True)
+		lines = [json.dumps({'reason': reason, 'version': this.version, 'time': time.time(), 'records': len(records)})]
+		for timestamp, kind, name, handler, seconds, fields, error in records:
+			lines.append(json.dumps({'time': timestamp, 'kind': kind, 'name': name, 'handler': handler, 'ms': round(seconds * 1000, 3), 'fields': fields, 'error': error}, default=str))
+		write_file_atomic(filePath, '\n'.join(lines) + '\n')
+		dumps = sorted(name for name in os.listdir(traceDir) if name.startswith('trace-') and name.endswith('.jsonl'))
+		for name in dumps[:-TRACE_DUMPS_KEPT]:
+			os.remove(path.join(traceDir, name))
+		debug_log("Trace with {} records saved to {}", len(records), filePath)
+	except Exception as e:
+		debug_log("Error saving trace: {}", e)
+
+def record_latency(kind, name, seconds):
+	"""Count seconds into the fixed-bucket histogram for (kind, name); cheap enough to leave on"""
+	histogram = this.latency.get((kind, name))
+	if histogram is None:
+		histogram = this.latency[(kind, name)] = [[0] * (len(LATENCY_BOUNDS) + 1), 0, 0.0]
+	histogram[0][bisect_left(LATENCY_BOUNDS, seconds)] += 1
+	histogram[1] += 1
+	if seconds > histogram[2]:
+		histogram[2] = seconds
+
+def latency_percentiles(histogram, percentiles=(50, 95, 99)):
+	"""Estimate percentiles from a histogram as the upper bound of the bucket they fall in, capped at the max"""
+	counts, samples, maximum = histogram
+	results = []
+	for percentile in percentiles:
+		wanted = samples * percentile / 100
+		seen = 0
+		for index, count in enumerate(counts):
+			seen += count
+			if seen >= wanted:
+				break
+		results.append(min(LATENCY_BOUNDS[index] if index < len(LATENCY_BOUNDS) else maximum, maximum))
+	return results
+
+def journal_handler(*events):
+	"""Register the decorated function as the handler for the given journal events"""
+	def register(handler):
+		for event in events:
+			this.journalHandlers[event] = handler
+		return handler
+	return register
 
 def journal_entry(cmdr, is_beta, system, station, entry, state):
 	# Parse journal entries
-	debug_log(f"Journal event received: {entry['event']}")
+	event = entry['event']
+	handler = this.journalHandlers.get(event)
 	
 	# Update commander name from the cmdr parameter if available
 	if cmdr and cmdr != "Unknown":
 		if this.commanderName == "Unknown" or this.commanderName != cmdr:
 			this.commanderName = cmdr
-			debug_log(f"Commander name updated from cmdr parameter: {this.commanderName}")
+			debug_log("Commander name updated from cmdr parameter: {}", this.commanderName)
 	
 	# Update system and station from parameters if available
 	if system and system != "Unknown":
 		if this.currentSystem == "Unknown" or this.currentSystem != system:
 			this.currentSystem = system
-			debug_log(f"System updated from parameter: {this.currentSystem}")
+			debug_log("System updated from parameter: {}", this.currentSystem)
 	
 	if station and station != "Unknown":
 		if this.currentStation == "Unknown" or this.currentStation != station:
 			this.currentStation = station
-			debug_log(f"Station updated from parameter: {this.currentStation}")
-	
-	if entry['event'] == 'Cargo':
-		# Emitted whenever cargo hold updates
-		if state['Cargo'] != this.cargoDict:
-			this.cargoDict = state['Cargo']
-		if 'Inventory' in entry and entry['Inventory'] != this.inventory:
-			this.inventory = entry['Inventory']
-		# Debug: Check what's available in state
-		debug_log(f"Cargo event - State keys: {list(state.keys())}")
-		if 'Rank' in state:
-			debug_log(f"Cargo event - Rank data: {state['Rank']}")
-		# Check for rank data in state during cargo updates
-		if 'Rank' in state:
-			update_ranks(state['Rank'])
-		update_display()
-		# Update captain info display specifically to ensure ranks are shown
-		update_captain_info_display()
-		# Update cargo manifest display specifically to ensure cargo data is shown
-		update_cargo_manifest_display()
-		# Update Discord status when cargo changes
-		if this.enableDiscordRPC:
-			update_discord_status()
+			debug_log("Station updated from parameter: {}", this.currentStation)
 	
-	elif entry['event'] == 'Loadout':
-		# Emitted when loadout changes
-		if this.cargoCapacity != entry['CargoCapacity']:
-			this.cargoCapacity = entry['CargoCapacity']
-		# Detect cargo type from modules
-		this.cargoType = detect_cargo_type(entry['Modules'])
-		update_display()
-		# Update cargo manifest display specifically to ensure cargo capacity is shown
-		update_cargo_manifest_display()
-		# Update cargo racks display specifically to ensure racks are shown
-		update_cargo_racks_display()
-		# Update Discord status when loadout changes (ship modifications)
-		if this.enableDiscordRPC:
-			update_discord_status()
+	if handler is None:
+		return  # Not an event this plugin uses
 	
-	elif entry['event'] == 'Rank':
-		# Emitted when any rank changes
-		debug_log(f"Rank event received: {entry}")  # Debug
-		update_ranks(entry)
-		update_display()
-		# Update captain info display specifically to ensure ranks are shown
-		update_captain_info_display()
-		# Update Discord status when ranks change (progression)
+	debug_log("Journal event received: {}", event)
+	started = time.perf_counter()
+	error = None
+	try:
+		handler(entry, state)
+	except Exception as e:
+		error = repr(e)
+		raise  # EDMC still logs it with the traceback
+	finally:
+		elapsed = time.perf_counter() - started
+		stats = this.journalStats.get(event)
+		if stats is None:
+			stats = this.journalStats[event] = [0, 0.0]
+		stats[0] += 1
+		stats[1] += elapsed
+		record_latency('journal', event, elapsed)
+		trace('journal', event, handler.__name__, elapsed, trace_fields(entry), error)
+		if error is not None:
+			dump_trace('error')
+
+@journal_handler('Cargo')
+def on_cargo(entry, state):
+	"""Handle Cargo journal event"""
+	# Emitted whenever cargo hold updates
+	if state['Cargo'] != this.cargoDict:
+		this.cargoDict = state['Cargo']
+	if 'Inventory' in entry and entry['Inventory'] != this.inventory:
+		this.inventory = entry['Inventory']
+	# Debug: Check what's available in state
+	debug_log("Cargo event - State keys: {}", state.keys())
+	if 'Rank' in state:
+		debug_log("Cargo event - Rank data: {}", state['Rank'])
+	# Check for rank data in state during cargo updates
+	if 'Rank' in state:
+		update_ranks(state['Rank'])
+	mark_dirty('Manifest', 'Captain Information')
+	# Update Discord status when cargo changes
+	if this.enableDiscordRPC:
+		update_discord_status()
+
+@journal_handler('Loadout')
+def on_loadout(entry, state):
+	"""Handle Loadout journal event"""
+	# Emitted when loadout changes, contains cargo capacity, modules and ship information
+	debug_log("Loadout event received: {}", entry)  # Debug
+	if this.cargoCapacity != entry['CargoCapacity']:
+		this.cargoCapacity = entry['CargoCapacity']
+	# Detect cargo type from modules; the journal lists them, EDMC's state keys them by slot
+	modules = entry['Modules']
+	if isinstance(modules, list):
+		modules = {module['Slot']: module for module in modules}
+	this.cargoType = detect_cargo_type(modules)
+	
+	# Update ship information; in Loadout 'Ship' is the ship type and the name is in ShipName/ShipIdent
+	if 'Ship' in entry and entry['Ship'] and entry['Ship'] != 'None':
+		this.currentShipType = entry['Ship']
+		debug_log("Ship type updated from Loadout: {}", this.currentShipType)
+	
+	if 'ShipName' in entry and entry['ShipName'] and entry['ShipName'] != 'None':
+		this.currentShipName = entry['ShipName']
+		debug_log("Ship name updated from Loadout ShipName: {}", this.currentShipName)
+	elif 'ShipIdent' in entry and entry['ShipIdent'] and entry['ShipIdent'] != 'None':
+		this.currentShipName = entry['ShipIdent']
+		debug_log("Ship name updated from Loadout ShipIdent: {}", this.currentShipName)
+	
+	debug_log("Loadout - Final ship info: {} ({})", this.currentShipName, this.currentShipType)
+	
+	mark_dirty('Manifest', 'Cargo Racks')
+	# Update Discord status when loadout changes (ship modifications)
+	if this.enableDiscordRPC:
+		update_discord_status()
+
+@journal_handler('Rank')
+def on_rank(entry, state):
+	"""Handle Rank journal event"""
+	# Emitted when any rank changes
+	debug_log("Rank event received: {}", entry)  # Debug
+	update_ranks(entry)
+	mark_dirty('Captain Information')
+	# Update Discord status when ranks change (progression)
+	if this.enableDiscordRPC:
+		update_discord_status()
+
+@journal_handler('Credits')
+def on_credits(entry, state):
+	"""Handle Credits journal event"""
+	# Emitted when credits change
+	debug_log("Credits event received: {}", entry)  # Debug
+	if 'Credits' in entry:
+		update_credits(entry['Credits'])
+		# Update Discord status when credits change (trading activity)
 		if this.enableDiscordRPC:
 			update_discord_status()
+	# Also check state for credits (in case entry doesn't have them)
+	elif 'Credits' in state and state['Credits'] != this.credits:
+		debug_log("Credits updated from state during Credits event: {} (was: {})", state['Credits'], this.credits)
+		update_credits(state['Credits'])
+
+@journal_handler('MarketSell')
+def on_market_sell(entry, state):
+	"""Handle MarketSell journal event"""
+	# Emitted when cargo is sold at market
+	debug_log("MarketSell event received: {}", entry)  # Debug
 	
-	elif entry['event'] == 'Credits':
-		# Emitted when credits change
-		debug_log(f"Credits event received: {entry}")  # Debug
-		if 'Credits' in entry:
-			update_credits(entry['Credits'])
-			update_display()
-			# Update captain info display specifically to ensure credits are shown
-			update_captain_info_display()
-			# Update budget display when credits change
-			if this.budgetEnabled:
-				update_budget_display()
-			# Update Discord status when credits change (trading activity)
-			if this.enableDiscordRPC:
-				update_discord_status()
-		# Also check state for credits (in case entry doesn't have them)
-		elif 'Credits' in state and state['Credits'] != this.credits:
-			debug_log(f"Credits updated from state during Credits event: {state['Credits']} (was: {this.credits})")
-			update_credits(state['Credits'])
-			update_captain_info_display()
-			if this.budgetEnabled:
-				update_budget_display()
-	
-	elif entry['event'] == 'MarketSell':
-		# Emitted when cargo is sold at market
-		debug_log(f"MarketSell event received: {entry}")  # Debug
-		
-		# Update ship information from state BEFORE sending webhook
-		if 'ShipType' in state and state['ShipType'] and state['ShipType'] != this.currentShipType:
-			this.currentShipType = state['ShipType']
-			debug_log(f"Ship type updated from state: {this.currentShipType}")
-		
-		if 'ShipName' in state and state['ShipName'] and state['ShipName'] != this.currentShipName:
-			this.currentShipName = state['ShipName']
-			debug_log(f"Ship name updated from state: {this.currentShipName}")
-		
-		debug_log(f"MarketSell - Ship info before webhook: {this.currentShipName} ({this.currentShipType})")
-		
-		handle_market_sell(entry)
-		
-		# Update credits from state if available
-		if 'Credits' in state and state['Credits'] != this.credits:
-			debug_log(f"Credits updated from state after MarketSell: {state['Credits']} (was: {this.credits})")
-			update_credits(state['Credits'])
-			update_captain_info_display()
-		# Update budget display when credits change from sales
-		if this.budgetEnabled:
-			update_budget_display()
-		
-		# Refresh community goals after selling cargo (might be related to community goals)
-		fetch_community_goals_fallback()
-		update_community_goals_display()
-		
-		# Update Discord status when trading
-		if this.enableDiscordRPC:
-			update_discord_status()
+	# Update ship information from state BEFORE sending webhook
+	if 'ShipType' in state and state['ShipType'] and state['ShipType'] != this.currentShipType:
+		this.currentShipType = state['ShipType']
+		debug_log("Ship type updated from state: {}", this.currentShipType)
 	
-	elif entry['event'] == 'MarketBuy':
-		# Emitted when cargo is bought at market
-		debug_log(f"MarketBuy event received: {entry}")  # Debug
-		
-		# Update ship information from state BEFORE sending webhook
-		if 'ShipType' in state and state['ShipType'] and state['ShipType'] != this.currentShipType:
-			this.currentShipType = state['ShipType']
-			debug_log(f"Ship type updated from state: {this.currentShipType}")
-		
-		if 'ShipName' in state and state['ShipName'] and state['ShipName'] != this.currentShipName:
-			this.currentShipName = state['ShipName']
-			debug_log(f"Ship name updated from state: {this.currentShipName}")
-		
-		debug_log(f"MarketBuy - Ship info before webhook: {this.currentShipName} ({this.currentShipType})")
-		
-		handle_market_buy(entry)
-		
-		# Update credits from state if available
-		if 'Credits' in state and state['Credits'] != this.credits:
-			debug_log(f"Credits updated from state after MarketBuy: {state['Credits']} (was: {this.credits})")
-			update_credits(state['Credits'])
-			update_captain_info_display()
-		# Update budget display when credits change from purchases
-		if this.budgetEnabled:
-			update_budget_display()
-		
-		# Refresh community goals after buying cargo (might be related to community goals)
-		fetch_community_goals_fallback()
-		update_community_goals_display()
-		
-		# Update Discord status when trading
-		if this.enableDiscordRPC:
-			update_discord_status()
+	if 'ShipName' in state and state['ShipName'] and state['ShipName'] != this.currentShipName:
+		this.currentShipName = state['ShipName']
+		debug_log("Ship name updated from state: {}", this.currentShipName)
 	
-	elif entry['event'] == 'Location':
-		# Emitted when location changes (system, station, etc.)
-		debug_log(f"Location event received: {entry}")  # Debug
-		if 'StationName' in entry:
-			this.currentStation = entry['StationName']
-			debug_log(f"Updated station to: {this.currentStation}")
-		if 'StarSystem' in entry:
-			this.currentSystem = entry['StarSystem']
-			debug_log(f"Updated system to: {this.currentSystem}")
-		# Update Discord status when location changes
-		if this.enableDiscordRPC:
-			update_discord_status()
+	debug_log("MarketSell - Ship info before webhook: {} ({})", this.currentShipName, this.currentShipType)
 	
-	elif entry['event'] == 'Docked':
-		# Emitted when docking at a station
-		debug_log(f"Docked event received: {entry}")  # Debug
-		if 'StationName' in entry:
-			this.currentStation = entry['StationName']
-			debug_log(f"Updated station to: {this.currentStation}")
-		if 'StarSystem' in entry:
-			this.currentSystem = entry['StarSystem']
-			debug_log(f"Updated system to: {this.currentSystem}")
-		# Update Discord status when docking
-		if this.enableDiscordRPC:
-			update_discord_status()
+	handle_market_sell(entry, record_trade(entry))
 	
-	elif entry['event'] == 'Undocked':
-		# Emitted when undocking from a station
-		debug_log(f"Undocked event received: {entry}")  # Debug
-		this.currentStation = "Unknown"  # Reset station when undocking
-		debug_log(f"Reset station to: Unknown (undocked)")
-		# Update Discord status when undocking
-		if this.enableDiscordRPC:
-			update_discord_status()
+	# Update credits from state if available
+	if 'Credits' in state and state['Credits'] != this.credits:
+		debug_log("Credits updated from state after MarketSell: {} (was: {})", state['Credits'], this.credits)
+		update_credits(state['Credits'])
 	
-	elif entry['event'] == 'Liftoff':
-		# Emitted when taking off from a planet/station
-		debug_log(f"Liftoff event received: {entry}")  # Debug
-		this.currentStation = "Unknown"  # Reset station when taking off
-		debug_log(f"Reset station to: Unknown (liftoff)")
-		# Update Discord status when taking off
-		if this.enableDiscordRPC:
-			update_discord_status()
+	# Refresh community goals after selling cargo (might be related to community goals)
+	fetch_community_goals_fallback()
+	mark_dirty('Community Goals')
 	
-	elif entry['event'] == 'FSDJump':
-		# Emitted when jumping to another system
-		debug_log(f"FSDJump event received: {entry}")  # Debug
-		this.currentStation = "Unknown"  # Reset station when jumping
-		if 'StarSystem' in entry:
-			this.currentSystem = entry['StarSystem']
-			debug_log(f"Updated system to: {this.currentSystem}")
-		debug_log(f"Reset station to: Unknown (FSD jump)")
-		# Update Discord status when jumping
-		if this.enableDiscordRPC:
-			update_discord_status()
+	# Update Discord status when trading
+	if this.enableDiscordRPC:
+		update_discord_status()
+
+@journal_handler('MarketBuy')
+def on_market_buy(entry, state):
+	"""Handle MarketBuy journal event"""
+	# Emitted when cargo is bought at market
+	debug_log("MarketBuy event received: {}", entry)  # Debug
 	
-	elif entry['event'] == 'Commander':
-		# Emitted when commander data is loaded, contains rank information
-		debug_log(f"Commander event received: {entry}")  # Debug
-		debug_log(f"Commander event keys: {list(entry.keys())}")
-		if 'Name' in entry:
-			this.commanderName = entry['Name']
-			debug_log(f"Commander name updated from Commander event: {this.commanderName}")
-		else:
-			debug_log(f"Commander event received but no Name field found")
-		if 'Rank' in entry:
-			debug_log(f"Commander - Rank data: {entry['Rank']}")
-			update_ranks(entry['Rank'])
-		if 'Credits' in entry:
-			debug_log(f"Commander - Credits: {entry['Credits']}")
-			update_credits(entry['Credits'])
-		update_display()
-		# Update captain info display specifically to ensure commander data is shown
-		update_captain_info_display()
-		# Update budget display when credits change from commander data
-		if this.budgetEnabled:
-			update_budget_display()
-		# Update Discord status when commander data is loaded
-		if this.enableDiscordRPC:
-			update_discord_status()
-		# Also check state for credits
-		if 'Credits' in state and state['Credits'] != this.credits:
-			debug_log(f"Credits updated from state during Commander event: {state['Credits']} (was: {this.credits})")
-			update_credits(state['Credits'])
-			update_captain_info_display()
-			if this.budgetEnabled:
-				update_budget_display()
-	
-	elif entry['event'] == 'LoadGame':
-		# Emitted when loading into the game, contains ship information
-		debug_log(f"LoadGame event received: {entry}")  # Debug
-		debug_log(f"LoadGame event keys: {list(entry.keys())}")
-		
-		# Update ship information
-		if 'ShipType' in entry and entry['ShipType'] and entry['ShipType'] != 'None':
-			this.currentShipType = entry['ShipType']
-			debug_log(f"Ship type updated from LoadGame: {this.currentShipType}")
-		
-		if 'Ship' in entry and entry['Ship'] and entry['Ship'] != 'None':
-			this.currentShipName = entry['Ship']
-			debug_log(f"Ship name updated from LoadGame: {this.currentShipName}")
-		elif 'ShipIdent' in entry and entry['ShipIdent'] and entry['ShipIdent'] != 'None':
-			this.currentShipName = entry['ShipIdent']
-			debug_log(f"Ship name updated from LoadGame ShipIdent: {this.currentShipName}")
-		
-		debug_log(f"LoadGame - Final ship info: {this.currentShipName} ({this.currentShipType})")
-		if 'ShipID' in entry:
-			debug_log(f"Ship ID from LoadGame: {entry['ShipID']}")
-		
-		# Update commander name if available
-		if 'Commander' in entry:
-			this.commanderName = entry['Commander']
-			debug_log(f"Commander name updated from LoadGame: {this.commanderName}")
-		else:
-			debug_log(f"LoadGame event received but no commander name found")
-		# Update credits from state if available
-		if 'Credits' in state and state['Credits'] != this.credits:
-			debug_log(f"Credits updated from state during LoadGame: {state['Credits']} (was: {this.credits})")
-			update_credits(state['Credits'])
-			update_captain_info_display()
-		# Update Discord status when loading into the game
-		if this.enableDiscordRPC:
-			update_discord_status()
-		
-		# Check for community goals in state
-		check_state_for_community_goals(state)
+	# Update ship information from state BEFORE sending webhook
+	if 'ShipType' in state and state['ShipType'] and state['ShipType'] != this.currentShipType:
+		this.currentShipType = state['ShipType']
+		debug_log("Ship type updated from state: {}", this.currentShipType)
 	
-	elif entry['event'] == 'Loadout':
-		# Emitted when ship loadout changes, contains detailed ship information
-		debug_log(f"Loadout event received: {entry}")  # Debug
-		debug_log(f"Loadout event keys: {list(entry.keys())}")
-		
-		# Update ship information
-		if 'ShipType' in entry and entry['ShipType'] and entry['ShipType'] != 'None':
-			this.currentShipType = entry['ShipType']
-			debug_log(f"Ship type updated from Loadout: {this.currentShipType}")
-		
-		if 'Ship' in entry and entry['Ship'] and entry['Ship'] != 'None':
-			this.currentShipName = entry['Ship']
-			debug_log(f"Ship name updated from Loadout: {this.currentShipName}")
-		elif 'ShipIdent' in entry and entry['ShipIdent'] and entry['ShipIdent'] != 'None':
-			this.currentShipName = entry['ShipIdent']
-			debug_log(f"Ship name updated from Loadout ShipIdent: {this.currentShipName}")
-		elif 'ShipName' in entry and entry['ShipName'] and entry['ShipName'] != 'None':
-			this.currentShipName = entry['ShipName']
-			debug_log(f"Ship name updated from Loadout ShipName: {this.currentShipName}")
-		
-		debug_log(f"Loadout - Final ship info: {this.currentShipName} ({this.currentShipType})")
-		if 'ShipID' in entry:
-			debug_log(f"Ship ID from Loadout: {entry['ShipID']}")
-		
-		# Update Discord status when ship loadout changes
-		if this.enableDiscordRPC:
-			update_discord_status()
+	if 'ShipName' in state and state['ShipName'] and state['ShipName'] != this.currentShipName:
+		this.currentShipName = state['ShipName']
+		debug_log("Ship name updated from state: {}", this.currentShipName)
 	
-	elif entry['event'] == 'CommunityGoal':
-		# Emitted when community goal data is received
-		debug_log(f"CommunityGoal event received: {entry}")
-		handle_community_goal(entry)
+	debug_log("MarketBuy - Ship info before webhook: {} ({})", this.currentShipName, this.currentShipType)
 	
-
+	record_trade(entry)
+	handle_market_buy(entry)
 	
-	elif entry['event'] == 'FileHeader':
-		# Emitted at the start of each journal file, often contains commander name
-		debug_log(f"FileHeader event received: {entry}")
-		debug_log(f"FileHeader event keys: {list(entry.keys())}")
-		if 'part' in entry and entry['part'] == 1:  # Only process the first part
-			if 'Commander' in entry:
-				this.commanderName = entry['Commander']
-				debug_log(f"Commander name updated from FileHeader event: {this.commanderName}")
-			elif 'Name' in entry:
-				this.commanderName = entry['Name']
-				debug_log(f"Commander name updated from FileHeader event: {this.commanderName}")
-			else:
-				debug_log(f"FileHeader event received but no commander name found")
+	# Update credits from state if available
+	if 'Credits' in state and state['Credits'] != this.credits:
+		debug_log("Credits updated from state after MarketBuy: {} (was: {})", state['Credits'], this.credits)
+		update_credits(state['Credits'])
 	
-	elif entry['event'] == 'StartUp':
-		# Tries to update display from EDMC stored data when started after the game
-		debug_log("StartUp event handler - Ship tracking section starting")
-		this.cargoDict = state['Cargo']
-		try:
-			this.inventory = state['CargoJSON']['Inventory'] # Only supported in 4.1.6 on
-		except:
-			pass
-		
-		# Use the stored cargo capacity from state instead of recalculating
-		if 'CargoCapacity' in state:
-			this.cargoCapacity = state['CargoCapacity']
-		else:
-			# Fallback to manual calculation if CargoCapacity not available
-			cargoCap = 0
-			for i in state['Modules']:
-				item = state['Modules'][i]['Item']
-				# Parse cargo rack capacity based on size and class
-				if item.startswith('int_cargorack_size'):
-					# Extract size and class from item name
-					parts = item.split('_')
-					if len(parts) >= 5:
-						size = int(parts[3].replace('size', ''))
-						class_num = int(parts[4].replace('class', ''))
-						
-						# Calculate capacity based on size and class
-						base_capacity = 2 ** size  # Size 1=2, Size 2=4, Size 3=8, etc.
-						if class_num == 8:
-							# Class 8 racks have 1.5x capacity
-							cargoCap += int(base_capacity * 1.5)
-						else:
-							# Standard class racks
-							cargoCap += base_capacity
-			this.cargoCapacity = cargoCap
-
-		# Detect cargo type from modules
-		this.cargoType = detect_cargo_type(state['Modules'])
-		debug_log(f"Startup - Cargo type detected: {this.cargoType}, Cargo racks found: {len(this.cargoRacks)}")
-		debug_log("StartUp - Cargo detection complete, moving to ship tracking")
-		
-		# Load rank data from state
-		debug_log(f"StartUp state keys: {list(state.keys())}")  # Debug
-		if 'Rank' in state:
-			debug_log(f"Rank in state: {state['Rank']}")  # Debug
-			update_ranks(state['Rank'])
+	# Refresh community goals after buying cargo (might be related to community goals)
+	fetch_community_goals_fallback()
+	mark_dirty('Community Goals')
+	
+	# Update Discord status when trading
+	if this.enableDiscordRPC:
+		update_discord_status()
+
+@journal_handler('Location')
+def on_location(entry, state):
+	"""Handle Location journal event"""
+	# Emitted when location changes (system, station, etc.)
+	debug_log("Location event received: {}", entry)  # Debug
+	if 'StationName' in entry:
+		this.currentStation = entry['StationName']
+		debug_log("Updated station to: {}", this.currentStation)
+	if 'StarSystem' in entry:
+		this.currentSystem = entry['StarSystem']
+		debug_log("Updated system to: {}", this.currentSystem)
+	# Update Discord status when location changes
+	if this.enableDiscordRPC:
+		update_discord_status()
+
+@journal_handler('Docked')
+def on_docked(entry, state):
+	"""Handle Docked journal event"""
+	# Emitted when docking at a station
+	debug_log("Docked event received: {}", entry)  # Debug
+	if 'StationName' in entry:
+		this.currentStation = entry['StationName']
+		debug_log("Updated station to: {}", this.currentStation)
+	if 'StarSystem' in entry:
+		this.currentSystem = entry['StarSystem']
+		debug_log("Updated system to: {}", this.currentSystem)
+	# Update Discord status when docking
+	if this.enableDiscordRPC:
+		update_discord_status()
+
+@journal_handler('Undocked')
+def on_undocked(entry, state):
+	"""Handle Undocked journal event"""
+	# Emitted when undocking from a station
+	debug_log("Undocked event received: {}", entry)  # Debug
+	this.currentStation = "Unknown"  # Reset station when undocking
+	debug_log("Reset station to: Unknown (undocked)")
+	# Update Discord status when undocking
+	if this.enableDiscordRPC:
+		update_discord_status()
+
+@journal_handler('Liftoff')
+def on_liftoff(entry, state):
+	"""Handle Liftoff journal event"""
+	# Emitted when taking off from a planet/station
+	debug_log("Liftoff event received: {}", entry)  # Debug
+	this.currentStation = "Unknown"  # Reset station when taking off
+	debug_log("Reset station to: Unknown (liftoff)")
+	# Update Discord status when taking off
+	if this.enableDiscordRPC:
+		update_discord_status()
+
+@journal_handler('FSDJump')
+def on_fsd_jump(entry, state):
+	"""Handle FSDJump journal event"""
+	# Emitted when jumping to another system
+	debug_log("FSDJump event received: {}", entry)  # Debug
+	this.currentStation = "Unknown"  # Reset station when jumping
+	if 'StarSystem' in entry:
+		this.currentSystem = entry['StarSystem']
+		debug_log("Updated system to: {}", this.currentSystem)
+	debug_log("Reset station to: Unknown (FSD jump)")
+	# Update Discord status when jumping
+	if this.enableDiscordRPC:
+		update_discord_status()
+
+@journal_handler('Commander')
+def on_commander(entry, state):
+	"""Handle Commander journal event"""
+	# Emitted when commander data is loaded, contains rank information
+	debug_log("Commander event received: {}", entry)  # Debug
+	debug_log("Commander event keys: {}", entry.keys())
+	if 'Name' in entry:
+		this.commanderName = entry['Name']
+		debug_log("Commander name updated from Commander event: {}", this.commanderName)
+	else:
+		debug_log("Commander event received but no Name field found")
+	if 'Rank' in entry:
+		debug_log("Commander - Rank data: {}", entry['Rank'])
+		update_ranks(entry['Rank'])
+	if 'Credits' in entry:
+		debug_log("Commander - Credits: {}", entry['Credits'])
+		update_credits(entry['Credits'])
+	mark_dirty('Captain Information')
+	# Update Discord status when commander data is loaded
+	if this.enableDiscordRPC:
+		update_discord_status()
+	# Also check state for credits
+	if 'Credits' in state and state['Credits'] != this.credits:
+		debug_log("Credits updated from state during Commander event: {} (was: {})", state['Credits'], this.credits)
+		update_credits(state['Credits'])
+
+@journal_handler('LoadGame')
+def on_load_game(entry, state):
+	"""Handle LoadGame journal event"""
+	# Emitted when loading into the game, contains ship information
+	debug_log("LoadGame event received: {}", entry)  # Debug
+	debug_log("LoadGame event keys: {}", entry.keys())
+	
+	# Update ship information
+	if 'ShipType' in entry and entry['ShipType'] and entry['ShipType'] != 'None':
+		this.currentShipType = entry['ShipType']
+		debug_log("Ship type updated from LoadGame: {}", this.currentShipType)
+	
+	if 'Ship' in entry and entry['Ship'] and entry['Ship'] != 'None':
+		this.currentShipName = entry['Ship']
+		debug_log("Ship name updated from LoadGame: {}", this.currentShipName)
+	elif 'ShipIdent' in entry and entry['ShipIdent'] and entry['ShipIdent'] != 'None':
+		this.currentShipName = entry['ShipIdent']
+		debug_log("Ship name updated from LoadGame ShipIdent: {}", this.currentShipName)
+	
+	debug_log("LoadGame - Final ship info: {} ({})", this.currentShipName, this.currentShipType)
+	if 'ShipID' in entry:
+		debug_log("Ship ID from LoadGame: {}", entry['ShipID'])
+	
+	# Update commander name if available
+	if 'Commander' in entry:
+		this.commanderName = entry['Commander']
+		debug_log("Commander name updated from LoadGame: {}", this.commanderName)
+	else:
+		debug_log("LoadGame event received but no commander name found")
+	# Update credits from state if available
+	if 'Credits' in state and state['Credits'] != this.credits:
+		debug_log("Credits updated from state during LoadGame: {} (was: {})", state['Credits'], this.credits)
+		update_credits(state['Credits'])
+	# Update Discord status when loading into the game
+	if this.enableDiscordRPC:
+		update_discord_status()
+	
+	# Check for community goals in state
+	check_state_for_community_goals(state)
+
+@journal_handler('CommunityGoal')
+def on_community_goal(entry, state):
+	"""Handle CommunityGoal journal event"""
+	# Emitted when community goal data is received
+	debug_log("CommunityGoal event received: {}", entry)
+	handle_community_goal(entry)
+
+@journal_handler('FileHeader')
+def on_file_header(entry, state):
+	"""Handle FileHeader journal event"""
+	# Emitted at the start of each journal file, often contains commander name
+	debug_log("FileHeader event received: {}", entry)
+	debug_log("FileHeader event keys: {}", entry.keys())
+	if 'part' in entry and entry['part'] == 1:  # Only process the first part
+		if 'Commander' in entry:
+			this.commanderName = entry['Commander']
+			debug_log("Commander name updated from FileHeader event: {}", this.commanderName)
+		elif 'Name' in entry:
+			this.commanderName = entry['Name']
+			debug_log("Commander name updated from FileHeader event: {}", this.commanderName)
 		else:
-			debug_log("No Rank found in state")
-			# Try alternative ways to get rank data
-			for key in state.keys():
-				if 'rank' in key.lower():
-					debug_log(f"Found potential rank key: {key} = {state[key]}")
-		
-		# Load credits data from state
-		if 'Credits' in state:
-			debug_log(f"Credits in state: {state['Credits']}")  # Debug
-			update_credits(state['Credits'])
+			debug_log("FileHeader event received but no commander name found")
+
+@journal_handler('StartUp')
+def on_startup(entry, state):
+	"""Handle StartUp journal event"""
+	# Tries to update display from EDMC stored data when started after the game
+	debug_log("StartUp event handler - Ship tracking section starting")
+	this.cargoDict = state['Cargo']
+	try:
+		this.inventory = state['CargoJSON']['Inventory'] # Only supported in 4.1.6 on
+	except:
+		pass
+	
+	# Use the stored cargo capacity from state instead of recalculating
+	if 'CargoCapacity' in state:
+		this.cargoCapacity = state['CargoCapacity']
+	else:
+		# Fallback to manual calculation if CargoCapacity not available
+		cargoCap = 0
+		for i in state['Modules']:
+			item = state['Modules'][i]['Item']
+			# Parse cargo rack capacity based on size and class
+			if item.startswith('int_cargorack_size'):
+				# Extract size and class from item name
+				parts = item.split('_')
+				if len(parts) >= 5:
+					size = int(parts[3].replace('size', ''))
+					class_num = int(parts[4].replace('class', ''))
+					
+					# Calculate capacity based on size and class
+					base_capacity = 2 ** size  # Size 1=2, Size 2=4, Size 3=8, etc.
+					if class_num == 8:
+						# Class 8 racks have 1.5x capacity
+						cargoCap += int(base_capacity * 1.5)
+					else:
+						# Standard class racks
+						cargoCap += base_capacity
+		this.cargoCapacity = cargoCap
+
+	# Detect cargo type from modules
+	this.cargoType = detect_cargo_type(state['Modules'])
+	debug_log("Startup - Cargo type detected: {}, Cargo racks found: {}", this.cargoType, len(this.cargoRacks))
+	debug_log("StartUp - Cargo detection complete, moving to ship tracking")
+	
+	# Load rank data from state
+	debug_log("StartUp state keys: {}", state.keys())  # Debug
+	if 'Rank' in state:
+		debug_log("Rank in state: {}", state['Rank'])  # Debug
+		update_ranks(state['Rank'])
+	else:
+		debug_log("No Rank found in state")
+		# Try alternative ways to get rank data
+		for key in state.keys():
+			if 'rank' in key.lower():
+				debug_log("Found potential rank key: {} = {}", key, state[key])
+	
+	# Load credits data from state
+	if 'Credits' in state:
+		debug_log("Credits in state: {}", state['Credits'])  # Debug
+		update_credits(state['Credits'])
+	else:
+		debug_log("No Credits found in state")
+	
+	# Load location data from state
+	if 'StationName' in state:
+		this.currentStation = state['StationName']
+		debug_log("StartUp - Loaded station: {}", this.currentStation)
+	
+	# Try multiple possible system name keys
+	if 'StarSystem' in state:
+		this.currentSystem = state['StarSystem']
+		debug_log("StartUp - Loaded system from StarSystem: {}", this.currentSystem)
+	elif 'SystemName' in state:
+		this.currentSystem = state['SystemName']
+		debug_log("StartUp - Loaded system from SystemName: {}", this.currentSystem)
+	elif 'System' in state:
+		this.currentSystem = state['System']
+		debug_log("StartUp - Loaded system from System: {}", this.currentSystem)
+	else:
+		debug_log("StartUp - No system name found in state")
+	
+	# Load commander name from state
+	debug_log("StartUp - Checking for commander data...")
+	if 'Captain' in state:
+		debug_log("StartUp - Captain data found: {}", state['Captain'])
+		if 'Name' in state['Captain']:
+			this.commanderName = state['Captain']['Name']
+			debug_log("StartUp - Loaded commander name from Captain: {}", this.commanderName)
 		else:
-			debug_log("No Credits found in state")
-		
-		# Load location data from state
-		if 'StationName' in state:
-			this.currentStation = state['StationName']
-			debug_log(f"StartUp - Loaded station: {this.currentStation}")
-		
-		# Try multiple possible system name keys
-		if 'StarSystem' in state:
-			this.currentSystem = state['StarSystem']
-			debug_log(f"StartUp - Loaded system from StarSystem: {this.currentSystem}")
-		elif 'SystemName' in state:
-			this.currentSystem = state['SystemName']
-			debug_log(f"StartUp - Loaded system from SystemName: {this.currentSystem}")
-		elif 'System' in state:
-			this.currentSystem = state['System']
-			debug_log(f"StartUp - Loaded system from System: {this.currentSystem}")
+			debug_log("StartUp - Captain found but no Name field")
+	elif 'Commander' in state:
+		debug_log("StartUp - Commander data found: {}", state['Commander'])
+		if 'Name' in state['Commander']:
+			this.commanderName = state['Commander']['Name']
+			debug_log("StartUp - Loaded commander name from Commander: {}", this.commanderName)
 		else:
-			debug_log("StartUp - No system name found in state")
-		
-		# Load commander name from state
-		debug_log(f"StartUp - Checking for commander data...")
-		if 'Captain' in state:
-			debug_log(f"StartUp - Captain data found: {state['Captain']}")
-			if 'Name' in state['Captain']:
-				this.commanderName = state['Captain']['Name']
-				debug_log(f"StartUp - Loaded commander name from Captain: {this.commanderName}")
-			else:
-				debug_log(f"StartUp - Captain found but no Name field")
-		elif 'Commander' in state:
-			debug_log(f"StartUp - Commander data found: {state['Commander']}")
-			if 'Name' in state['Commander']:
-				this.commanderName = state['Commander']['Name']
-				debug_log(f"StartUp - Loaded commander name from Commander: {this.commanderName}")
+			debug_log("StartUp - Commander found but no Name field")
+	else:
+		debug_log("StartUp - No Captain or Commander data found in state")
+	
+	# Check all keys that might contain commander info
+	for key in state.keys():
+		if 'commander' in key.lower() or 'captain' in key.lower() or 'name' in key.lower():
+			debug_log("StartUp - Potential commander key '{}': {}", key, state[key])
+	
+	# Fallback: Try to get commander name from EDMC's current commander
+	if this.commanderName == "Unknown":
+		try:
+			# Try to get the current commander from EDMC's state
+			from config import config
+			current_cmdr = config.get_str('commander')
+			if current_cmdr:
+				this.commanderName = current_cmdr
+				debug_log("StartUp - Loaded commander name from EDMC config: {}", this.commanderName)
 			else:
-				debug_log(f"StartUp - Commander found but no Name field")
-		else:
-			debug_log("StartUp - No Captain or Commander data found in state")
-		
-		# Check all keys that might contain commander info
-		for key in state.keys():
-			if 'commander' in key.lower() or 'captain' in key.lower() or 'name' in key.lower():
-				debug_log(f"StartUp - Potential commander key '{key}': {state[key]}")
-		
-		# Fallback: Try to get commander name from EDMC's current commander
-		if this.commanderName == "Unknown":
-			try:
-				# Try to get the current commander from EDMC's state
-				from config import config
-				current_cmdr = config.get_str('commander')
-				if current_cmdr:
-					this.commanderName = current_cmdr
-					debug_log(f"StartUp - Loaded commander name from EDMC config: {this.commanderName}")
-				else:
-					debug_log("StartUp - No commander name found in EDMC config")
-			except Exception as e:
-				debug_log(f"StartUp - Error getting commander from EDMC config: {e}")
-
-		update_display()
-		# Update cargo manifest display specifically to ensure it loads properly
-		update_cargo_manifest_display()
-		# Update captain info display specifically to ensure commander data is shown
-		update_captain_info_display()
-		# Update cargo racks display specifically to ensure racks are shown
-		update_cargo_racks_display()
-		# Update budget display if enabled
-		if this.budgetEnabled:
-			update_budget_display()
-		# Update Discord status when game starts up
-		if this.enableDiscordRPC:
-			update_discord_status()
-		
-		# --- SHIP TRACKING SECTION: Always runs after cargo detection ---
-		ship_name = state.get('ShipName') or state.get('ShipIdent') or state.get('Ship') or None
-		ship_type = state.get('ShipType') or state.get('Ship') or None
+				debug_log("StartUp - No commander name found in EDMC config")
+		except Exception as e:
+			debug_log("StartUp - Error getting commander from EDMC config: {}", e)
 
-		if ship_name and ship_name != "None":
-			this.currentShipName = ship_name
-		else:
-			this.currentShipName = "Unknown"
+	update_display()
+	# Update Discord status when game starts up
+	if this.enableDiscordRPC:
+		update_discord_status()
+	
+	# --- SHIP TRACKING SECTION: Always runs after cargo detection ---
+	ship_name = state.get('ShipName') or state.get('ShipIdent') or state.get('Ship') or None
+	ship_type = state.get('ShipType') or state.get('Ship') or None
 
-		if ship_type and ship_type != "None":
-			this.currentShipType = ship_type
-		else:
-			this.currentShipType = "Unknown"
+	if ship_name and ship_name != "None":
+		this.currentShipName = ship_name
+	else:
+		this.currentShipName = "Unknown"
 
-			debug_log(f"StartUp - Final ship name: {this.currentShipName}")
-	debug_log(f"StartUp - Final ship type: {this.currentShipType}")
-	debug_log(f"StartUp - Ship info for webhooks: {this.currentShipName} ({this.currentShipType})")
+	if ship_type and ship_type != "None":
+		this.currentShipType = ship_type
+	else:
+		this.currentShipType = "Unknown"
+
+	debug_log("StartUp - Final ship name: {}", this.currentShipName)
+	debug_log("StartUp - Final ship type: {}", this.currentShipType)
+	debug_log("StartUp - Ship info for webhooks: {} ({})", this.currentShipName, this.currentShipType)
 
 def detect_cargo_type(modules):
 	"""Detect cargo type based on installed modules"""
 	this.cargoRacks = []  # Reset cargo racks list
 	cargo_type = "Cargo"  # Default cargo type
 	
-	debug_log(f"Detecting cargo type from {len(modules)} modules")
+	debug_log("Detecting cargo type from {} modules", len(modules))
 	
 	# Log all modules for debugging
 	all_modules = list(modules.items())
-	debug_log(f"All modules: {[module_data['Item'] for module_id, module_data in all_modules]}")
+	debug_log("All modules: {}", [module_data['Item'] for module_id, module_data in all_modules])
 	
 	# Log modules that might be cargo racks
 	cargo_like_modules = [module_data['Item'] for module_id, module_data in all_modules 
 	                     if 'cargo' in module_data['Item'].lower() or 'rack' in module_data['Item'].lower()]
-	debug_log(f"Cargo-like modules: {cargo_like_modules}")
+	debug_log("Cargo-like modules: {}", cargo_like_modules)
 	
 	for module_id, module_data in modules.items():
 		item = module_data['Item']
-		debug_log(f"Checking module: {item}")
+		debug_log("Checking module: {}", item)
 		
 		if 'refinery' in item.lower():
 			debug_log("Found refinery module")
@@ -1287,77 +1841,77 @@ def detect_cargo_type(modules):
 			debug_log("Found limpet module")
 			return "Limpet"
 		elif 'cargo' in item.lower():
-			debug_log(f"Found cargo module: {item}")
+			debug_log("Found cargo module: {}", item)
 			# Check for MK II racks specifically
 			if 'mk' in item.lower() and 'ii' in item.lower():
-				debug_log(f"*** MK II CARGO RACK DETECTED: {item} ***")
+				debug_log("*** MK II CARGO RACK DETECTED: {} ***", item)
 			# Special logging for Size 8 racks
 			if 'size8' in item.lower():
-				debug_log(f"*** SIZE 8 CARGO RACK: {item} ***")
+				debug_log("*** SIZE 8 CARGO RACK: {} ***", item)
 			# Add cargo rack to the list
 			rack_info = parse_cargo_rack(item, module_data)
 			if rack_info:
 				this.cargoRacks.append(rack_info)
-				debug_log(f"Added cargo rack: {rack_info['name']} with capacity {rack_info['capacity']}")
+				debug_log("Added cargo rack: {} with capacity {}", rack_info['name'], rack_info['capacity'])
 			else:
-				debug_log(f"Failed to parse cargo rack: {item}")
+				debug_log("Failed to parse cargo rack: {}", item)
 				# Special debug for MK II racks
 				if 'mk' in item.lower() and 'ii' in item.lower():
-					debug_log(f"MK II cargo rack detected but not parsed: {item}")
-					debug_log(f"Full module data for MK II rack: {module_data}")
+					debug_log("MK II cargo rack detected but not parsed: {}", item)
+					debug_log("Full module data for MK II rack: {}", module_data)
 			# Don't return here - continue checking for more cargo racks
 			cargo_type = "Cargo"
 		elif 'mk' in item.lower() and 'ii' in item.lower():
-			debug_log(f"*** MK II MODULE DETECTED (not cargo): {item} ***")
+			debug_log("*** MK II MODULE DETECTED (not cargo): {} ***", item)
 			# Check if this might be a cargo rack even if it doesn't contain 'cargo'
 			if 'rack' in item.lower() or 'cargo' in item.lower():
-				debug_log(f"*** MK II CARGO RACK DETECTED: {item} ***")
+				debug_log("*** MK II CARGO RACK DETECTED: {} ***", item)
 				rack_info = parse_cargo_rack(item, module_data)
 				if rack_info:
 					this.cargoRacks.append(rack_info)
-					debug_log(f"Added MK II cargo rack: {rack_info['name']} with capacity {rack_info['capacity']}")
+					debug_log("Added MK II cargo rack: {} with capacity {}", rack_info['name'], rack_info['capacity'])
 				else:
-					debug_log(f"Failed to parse MK II cargo rack: {item}")
+					debug_log("Failed to parse MK II cargo rack: {}", item)
 				cargo_type = "Cargo"
 		elif 'mk' in item.lower():
-			debug_log(f"*** MK MODULE DETECTED: {item} ***")
+			debug_log("*** MK MODULE DETECTED: {} ***", item)
 			# Check for any MK variant cargo racks
 			if 'rack' in item.lower() or 'cargo' in item.lower():
-				debug_log(f"*** MK CARGO RACK DETECTED: {item} ***")
+				debug_log("*** MK CARGO RACK DETECTED: {} ***", item)
 				rack_info = parse_cargo_rack(item, module_data)
 				if rack_info:
 					this.cargoRacks.append(rack_info)
-					debug_log(f"Added MK cargo rack: {rack_info['name']} with capacity {rack_info['capacity']}")
+					debug_log("Added MK cargo rack: {} with capacity {}", rack_info['name'], rack_info['capacity'])
 				else:
-					debug_log(f"Failed to parse MK cargo rack: {item}")
+					debug_log("Failed to parse MK cargo rack: {}", item)
 				cargo_type = "Cargo"
 		elif 'rack' in item.lower():
-			debug_log(f"*** RACK MODULE DETECTED: {item} ***")
+			debug_log("*** RACK MODULE DETECTED: {} ***", item)
 			# Check for any rack that might be cargo-related
 			if 'cargo' in item.lower() or 'mk' in item.lower():
-				debug_log(f"*** POTENTIAL CARGO RACK: {item} ***")
+				debug_log("*** POTENTIAL CARGO RACK: {} ***", item)
 				rack_info = parse_cargo_rack(item, module_data)
 				if rack_info:
 					this.cargoRacks.append(rack_info)
-					debug_log(f"Added potential cargo rack: {rack_info['name']} with capacity {rack_info['capacity']}")
+					debug_log("Added potential cargo rack: {} with capacity {}", rack_info['name'], rack_info['capacity'])
 				else:
-					debug_log(f"Failed to parse potential cargo rack: {item}")
+					debug_log("Failed to parse potential cargo rack: {}", item)
 				cargo_type = "Cargo"
 	
-	debug_log(f"Finished checking modules. Found {len(this.cargoRacks)} cargo racks")
+	debug_log("Finished checking modules. Found {} cargo racks", len(this.cargoRacks))
 	
 	# Calculate total detected capacity
 	detected_capacity = sum(rack['capacity'] for rack in this.cargoRacks)
-	debug_log(f"Total detected capacity: {detected_capacity}")
+	debug_log("Total detected capacity: {}", detected_capacity)
 	
 	# Compare with actual cargo capacity if available
 	if hasattr(this, 'cargoCapacity') and this.cargoCapacity != "?":
 		try:
 			actual_capacity = int(this.cargoCapacity)
-			debug_log(f"Actual cargo capacity: {actual_capacity}")
+			debug_log("Actual cargo capacity: {}", actual_capacity)
 			if actual_capacity > detected_capacity:
 				missing_capacity = actual_capacity - detected_capacity
-				debug_log(f"Missing capacity: {missing_capacity} tons - likely MK II racks not detected")
+				debug_log("Missing capacity: {} tons - likely MK II racks not detected", missing_capacity)
 				
 				# Try to add missing MK II racks based on capacity
 				if missing_capacity == 384:
@@ -1395,19 +1949,19 @@ def detect_cargo_type(modules):
 						'item_name': "mk_ii_cargorack_size7_class8"
 					})
 		except ValueError:
-			debug_log(f"Could not parse cargo capacity: {this.cargoCapacity}")
+			debug_log("Could not parse cargo capacity: {}", this.cargoCapacity)
 	
 	return cargo_type  # Return the determined cargo type
 
 def parse_cargo_rack(item_name, module_data):
 	"""Parse cargo rack information from module data"""
 	try:
-		debug_log(f"Parsing cargo rack: {item_name}")
+		debug_log("Parsing cargo rack: {}", item_name)
 		
 		# Extract size and class from item name (e.g., "int_cargorack_size3_class5", "int_largecargorack_size8_class1", or MK II variants)
 		if 'cargorack' in item_name.lower() or ('mk' in item_name.lower() and 'rack' in item_name.lower()) or ('rack' in item_name.lower() and 'cargo' in item_name.lower()):
 			parts = item_name.split('_')
-			debug_log(f"Split parts: {parts}")
+			debug_log("Split parts: {}", parts)
 			
 			# Special handling for MK II cargo racks
 			if 'mk' in item_name.lower() and 'ii' in item_name.lower():
@@ -1425,7 +1979,7 @@ def parse_cargo_rack(item_name, module_data):
 							# Calculate capacity based on size (Class 8 = 1.5x multiplier)
 							base_capacity = 2 ** size
 							capacity = int(base_capacity * 1.5)
-							debug_log(f"Extracted size {size} for MK II rack, calculated capacity: {capacity}")
+							debug_log("Extracted size {} for MK II rack, calculated capacity: {}", size, capacity)
 							break
 						except ValueError:
 							pass
@@ -1434,11 +1988,11 @@ def parse_cargo_rack(item_name, module_data):
 				if '192' in item_name or 'size7' in item_name.lower():
 					capacity = 192
 					size = 7  # Size 7 Class 8 = 128 * 1.5 = 192
-					debug_log(f"Detected 192 capacity MK II rack, using size 7")
+					debug_log("Detected 192 capacity MK II rack, using size 7")
 				elif '384' in item_name or 'size8' in item_name.lower():
 					capacity = 384
 					size = 8  # Size 8 Class 8 = 256 * 1.5 = 384
-					debug_log(f"Detected 384 capacity MK II rack, using size 8")
+					debug_log("Detected 384 capacity MK II rack, using size 8")
 				
 				result = {
 					'name': f"MK II Cargo Rack (Size {size})",
@@ -1447,7 +2001,7 @@ def parse_cargo_rack(item_name, module_data):
 					'class': 8,
 					'item_name': item_name
 				}
-				debug_log(f"Successfully parsed MK II cargo rack: {result}")
+				debug_log("Successfully parsed MK II cargo rack: {}", result)
 				return result
 			
 			# Handle both formats: standard and large
@@ -1466,7 +2020,7 @@ def parse_cargo_rack(item_name, module_data):
 					size = int(size_part.replace('size', ''))
 					class_num = int(class_part.replace('class', ''))
 					
-					debug_log(f"Extracted size: {size}, class: {class_num}")
+					debug_log("Extracted size: {}, class: {}", size, class_num)
 					
 					# Calculate capacity based on size and class
 					base_capacity = 2 ** size  # Size 1=2, Size 2=4, Size 3=8, etc.
@@ -1477,7 +2031,7 @@ def parse_cargo_rack(item_name, module_data):
 						# Standard class racks
 						capacity = base_capacity
 					
-					debug_log(f"Calculated capacity: {capacity}")
+					debug_log("Calculated capacity: {}", capacity)
 					
 					# Create friendly name
 					friendly_name = f"Size {size} Class {class_num} Cargo Rack"
@@ -1492,16 +2046,16 @@ def parse_cargo_rack(item_name, module_data):
 						'item_name': item_name
 					}
 					
-					debug_log(f"Successfully parsed cargo rack: {result}")
+					debug_log("Successfully parsed cargo rack: {}", result)
 					return result
 				else:
-					debug_log(f"Could not find size or class parts in item name")
+					debug_log("Could not find size or class parts in item name")
 			else:
-				debug_log(f"Not enough parts in item name: {len(parts)} parts")
+				debug_log("Not enough parts in item name: {} parts", len(parts))
 		else:
-			debug_log(f"Item name doesn't contain 'cargorack': {item_name}")
+			debug_log("Item name doesn't contain 'cargorack': {}", item_name)
 	except Exception as e:
-		debug_log(f"Error parsing cargo rack {item_name}: {e}")
+		debug_log("Error parsing cargo rack {}: {}", item_name, e)
 		return None
 	
 	return None
@@ -1536,7 +2090,7 @@ def update_ranks(ranks):
 			
 			this.tradeRank = trade_rank_names.get(rank_level, f"Rank {rank_level}")
 			this.tradeProgress = progress
-			debug_log(f"Trade rank updated: {this.tradeRank} ({this.tradeProgress}%)")
+			debug_log("Trade rank updated: {} ({}%)", this.tradeRank, this.tradeProgress)
 	
 	# Update exploration rank
 	if 'Explore' in ranks:
@@ -1566,7 +2120,7 @@ def update_ranks(ranks):
 			
 			this.explorationRank = explore_rank_names.get(rank_level, f"Rank {rank_level}")
 			this.explorationProgress = progress
-			debug_log(f"Exploration rank updated: {this.explorationRank} ({this.explorationProgress}%)")
+			debug_log("Exploration rank updated: {} ({}%)", this.explorationRank, this.explorationProgress)
 
 def update_trade_rank(ranks):
 	"""Update trade rank information from ranks data (legacy function)"""
@@ -1575,13 +2129,11 @@ def update_trade_rank(ranks):
 def update_credits(credits_amount):
 	"""Update credits information"""
 	this.credits = credits_amount
-	debug_log(f"Credits updated: {this.credits:,}")  # Debug
-	# Update budget display when credits change
-	if this.budgetEnabled:
-		update_budget_display()
+	debug_log("Credits updated: {:,}", this.credits)  # Debug
+	mark_dirty('Captain Information', 'Budget')
 
-def send_discord_webhook(webhook_url, message, embed=None):
-	"""Send a message to Discord via webhook"""
+def send_discord_webhook(webhook_url, message, embed=None, kind='trade', event=None):
+	"""Queue a message for the Discord webhook and any sinks that want event; returns False if the queue had to drop it"""
 	payload = {
 		"username": this.webhookBotName
 	}
@@ -1595,25 +2147,550 @@ def send_discord_webhook(webhook_url, message, embed=None):
 	else:
 		payload["content"] = message
 	
+	return publish_notification(webhook_url, payload, kind, event or kind)
+
+def publish_notification(webhook_url, payload, kind, event):
+	"""Serialize a payload once and queue it for the Discord webhook (if any) and every sink whose filter takes event"""
+	body = json.dumps(payload)
+	queued = True
+	# Offline (tools/replay.py without --online) only local file sinks are written
+	if webhook_url and not this.offline:
+		queued = enqueue_webhook(webhook_url, payload, kind, body)
+	for sink in this.sinks:
+		if this.offline and sink['sink'] != 'file':
+			continue
+		if sink['events'] is None or event in sink['events']:
+			queued = enqueue_webhook(sink['url'], payload, kind, body, sink['sink']) and queued
+	return queued
+
+def load_sinks():
+	"""Read the extra notification destinations from sinks.json in the plugin folder
+
+	Each entry is {"type": "discord" | "http" | "file", "url" or "path": destination, "events": [...]},
+	where events is any of SINK_EVENTS and defaults to all of them. Relative file paths are taken
+	from the plugin folder. Invalid entries are logged and skipped.
+	"""
 	try:
-		response = requests.post(webhook_url, json=payload)
-		response.raise_for_status()
-		debug_log(f"Discord webhook sent successfully")
+		with open(path.join(get_plugin_path(), "sinks.json"), 'r', encoding='utf-8') as f:
+			sinksConfig = json.load(f)
+	except FileNotFoundError:
+		return []
+	except Exception as e:
+		debug_log("Error reading sinks.json: {}", e)
+		return []
+	sinks = []
+	for item in sinksConfig.get('sinks', []) if isinstance(sinksConfig, dict) else sinksConfig:
+		try:
+			sinkType = item.get('type', 'discord')
+			events = item.get('events')
+			if sinkType not in SINK_TYPES or (events is not None and not set(events) <= set(SINK_EVENTS)):
+				raise ValueError("unknown type or event")
+			if sinkType == 'file':
+				destination = path.join(get_plugin_path(), path.expanduser(item['path']))
+			else:
+				destination = item['url'].strip()
+				if not destination.startswith(('http://', 'https://')):
+					raise ValueError("url must start with http:// or https://")
+			sinks.append({'sink': sinkType, 'url': destination, 'events': frozenset(events) if events is not None else None})
+		except Exception as e:
+			debug_log("Skipping sinks.json entry {}: {}", item, e)
+	debug_log("Loaded {} notification sinks", len(sinks))
+	return sinks
+
+def sink_label(sink):
+	"""Name a sink for display without showing a Discord webhook's secret token"""
+	if sink['sink'] == 'file':
+		return f"file {path.basename(sink['url'])}"
+	from urllib.parse import urlsplit
+	parts = urlsplit(sink['url'])
+	return f"{sink['sink']} {parts.netloc}" if sink['sink'] == 'discord' else f"{sink['sink']} {parts.netloc}{parts.path}"
+
+def enqueue_webhook(webhook_url, payload, kind, body=None, sink='discord'):
+	"""Hand a payload to the delivery worker; never waits on the network. body is payload already serialized"""
+	delivery = {'url': webhook_url, 'payload': payload, 'body': body, 'kind': kind, 'sink': sink, 'queued': time.time(), 'ids': None}
+	with this.webhookCondition:
+		start_webhook_worker()
+		if this.webhookQueued >= WEBHOOK_QUEUE_SIZE and not make_webhook_room(kind):
+			this.webhookStats['dropped'] += 1
+			debug_log("Webhook queue full, dropped new {} message", kind)
+			trace('webhook', kind, None, 0.0, None, 'dropped: queue full')
+			return False
+		lane = this.webhookLanes.get((webhook_url, kind))
+		if lane is None:
+			lane = this.webhookLanes[(webhook_url, kind)] = deque()
+		lane.append(delivery)
+		if kind == 'trade':
+			this.outboxUnsaved.append(delivery)  # The worker writes it to the outbox before sending it
+		this.webhookQueued += 1
+		this.webhookStats['queued'] += 1
+		this.webhookCondition.notify()
+	return True
+
+def start_webhook_worker():
+	"""Start the delivery dispatcher and its senders if they are not running; the outbox left by earlier sessions is replayed first"""
+	with this.webhookCondition:
+		if this.webhookWorker is None:
+			this.webhookStopping = False
+			this.webhookWorker = threading.Thread(target=deliver_webhooks, name="CargoManifestWebhooks", daemon=True)
+			this.webhookWorker.start()
+			for number in range(WEBHOOK_SENDERS):
+				threading.Thread(target=send_deliveries, name=f"CargoManifestSender{number}", daemon=True).start()
+
+def make_webhook_room(kind):
+	"""Free a slot in the full webhook queue for a new delivery of kind; call with webhookCondition held"""
+	# A queued status update is superseded by any newer one, so it is always the first to go
+	lanes = [lane for (_, laneKind), lane in this.webhookLanes.items() if laneKind == 'status' and lane]
+	if not lanes:
+		if WEBHOOK_OVERFLOW.get(kind) != 'drop_oldest':
+			return False
+		lanes = [lane for (_, laneKind), lane in this.webhookLanes.items() if laneKind == kind and lane]
+		if not lanes:
+			return False
+	delivery = min(lanes, key=lambda lane: lane[0]['queued']).popleft()
+	dropped = delivery.get('batched', 1)  # A batch put back after a failed send holds several messages
+	this.webhookQueued -= dropped
+	this.webhookStats['dropped'] += dropped
+	if delivery['ids'] is None:
+		# Not written to the outbox yet, so make sure it never is
+		this.outboxUnsaved = [unsaved for unsaved in this.outboxUnsaved if unsaved is not delivery]
+	if delivery['kind'] == 'status':
+		forget_status_fingerprint()
+	ack_outbox(delivery)
+	debug_log("Webhook queue full, dropped queued {} message", delivery['kind'])
+	return True
+
+def webhook_route(webhook_url):
+	"""Discord rate limits webhooks per id/token, so the URL without its query string names the bucket"""
+	return webhook_url.split('?', 1)[0]
+
+def next_webhook_delivery():
+	"""Pop the next delivery whose rate limit bucket has room, taking lanes in turn; returns (delivery, seconds to wait)
+
+	Call with webhookCondition held. Returns (None, wait) when every waiting lane is rate limited, or
+	(None, None) when nothing is queued.
+	"""
+	now = time.monotonic()
+	globalWait = this.globalRateLimitUntil - now  # Discord's global limit holds back Discord lanes only
+	wait = None
+	for key in list(this.webhookLanes):
+		lane = this.webhookLanes[key]
+		if not lane:
+			del this.webhookLanes[key]
+			continue
+		if key[0] in this.webhookInFlight:
+			continue  # The sender will notify when this destination is free again
+		discord = lane[0]['sink'] == 'discord'
+		if discord and globalWait > 0:
+			wait = globalWait if wait is None else min(wait, globalWait)
+			continue
+		if discord and key[1] == 'trade' and this.webhookBatchWindow > 0 and len(lane) < WEBHOOK_BATCH_SIZE and not this.webhookStopping:
+			# Hold trades for the batch window so a selling spree goes out as a few messages
+			due = lane[0]['queued'] + this.webhookBatchWindow - time.time()
+			if due > 0:
+				wait = due if wait is None else min(wait, due)
+				continue
+		limit = this.rateLimits.get(webhook_route(key[0]))
+		if limit is not None and limit[0] <= 0 and limit[1] > now:
+			# Bucket is used up; wait for it instead of collecting a 429
+			wait = limit[1] - now if wait is None else min(wait, limit[1] - now)
+			continue
+		if discord and key[1] == 'status':
+			# Each status replaces the message in place, so only the newest queued one is worth sending
+			while len(lane) > 1:
+				lane.popleft()
+				this.webhookQueued -= 1
+				this.webhookStats['statusSuperseded'] += 1
+		delivery = pop_webhook_batch(lane) if discord and key[1] == 'trade' else lane.popleft()
+		this.webhookQueued -= delivery.get('batched', 1)
+		# Move the lane to the back so status and trade traffic on the same webhook take turns
+		del this.webhookLanes[key]
+		if lane:
+			this.webhookLanes[key] = lane
+		if limit is not None:
+			if limit[1] > now:
+				limit[0] -= 1  # Count the request against the bucket until its response tells us more
+			else:
+				del this.rateLimits[webhook_route(key[0])]  # Bucket has reset; the response will say how much is left
+		return delivery, None
+	return None, wait
+
+def pop_webhook_batch(lane):
+	"""Pop the lane's first delivery merged with the embed-only deliveries behind it, up to WEBHOOK_BATCH_SIZE embeds"""
+	first = lane.popleft()
+	embeds = first['payload'].get('embeds')
+	if not embeds or 'content' in first['payload']:
+		return first
+	embeds = list(embeds)
+	batched = alreadyBatched = first.get('batched', 1)  # A batch put back after a failed send may still have room
+	merged = []
+	# Only merge messages that would look the same apart from their embeds
+	sender = {key: value for key, value in first['payload'].items() if key != 'embeds'}
+	while lane and len(embeds) < WEBHOOK_BATCH_SIZE:
+		payload = lane[0]['payload']
+		more = payload.get('embeds')
+		if not more or len(embeds) + len(more) > WEBHOOK_BATCH_SIZE or {key: value for key, value in payload.items() if key != 'embeds'} != sender:
+			break
+		embeds.extend(more)
+		merged.append(lane.popleft())
+		batched += 1
+	if batched == alreadyBatched:
+		return first
+	this.webhookStats['batched'] += batched - alreadyBatched
+	ids = list(first['ids'] or [])
+	for delivery in merged:
+		ids.extend(delivery['ids'] or [])
+	return dict(first, payload=dict(first['payload'], embeds=embeds), body=None, batched=batched, ids=ids)
+
+def parse_seconds(value, default, maximum):
+	"""Turn a seconds setting into a number between 0 and maximum, or default if it is not a number"""
+	try:
+		return min(max(float(str(value).strip()), 0.0), maximum)
+	except (TypeError, ValueError):
+		return default
+
+def deliver_webhooks():
+	"""Dispatcher thread: hand queued deliveries to the senders, oldest first per destination and paced to Discord's rate limits"""
+	with this.webhookCondition:
+		open_outbox()
+	while True:
+		with this.webhookCondition:
+			save_outbox()
+			delivery, wait = next_webhook_delivery()
+			if delivery is None:
+				if wait is None and this.webhookStopping and not this.webhookInFlight:
+					break  # Stopping and nothing left to send
+				if wait is not None:
+					this.webhookStats['paced'] += 1
+				this.webhookCondition.wait(wait)
+				continue
+			waited = time.time() - delivery['queued']
+			record_latency('webhook', 'queue wait', waited)
+			if waited > WEBHOOK_MAX_AGE.get(delivery['kind'], WEBHOOK_MAX_AGE['status']):
+				this.webhookStats['expired'] += 1
+				debug_log("Dropped {} webhook that waited {:.0f}s", delivery['kind'], waited)
+				if delivery['kind'] == 'status':
+					forget_status_fingerprint()
+				ack_outbox(delivery)
+				continue
+			this.webhookInFlight.add(delivery['url'])
+		this.sendQueue.put(delivery)
+	for _ in range(WEBHOOK_SENDERS):
+		this.sendQueue.put(None)  # Let the senders exit
+
+def send_deliveries():
+	"""Sender thread: deliver what the dispatcher hands over, then acknowledge it or put it back for a retry"""
+	while True:
+		delivery = this.sendQueue.get()
+		if delivery is None:
+			return
+		response = None
+		try:
+			if delivery['sink'] == 'file':
+				failed = not append_sink_file(delivery)
+			else:
+				response = post_webhook(delivery)
+				failed = response is None or response.status_code >= 500
+		except Exception as e:
+			debug_log("Error sending {} notification to {}: {}", delivery['kind'], delivery['sink'], e)
+			failed = True
+		with this.webhookCondition:
+			this.webhookInFlight.discard(delivery['url'])
+			finish_delivery(delivery, response, failed)
+			this.webhookCondition.notify_all()
+
+def finish_delivery(delivery, response, failed):
+	"""Count a send and acknowledge the delivery, or requeue it at the front of its lane; call with webhookCondition held"""
+	route = webhook_route(delivery['url'])
+	stats = this.sinkStats.setdefault(delivery['url'], {'sent': 0, 'failed': 0})
+	if response is not None and update_rate_limit(delivery, response):
+		retry = True  # Rate limited after all; update_rate_limit() set the wait
+	elif failed:
+		# The destination or the network is down: keep it and back off, doubling the wait each time
+		retry = True
+		this.webhookStats['failed'] += 1
+		stats['failed'] += 1
+		backoff = min(max(this.webhookBackoff.get(route, 0) * 2, WEBHOOK_RETRY_MIN), WEBHOOK_RETRY_MAX)
+		this.webhookBackoff[route] = backoff
+		this.rateLimits[route] = [0, time.monotonic() + backoff]
+		debug_log("Retrying {} webhook in {}s", delivery['kind'], backoff)
+	else:
+		# Delivered, or rejected for good (bad URL, deleted webhook, invalid payload)
+		retry = False
+		if response is None or response.ok:
+			this.webhookStats['sent'] += 1
+			stats['sent'] += 1
+		else:
+			this.webhookStats['failed'] += 1
+			stats['failed'] += 1
+		this.webhookBackoff.pop(route, None)
+		ack_outbox(delivery)
+	if retry:
+		# Retry it first so the destination's order is kept
+		this.webhookStats['retried'] += 1
+		lane = this.webhookLanes.get((delivery['url'], delivery['kind']))
+		if lane is None:
+			lane = this.webhookLanes[(delivery['url'], delivery['kind'])] = deque()
+		lane.appendleft(delivery)
+		this.webhookQueued += delivery.get('batched', 1)
+
+def append_sink_file(delivery):
+	"""Append a delivery to a JSON Lines file sink; returns False if the file could not be written"""
+	# The payload is spliced in already serialized rather than encoded a second time
+	line = '{"time": %.3f, "kind": %s, "payload": %s}\n' % (delivery['queued'], json.dumps(delivery['kind']), delivery_body(delivery))
+	try:
+		with open(delivery['url'], 'a', encoding='utf-8') as f:
+			f.write(line)
 		return True
-	except requests.exceptions.RequestException as e:
-		debug_log(f"Discord webhook error: {e}")
+	except OSError as e:
+		debug_log("Error writing notification file {}: {}", delivery['url'], e)
 		return False
 
-def handle_market_sell(entry):
-	"""Handle MarketSell journal event"""
-	debug_log(f"handle_market_sell called - enableWebhooks: {this.enableWebhooks}, webhookUrl: {this.webhookUrl}")
-	if not this.enableWebhooks or not this.webhookUrl:
+def delivery_body(delivery):
+	"""Return the delivery's payload as JSON text, serializing it only if that has not been done yet"""
+	body = delivery.get('body')
+	if body is None:
+		body = delivery['body'] = json.dumps(delivery['payload'])
+	return body
+
+def open_outbox():
+	"""Open outbox.db and queue the trade webhooks earlier sessions could not send; call with webhookCondition held"""
+	import sqlite3
+	# Loaded here, before any sender runs, so the senders only ever share one dict
+	loaded = load_status_messages()
+	with this.statusMessagesLock:
+		this.statusMessages = loaded
+	try:
+		outbox = sqlite3.connect(path.join(get_plugin_path(), "outbox.db"), check_same_thread=False, isolation_level=None)
+		outbox.execute("PRAGMA journal_mode=WAL")
+		outbox.execute("PRAGMA synchronous=NORMAL")  # Durable across EDMC crashes; a power cut may lose the last few rows
+		outboxVersion = outbox.execute("PRAGMA user_version").fetchone()[0]
+		if outboxVersion == 1:
+			# Version 1 only ever held Discord webhooks, so its unsent rows are kept
+			outbox.execute("ALTER TABLE outbox ADD COLUMN sink TEXT NOT NULL DEFAULT 'discord'")
+			outbox.execute(f"PRAGMA user_version={OUTBOX_VERSION}")
+		elif outboxVersion != OUTBOX_VERSION:
+			outbox.execute("DROP TABLE IF EXISTS outbox")
+			outbox.execute("CREATE TABLE outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL, kind TEXT NOT NULL, payload TEXT NOT NULL, queued REAL NOT NULL, acked INTEGER NOT NULL DEFAULT 0, sink TEXT NOT NULL DEFAULT 'discord')")
+			outbox.execute(f"PRAGMA user_version={OUTBOX_VERSION}")
+		this.outbox = outbox
+		compact_outbox()
+		rows = outbox.execute("SELECT id, url, kind, payload, queued, sink FROM outbox WHERE acked = 0 ORDER BY id").fetchall()
+	except Exception as e:
+		debug_log("Webhook outbox unavailable, sending without it: {}", e)
+		this.outbox = None
+		return
+	# Unsent rows are older than anything queued this session, so they go in front, oldest first
+	for rowId, url, kind, payload, queued, sink in reversed(rows):
+		lane = this.webhookLanes.get((url, kind))
+		if lane is None:
+			lane = this.webhookLanes[(url, kind)] = deque()
+		lane.appendleft({'url': url, 'payload': json.loads(payload), 'body': payload, 'kind': kind, 'sink': sink, 'queued': queued, 'ids': [rowId]})
+		this.webhookQueued += 1
+	if rows:
+		debug_log("Replaying {} webhooks from the outbox", len(rows))
+
+def save_outbox():
+	"""Write trade deliveries queued since the last call to the outbox in one transaction; call with webhookCondition held"""
+	unsaved = [delivery for delivery in this.outboxUnsaved if delivery['ids'] is None]
+	this.outboxUnsaved = []
+	if this.outbox is None or not unsaved:
+		return
+	try:
+		this.outbox.execute("BEGIN")
+		for delivery in unsaved:
+			cursor = this.outbox.execute("INSERT INTO outbox (url, kind, payload, queued, sink) VALUES (?, ?, ?, ?, ?)", (delivery['url'], delivery['kind'], delivery_body(delivery), delivery['queued'], delivery['sink']))
+			delivery['ids'] = [cursor.lastrowid]
+		this.outbox.execute("COMMIT")
+	except Exception as e:
+		debug_log("Error writing webhook outbox: {}", e)
+		try:
+			this.outbox.execute("ROLLBACK")
+		except Exception:
+			pass
+		for delivery in unsaved:
+			delivery['ids'] = None
+
+def ack_outbox(delivery):
+	"""Mark a delivery's outbox rows done so they are not replayed; call with webhookCondition held"""
+	ids = delivery.get('ids')
+	if this.outbox is None or not ids:
+		return
+	try:
+		this.outbox.executemany("UPDATE outbox SET acked = 1 WHERE id = ?", [(rowId,) for rowId in ids])
+		this.outboxAcked += len(ids)
+		if this.outboxAcked >= OUTBOX_COMPACT_EVERY:
+			compact_outbox()
+	except Exception as e:
+		debug_log("Error updating webhook outbox: {}", e)
+
+def compact_outbox():
+	"""Delete acknowledged rows and fold the WAL back into the database; call with webhookCondition held"""
+	this.outbox.execute("DELETE FROM outbox WHERE acked = 1")
+	this.outbox.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+	this.outboxAcked = 0
+
+def update_rate_limit(delivery, response):
+	"""Record Discord's rate limit headers for the delivery's route; returns True if it was rejected with a 429"""
+	now = time.monotonic()
+	headers = response.headers
+	route = webhook_route(delivery['url'])
+	try:
+		if 'X-RateLimit-Remaining' in headers and 'X-RateLimit-Reset-After' in headers:
+			this.rateLimits[route] = [int(headers['X-RateLimit-Remaining']), now + float(headers['X-RateLimit-Reset-After'])]
+	except ValueError:
+		pass
+	if response.status_code != 429:
+		return False
+	this.webhookStats['rateLimited'] += 1
+	try:
+		retryAfter = float(headers.get('Retry-After') or response.json().get('retry_after', 1))
+	except ValueError:
+		retryAfter = 1.0
+	if headers.get('X-RateLimit-Global', '').lower() == 'true' or headers.get('X-RateLimit-Scope') == 'global':
+		this.globalRateLimitUntil = now + retryAfter
+	else:
+		this.rateLimits[route] = [0, now + retryAfter]
+	debug_log("Discord rate limited {} webhook, retrying in {:.2f}s", delivery['kind'], retryAfter)
+	return True
+
+def post_webhook(delivery):
+	"""Send one queued delivery to a Discord webhook or HTTP sink; returns the response, or None if the request failed outright"""
+	import requests
+	started = time.perf_counter()
+	try:
+		session = get_http_session(delivery['url'])
+		if delivery['sink'] == 'discord' and delivery['kind'] == 'status':
+			response = send_status_message(session, delivery['url'], delivery['payload'])
+		else:
+			headers = {'Content-Type': 'application/json', 'X-Cargo-Manifest-Kind': delivery['kind']}
+			response = session.post(delivery['url'], data=delivery_body(delivery).encode('utf-8'), headers=headers, timeout=WEBHOOK_TIMEOUT)
+	except requests.exceptions.RequestException as e:
+		debug_log("{} webhook error: {}", delivery['sink'], e)
+		elapsed = time.perf_counter() - started
+		record_latency('webhook', 'send_discord_webhook', elapsed)
+		trace('webhook', delivery['kind'], delivery['sink'], elapsed, None, repr(e))
+		return None
+	elapsed = time.perf_counter() - started
+	record_latency('webhook', 'send_discord_webhook', elapsed)
+	trace('webhook', delivery['kind'], delivery['sink'], elapsed, {'status': response.status_code}, None if response.ok else response.reason)
+	if response.ok:
+		debug_log("{} webhook sent successfully", delivery['sink'])
+	elif response.status_code != 429:
+		debug_log("{} webhook error: {} {}", delivery['sink'], response.status_code, response.reason)
+	return response
+
+def webhook_url_with(webhook_url, suffix='', query=''):
+	"""Add a path suffix and query parameters to a webhook URL, keeping any it already has (such as thread_id)"""
+	base, _, existing = webhook_url.partition('?')
+	query = '&'.join(part for part in (query, existing) if part)
+	return f"{base}{suffix}?{query}" if query else f"{base}{suffix}"
+
+def send_status_message(session, webhook_url, payload):
+	"""Edit the webhook's status message in place, posting a new one (and remembering its id) only when there is none"""
+	# Keyed by the full URL: the same webhook posting into different threads has a message in each
+	with this.statusMessagesLock:
+		messageId = this.statusMessages.get(webhook_url)
+	if messageId:
+		# Only content and embeds can be edited; the name and avatar stay as first posted
+		edit = {key: value for key, value in payload.items() if key in ('content', 'embeds')}
+		response = session.patch(webhook_url_with(webhook_url, f"/messages/{messageId}"), json=edit, timeout=WEBHOOK_TIMEOUT)
+		if response.status_code != 404:
+			if response.ok:
+				with this.webhookCondition:
+					this.webhookStats['statusEdited'] += 1
+			return response
+		debug_log("Status message {} is gone, posting a new one", messageId)
+		update_status_message(webhook_url, None)
+	response = session.post(webhook_url_with(webhook_url, query='wait=true'), json=payload, timeout=WEBHOOK_TIMEOUT)
+	if response.ok:
+		try:
+			update_status_message(webhook_url, response.json()['id'])
+		except (ValueError, KeyError, TypeError) as e:
+			debug_log("Status message id missing from response: {}", e)
+	return response
+
+def load_status_messages():
+	"""Load the ids of the status messages posted by earlier sessions"""
+	try:
+		with open(path.join(get_plugin_path(), "status_messages.json"), 'r', encoding='utf-8') as f:
+			return json.load(f)
+	except Exception:
+		return {}
+
+def update_status_message(webhook_url, messageId):
+	"""Remember (or with None, forget) the status message for a webhook and persist the ids for the next session"""
+	with this.statusMessagesLock:
+		if messageId is None:
+			this.statusMessages.pop(webhook_url, None)
+		else:
+			this.statusMessages[webhook_url] = messageId
+		try:
+			write_file_atomic(path.join(get_plugin_path(), "status_messages.json"), json.dumps(this.statusMessages, indent=4, sort_keys=True))
+		except Exception as e:
+			debug_log("Error saving status message ids: {}", e)
+
+def get_http_session(url):
+	"""Return the keep-alive session for url's host, creating it on first use"""
+	from urllib.parse import urlsplit
+	host = urlsplit(url).netloc.lower()
+	session = this.httpSessions.get(host)
+	if session is None:
+		import requests
+		from requests.adapters import HTTPAdapter
+		session = requests.Session()
+		# One pool per host; retries are left to the delivery queue so a slow host cannot stall it
+		adapter = HTTPAdapter(pool_connections=1, pool_maxsize=WEBHOOK_POOL_SIZE, max_retries=0)
+		session.mount('https://', adapter)
+		session.mount('http://', adapter)
+		session.headers['User-Agent'] = f"CargoManifestRemastered/{this.version}"
+		this.httpSessions[host] = session
+	return session
+
+def http_session_stats():
+	"""Return {host: (requests, connections opened)} for the webhook sessions; requests minus connections were reused"""
+	stats = {}
+	for host, session in list(this.httpSessions.items()):
+		requestCount = connectionCount = 0
+		for adapter in set(session.adapters.values()):
+			pools = adapter.poolmanager.pools
+			for key in list(pools.keys()):
+				pool = pools.get(key)
+				if pool is not None:
+					requestCount += pool.num_requests
+					connectionCount += pool.num_connections
+		stats[host] = (requestCount, connectionCount)
+	return stats
+
+def stop_webhook_worker():
+	"""Give queued webhooks a few seconds to go out before EDMC exits"""
+	with this.webhookCondition:
+		this.webhookStopping = True
+		this.webhookCondition.notify()
+	if this.webhookWorker is not None:
+		this.webhookWorker.join(timeout=WEBHOOK_SHUTDOWN_TIMEOUT)
+		if this.webhookQueued:
+			debug_log("{} webhooks still queued at shutdown were not sent", this.webhookQueued)
+	with this.webhookCondition:
+		if this.webhookWorker is not None and not this.webhookWorker.is_alive():
+			this.webhookWorker = None
+		# Anything still unsent stays in the outbox for the next session
+		save_outbox()
+		if this.outbox is not None and this.webhookWorker is None:
+			this.outbox.close()
+			this.outbox = None
+	for session in this.httpSessions.values():
+		session.close()
+
+def handle_market_sell(entry, profit):
+	"""Send the webhook for a MarketSell; profit is what calculate_profit() returned for it"""
+	from datetime import datetime
+	debug_log("handle_market_sell called - enableWebhooks: {}, webhookUrl: {}", this.enableWebhooks, this.webhookUrl)
+	webhook_url = this.webhookUrl if this.enableWebhooks else ""
+	if not webhook_url and not this.sinks:
 		debug_log("Webhook disabled or no URL")
 		return
 		
-	cargo_name = entry.get('Type_Localised', entry.get('Type', 'Unknown'))
-	# Capitalize first letter of each word in cargo name
-	cargo_name = ' '.join(word.capitalize() for word in cargo_name.split())
+	cargo_name = commodity_display_name(entry.get('Type'), entry.get('Type_Localised'))
 	quantity = entry.get('Count', 0)
 	price_per_unit = entry.get('SellPrice', 0)
 	total_price = entry.get('TotalSale', 0)
@@ -1622,11 +2699,11 @@ def handle_market_sell(entry):
 	station = this.currentStation
 	system = this.currentSystem
 	
-	debug_log(f"Location data - Station: {station}, System: {system}")
-	debug_log(f"Commander name for webhook: {this.commanderName}")
+	debug_log("Location data - Station: {}, System: {}", station, system)
+	debug_log("Commander name for webhook: {}", this.commanderName)
 	
-	# Calculate profit if we have purchase history
-	buy_price, profit_per_unit, total_profit = calculate_profit(cargo_name, quantity, price_per_unit)
+	# Profit is only known if we have purchase history
+	buy_price, profit_per_unit, total_profit = profit
 	
 	# Create Discord embed
 	embed = {
@@ -1679,7 +2756,7 @@ def handle_market_sell(entry):
 		embed["color"] = profit_color
 		embed["fields"].append({
 			"name": f"{profit_emoji} {profit_text}",
-			"value": f"**{total_profit:+,} cr** ({profit_per_unit:+,} cr/unit)",
+			"value": f"**{total_profit:+,} cr** ({profit_per_unit:+,.0f} cr/unit)",
 			"inline": True
 		})
 		embed["fields"].append({
@@ -1695,14 +2772,14 @@ def handle_market_sell(entry):
 	})
 	
 	# Add ship information
-	debug_log(f"Market sell - Ship name: '{this.currentShipName}', Ship type: '{this.currentShipType}'")
+	debug_log("Market sell - Ship name: '{}', Ship type: '{}'", this.currentShipName, this.currentShipType)
 	if this.currentShipName and this.currentShipName != "Unknown" and this.currentShipName != "None":
 		ship_info = f"{this.currentShipName}"
 		if this.currentShipType != "Unknown" and this.currentShipType != this.currentShipName:
 			ship_info += f" ({this.currentShipType})"
 	else:
 		ship_info = f"{this.currentShipType}" if this.currentShipType != "Unknown" else "Unknown Ship"
-	debug_log(f"Market sell - Final ship info: '{ship_info}'")
+	debug_log("Market sell - Final ship info: '{}'", ship_info)
 	
 	embed["fields"].append({
 		"name": "🚀 Ship",
@@ -1715,19 +2792,19 @@ def handle_market_sell(entry):
 	}
 	embed["timestamp"] = datetime.utcnow().isoformat()
 	
-	debug_log(f"Sending webhook embed for sale")
-	send_discord_webhook(this.webhookUrl, None, embed)
+	debug_log("Sending webhook embed for sale")
+	send_discord_webhook(webhook_url, None, embed, event='sell')
 
 def handle_market_buy(entry):
 	"""Handle MarketBuy journal event"""
-	debug_log(f"handle_market_buy called - enableWebhooks: {this.enableWebhooks}, webhookUrl: {this.webhookUrl}")
-	if not this.enableWebhooks or not this.webhookUrl:
+	from datetime import datetime
+	debug_log("handle_market_buy called - enableWebhooks: {}, webhookUrl: {}", this.enableWebhooks, this.webhookUrl)
+	webhook_url = this.webhookUrl if this.enableWebhooks else ""
+	if not webhook_url and not this.sinks:
 		debug_log("Webhook disabled or no URL")
 		return
 		
-	cargo_name = entry.get('Type_Localised', entry.get('Type', 'Unknown'))
-	# Capitalize first letter of each word in cargo name
-	cargo_name = ' '.join(word.capitalize() for word in cargo_name.split())
+	cargo_name = commodity_display_name(entry.get('Type'), entry.get('Type_Localised'))
 	quantity = entry.get('Count', 0)
 	price_per_unit = entry.get('BuyPrice', 0)
 	total_price = entry.get('TotalCost', 0)
@@ -1736,20 +2813,17 @@ def handle_market_buy(entry):
 	station = this.currentStation
 	system = this.currentSystem
 	
-	debug_log(f"Location data - Station: {station}, System: {system}")
-	
-	# Track the purchase for profit calculation
-	track_purchase(cargo_name, quantity, price_per_unit, total_price)
+	debug_log("Location data - Station: {}, System: {}", station, system)
 	
 	# Add ship information
-	debug_log(f"Market buy - Ship name: '{this.currentShipName}', Ship type: '{this.currentShipType}'")
+	debug_log("Market buy - Ship name: '{}', Ship type: '{}'", this.currentShipName, this.currentShipType)
 	if this.currentShipName and this.currentShipName != "Unknown" and this.currentShipName != "None":
 		ship_info = f"{this.currentShipName}"
 		if this.currentShipType != "Unknown" and this.currentShipType != this.currentShipName:
 			ship_info += f" ({this.currentShipType})"
 	else:
 		ship_info = f"{this.currentShipType}" if this.currentShipType != "Unknown" else "Unknown Ship"
-	debug_log(f"Market buy - Final ship info: '{ship_info}'")
+	debug_log("Market buy - Final ship info: '{}'", ship_info)
 	
 	# Create Discord embed
 	embed = {
@@ -1803,57 +2877,266 @@ def handle_market_buy(entry):
 			"url": this.webhookAvatar.strip()
 		}
 	
-	debug_log(f"Sending webhook embed for purchase")
-	send_discord_webhook(this.webhookUrl, None, embed)
+	debug_log("Sending webhook embed for purchase")
+	send_discord_webhook(webhook_url, None, embed, event='buy')
+
+def record_trade(entry):
+	"""Apply a MarketBuy/MarketSell to the trade history whether or not webhooks are enabled; returns calculate_profit()'s result for sales"""
+	context = trade_context()
+	# While the backfill runs the history is incomplete, so the ledger row waits for finish_trade_backfill()
+	deferLedger = this.backfillPending is not None
+	if deferLedger:
+		this.backfillPending.append((entry, context))
+	cargo_name = commodity_display_name(entry.get('Type'), entry.get('Type_Localised'))
+	if entry.get('event') == 'MarketBuy':
+		track_purchase(cargo_name, entry.get('Count', 0), entry.get('BuyPrice', 0), entry.get('TotalCost', 0))
+		if not deferLedger:
+			record_ledger(entry, cargo_name, entry.get('BuyPrice', 0), None, context)
+		return None
+	profit = calculate_profit(cargo_name, entry.get('Count', 0), entry.get('SellPrice', 0))
+	if not deferLedger:
+		record_ledger(entry, cargo_name, profit[0], profit[2], context)
+	return profit
+
+def trade_context():
+	"""Return (station, system, ship type, ship name) for the trade being recorded"""
+	return this.currentStation, this.currentSystem, this.currentShipType, this.currentShipName
+
+def record_ledger(entry, cargo_name, cost_basis, profit, context):
+	"""Queue a trade for ledger.db; the journal thread only builds the row, the writer thread does the I/O"""
+	if this.ledgerFailed:
+		return
+	buy = entry.get('event') == 'MarketBuy'
+	this.ledgerQueue.put((
+		entry.get('timestamp'),
+		'buy' if buy else 'sell',
+		(entry.get('Type') or '').lower(),
+		cargo_name,
+		entry.get('MarketID'),
+		*context,
+		entry.get('Count', 0),
+		entry.get('BuyPrice' if buy else 'SellPrice', 0),
+		entry.get('TotalCost' if buy else 'TotalSale', 0),
+		cost_basis,
+		profit,
+	))
+	start_ledger_writer()
+
+def start_ledger_writer():
+	"""Start the thread that owns ledger.db, if it is not already running"""
+	if this.ledgerWriter is not None and this.ledgerWriter.is_alive():
+		return
+	this.ledgerWriter = threading.Thread(target=write_ledger, args=(path.join(get_plugin_path(), "ledger.db"),), name="CargoManifestLedger", daemon=True)
+	this.ledgerWriter.start()
 
-def track_purchase(cargo_name, quantity, price_per_unit, total_cost):
-	"""Track a cargo purchase for profit calculation"""
-	if cargo_name not in this.purchaseHistory:
-		this.purchaseHistory[cargo_name] = {
+def stop_ledger_writer():
+	"""Write the queued trades and stop the writer thread"""
+	if this.ledgerWriter is None:
+		return
+	this.ledgerQueue.put(None)
+	this.ledgerWriter.join(timeout=2)
+	this.ledgerWriter = None
+
+def open_ledger(ledgerPath):
+	"""Open ledger.db in WAL mode, creating the trades table and its indexes if needed"""
+	import sqlite3
+	ledger = sqlite3.connect(ledgerPath, isolation_level=None)
+	ledger.execute("PRAGMA journal_mode=WAL")
+	ledger.execute("PRAGMA synchronous=NORMAL")
+	version = ledger.execute("PRAGMA user_version").fetchone()[0]
+	if version not in (0, LEDGER_VERSION):
+		# The ledger is history that cannot be rebuilt, so an old table is set aside rather than dropped
+		ledger.execute(f"ALTER TABLE trades RENAME TO trades_v{version}")
+		# Its indexes keep their names, which would stop the new table getting its own below
+		for index in ("trades_commodity", "trades_market", "trades_timestamp"):
+			ledger.execute(f"DROP INDEX IF EXISTS {index}")
+	ledger.execute("""CREATE TABLE IF NOT EXISTS trades (
+		id INTEGER PRIMARY KEY AUTOINCREMENT,
+		timestamp TEXT NOT NULL,
+		event TEXT NOT NULL,
+		commodity TEXT NOT NULL,
+		name TEXT,
+		market_id INTEGER,
+		station TEXT,
+		system TEXT,
+		ship TEXT,
+		ship_name TEXT,
+		count INTEGER NOT NULL,
+		price INTEGER NOT NULL,
+		total INTEGER NOT NULL,
+		cost_basis REAL,
+		profit REAL
+	)""")
+	ledger.execute("CREATE INDEX IF NOT EXISTS trades_commodity ON trades (commodity, timestamp)")
+	ledger.execute("CREATE INDEX IF NOT EXISTS trades_market ON trades (market_id, timestamp)")
+	ledger.execute("CREATE INDEX IF NOT EXISTS trades_timestamp ON trades (timestamp)")
+	ledger.execute(f"PRAGMA user_version={LEDGER_VERSION}")
+	return ledger
+
+def write_ledger(ledgerPath):
+	"""Writer thread: append queued trades to ledger.db, one transaction for everything queued at once"""
+	try:
+		ledger = open_ledger(ledgerPath)
+	except Exception as e:
+		debug_log("Trade ledger unavailable, not recording trades this session: {}", e)
+		# Stop new rows first, then let go of the ones already queued so the queue cannot grow
+		this.ledgerFailed = True
+		try:
+			while True:
+				this.ledgerQueue.get_nowait()
+		except queue.Empty:
+			pass
+		return
+	try:
+		while True:
+			row = this.ledgerQueue.get()
+			rows = []
+			# Drain everything that queued up while we were writing in one go
+			while row is not None:
+				rows.append(row)
+				try:
+					row = this.ledgerQueue.get_nowait()
+				except queue.Empty:
+					break
+			if rows:
+				try:
+					with ledger:
+						ledger.execute("BEGIN")
+						ledger.executemany("INSERT INTO trades (timestamp, event, commodity, name, market_id, station, system, ship, ship_name, count, price, total, cost_basis, profit) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+					this.ledgerWritten += len(rows)
+				except Exception as e:
+					debug_log("Error writing {} trades to the ledger: {}", len(rows), e)
+			if row is None:
+				return
+	finally:
+		ledger.close()
+
+def add_purchase(history, cargo_name, quantity, total_cost):
+	"""Add a purchase to history as a new lot, keeping the total and average cost per unit"""
+	if cargo_name not in history:
+		history[cargo_name] = {
 			'quantity': 0,
 			'total_cost': 0,
-			'avg_price': 0
+			'avg_price': 0,
+			'lots': deque()
 		}
-	
-	# Update purchase history
-	current = this.purchaseHistory[cargo_name]
+	current = history[cargo_name]
+	if quantity > 0:
+		lots = purchase_lots(current)
+		unit_cost = total_cost // quantity if total_cost % quantity == 0 else total_cost / quantity
+		if lots and lots[-1][1] == unit_cost:
+			lots[-1][0] += quantity  # Same price as the last purchase, so one lot covers both
+		else:
+			lots.append([quantity, unit_cost])
 	current['quantity'] += quantity
 	current['total_cost'] += total_cost
-	current['avg_price'] = current['total_cost'] / current['quantity']
+	if current['quantity'] > 0:
+		current['avg_price'] = current['total_cost'] / current['quantity']
+	return current
+
+def purchase_lots(purchase_data):
+	"""Return purchase_data's lots as a deque, turning a saved list or a pre-lot entry into one"""
+	lots = purchase_data.get('lots')
+	if lots is None:
+		# Saved before lots were kept: the units left are one lot at their average price
+		lots = [[purchase_data['quantity'], purchase_data['avg_price']]] if purchase_data['quantity'] > 0 else []
+	if not isinstance(lots, deque):
+		lots = purchase_data['lots'] = deque(lots)
+	return lots
+
+def remove_sale(history, cargo_name, sell_quantity, sell_price_per_unit, policy='fifo'):
+	"""Take a sale out of history; returns (buy price, profit per unit, total profit), all None without purchase history
+
+	fifo sells the oldest lots first and lifo the newest; either way each sale costs O(1) amortized,
+	as every lot is used up at most once. average costs the sale at the running average price.
+	Units sold beyond those bought are costed at the same price per unit as the rest of the sale.
+	"""
+	if cargo_name not in history:
+		return None, None, None  # No purchase history
+	
+	purchase_data = history[cargo_name]
+	lots = purchase_lots(purchase_data)
+	newestFirst = policy == 'lifo'
+	covered = cost = 0
+	# Average costing still uses the lots up oldest first so the quantities stay right if the policy changes
+	while lots and covered < sell_quantity:
+		lot = lots[-1] if newestFirst else lots[0]
+		used = min(lot[0], sell_quantity - covered)
+		covered += used
+		cost += used * lot[1]
+		if used < lot[0]:
+			lot[0] -= used
+		elif newestFirst:
+			lots.pop()
+		else:
+			lots.popleft()
+	if policy == 'average' or not covered:
+		buy_price_per_unit = purchase_data['avg_price']
+	else:
+		buy_price_per_unit = cost / covered
+	
+	# Calculate profit per unit and total profit in whole credits
+	total_profit = round((sell_price_per_unit - buy_price_per_unit) * sell_quantity)
+	profit_per_unit = total_profit / sell_quantity if sell_quantity else 0
+	
+	# Update remaining quantity
+	purchase_data['quantity'] -= sell_quantity
+	if purchase_data['quantity'] <= 0:
+		# All sold, remove from history
+		del history[cargo_name]
+	elif policy == 'average':
+		# Recalculate total cost for remaining quantity
+		purchase_data['total_cost'] = purchase_data['quantity'] * purchase_data['avg_price']
+	else:
+		purchase_data['total_cost'] -= cost
+		purchase_data['avg_price'] = purchase_data['total_cost'] / purchase_data['quantity']
+	return buy_price_per_unit, profit_per_unit, total_profit
+
+def rebase_cost_basis(history):
+	"""Recompute each commodity's total and average cost from its lots, after the cost basis policy changed"""
+	for purchase_data in history.values():
+		lots = purchase_lots(purchase_data)
+		if lots:
+			purchase_data['total_cost'] = sum(quantity * unit_cost for quantity, unit_cost in lots)
+			purchase_data['avg_price'] = purchase_data['total_cost'] / sum(quantity for quantity, _ in lots)
+
+def apply_trade_entry(history, entry, policy='fifo'):
+	"""Apply a MarketBuy/MarketSell journal entry to history without touching the UI; returns the profit it made"""
+	return cost_trade_entry(history, entry, policy)[2] or 0
+
+def cost_trade_entry(history, entry, policy='fifo'):
+	"""Apply a MarketBuy/MarketSell journal entry to history; returns (display name, cost basis per unit, profit or None)"""
+	cargo_name = commodity_display_name(entry.get('Type'), entry.get('Type_Localised'))
+	if entry.get('event') == 'MarketBuy':
+		add_purchase(history, cargo_name, entry.get('Count', 0), entry.get('TotalCost', 0))
+		return cargo_name, entry.get('BuyPrice', 0), None
+	buy_price_per_unit, _, total_profit = remove_sale(history, cargo_name, entry.get('Count', 0), entry.get('SellPrice', 0), policy)
+	return cargo_name, buy_price_per_unit, total_profit
+
+def track_purchase(cargo_name, quantity, price_per_unit, total_cost):
+	"""Track a cargo purchase for profit calculation"""
+	current = add_purchase(this.purchaseHistory, cargo_name, quantity, total_cost)
 	
-	debug_log(f"Tracked purchase: {cargo_name} x{quantity} at {price_per_unit} cr/unit (avg: {current['avg_price']:.2f} cr/unit)")
+	debug_log("Tracked purchase: {} x{} at {} cr/unit (avg: {:.2f} cr/unit)", cargo_name, quantity, price_per_unit, current['avg_price'])
 	
 	# Update display to show current trade status
-	update_display()
+	mark_dirty('Manifest')
 
 def calculate_profit(cargo_name, sell_quantity, sell_price_per_unit):
 	"""Calculate profit/loss for a cargo sale"""
-	if cargo_name not in this.purchaseHistory:
+	buy_price_per_unit, profit_per_unit, total_profit = remove_sale(this.purchaseHistory, cargo_name, sell_quantity, sell_price_per_unit, this.costBasis)
+	if buy_price_per_unit is None:
 		return None, None, None  # No purchase history
 	
-	purchase_data = this.purchaseHistory[cargo_name]
-	buy_price_per_unit = purchase_data['avg_price']
-	
-	# Calculate profit per unit and total profit
-	profit_per_unit = sell_price_per_unit - buy_price_per_unit
-	total_profit = profit_per_unit * sell_quantity
-	
 	# Add to total trade profit
 	this.totalTradeProfit += total_profit
-	
-	# Update remaining quantity
-	purchase_data['quantity'] -= sell_quantity
-	if purchase_data['quantity'] <= 0:
-		# All sold, remove from history
-		del this.purchaseHistory[cargo_name]
-		debug_log(f"Removed {cargo_name} from purchase history (all sold)")
+	if cargo_name in this.purchaseHistory:
+		debug_log("Updated {} quantity: {} remaining", cargo_name, this.purchaseHistory[cargo_name]['quantity'])
 	else:
-		# Recalculate average price for remaining quantity
-		purchase_data['total_cost'] = purchase_data['quantity'] * purchase_data['avg_price']
-		debug_log(f"Updated {cargo_name} quantity: {purchase_data['quantity']} remaining")
+		debug_log("Removed {} from purchase history (all sold)", cargo_name)
 	
 	# Update display to show updated trade status
-	update_display()
+	mark_dirty('Manifest')
 	
 	# Update Discord status when trade profit changes
 	if this.enableDiscordRPC:
@@ -1861,7 +3144,158 @@ def calculate_profit(cargo_name, sell_quantity, sell_price_per_unit):
 	
 	return buy_price_per_unit, profit_per_unit, total_profit
 
+def start_trade_backfill():
+	"""Start rebuilding the trade history from the journal folder on a background thread"""
+	from config import config
+	journalDir = config.get_str('journaldir') or config.default_journal_dir
+	# Entries from this session reach journal_entry() live, so the scan stops at the current time
+	cutoff = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+	this.backfillPending = []
+	threading.Thread(target=backfill_trade_history, args=(journalDir, cutoff), name="CargoManifestBackfill", daemon=True).start()
+
+def load_trade_backfill():
+	"""Load the trade history and per-journal byte offsets saved by the last backfill"""
+	try:
+		with open(path.join(get_plugin_path(), "trade_backfill.json"), 'r', encoding='utf-8') as f:
+			saved = json.load(f)
+		if saved.get('version') == TRADE_BACKFILL_VERSION:
+			return saved
+	except Exception:
+		pass
+	return {'version': TRADE_BACKFILL_VERSION, 'files': {}, 'purchaseHistory': {}, 'totalTradeProfit': 0}
+
+def journal_event_pattern(events):
+	"""Compile a byte pattern matching the "event":"Name" field of any of events, as the game writes it"""
+	import re
+	return re.compile(b'"event":"(?:' + b'|'.join(re.escape(event.encode()) for event in events) + b')"')
+
+def iter_matching_lines(data, offset, end, pattern):
+	"""Yield (start, line) for the lines of data between offset and end that match pattern, without splitting the rest"""
+	position = offset
+	while position < end:
+		match = pattern.search(data, position, end)
+		if not match:
+			return
+		start = data.rfind(b'\n', position, match.start()) + 1 or position
+		position = data.find(b'\n', match.end(), end) + 1
+		yield start, data[start:position]
+
+def decode_journal_lines(lines):
+	"""Yield (start, entry) for each line that parses as JSON"""
+	for start, line in lines:
+		try:
+			yield start, json.loads(line)
+		except ValueError:
+			continue
+
+def read_journal_trades(filePath, offset, cutoff):
+	"""Return (new offset, trade entries, error) for filePath after byte offset and before cutoff
+
+	Runs in worker processes, so it must only use its arguments and never the plugin's state.
+	"""
+	import mmap
+	trades = []
+	try:
+		with open(filePath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+			# Only whole lines are read; a line still being written is picked up next time
+			end = data.rfind(b'\n', offset) + 1
+			for start, entry in decode_journal_lines(iter_matching_lines(data, offset, end, journal_event_pattern(TRADE_EVENTS))):
+				if entry.get('timestamp', '') >= cutoff:
+					return start, trades, None
+				trades.append(entry)
+	except (OSError, ValueError) as e:
+		return offset, [], str(e)
+	return max(end, offset), trades, None
+
+def journal_pool_workers(fileCount, totalBytes):
+	"""Number of worker processes worth starting to scan the journals; 0 scans them in this process"""
+	import multiprocessing
+	from importlib.machinery import PathFinder
+	if getattr(sys, 'frozen', False) or fileCount < 2 or totalBytes < JOURNAL_POOL_MIN_BYTES:
+		return 0  # Frozen EDMC builds cannot start Python worker processes, and small scans finish before a pool starts
+	try:
+		# Forked workers inherit this module; spawned ones import it by name from sys.path alone. EDMC
+		# loads plugins as plugin_<folder> without the folder on sys.path, so there they cannot, and
+		# PathFinder (unlike find_spec) ignores sys.modules to tell us so before any worker starts
+		if multiprocessing.get_context().get_start_method() != 'fork':
+			spec = PathFinder.find_spec(__name__)
+			if spec is None or not spec.origin or not path.samefile(spec.origin, __file__):
+				return 0
+	except (ImportError, ValueError, OSError):
+		return 0
+	workers = min(os.cpu_count() or 1, fileCount)
+	return workers if workers > 1 else 0
+
+def scan_journal_files(jobs, cutoff, totalBytes):
+	"""Read the trades for each (filePath, offset) job, across CPU cores when it pays off; results keep job order"""
+	filePaths = [filePath for filePath, _ in jobs]
+	offsets = [offset for _, offset in jobs]
+	cutoffs = [cutoff] * len(jobs)
+	workers = journal_pool_workers(len(jobs), totalBytes)
+	if workers:
+		from concurrent.futures import ProcessPoolExecutor
+		try:
+			with ProcessPoolExecutor(max_workers=workers) as executor:
+				# map() yields in submission order, so the merge below matches a serial run exactly
+				return list(executor.map(read_journal_trades, filePaths, offsets, cutoffs, chunksize=max(1, len(jobs) // (workers * 4))))
+		except Exception as e:
+			debug_log("Journal process pool failed, scanning serially: {}", e)
+	return list(map(read_journal_trades, filePaths, offsets, cutoffs))
+
+def backfill_trade_history(journalDir, cutoff):
+	"""Bring the saved trade history up to date with the journals, reading only bytes added since the last run"""
+	started = time.perf_counter()
+	saved = load_trade_backfill()
+	history = saved['purchaseHistory']
+	totalProfit = saved['totalTradeProfit']
+	offsets = saved['files']
+	jobs = []
+	pendingBytes = 0
+	for filePath in list_journal_files(journalDir):
+		offset = offsets.get(path.basename(filePath), 0)
+		try:
+			size = path.getsize(filePath)
+		except OSError as e:
+			debug_log("Error reading journal {}: {}", filePath, e)
+			continue
+		if size != offset:
+			jobs.append((filePath, offset))
+			pendingBytes += size - offset
+	scanned = 0
+	# Cost basis depends on the order of trades, so partial results are applied file by file, oldest first
+	for (filePath, offset), (newOffset, trades, error) in zip(jobs, scan_journal_files(jobs, cutoff, pendingBytes)):
+		if error:
+			debug_log("Error reading journal {}: {}", filePath, error)
+			continue
+		for entry in trades:
+			totalProfit += apply_trade_entry(history, entry, this.costBasis)
+		offsets[path.basename(filePath)] = newOffset
+		scanned += newOffset - offset
+	saved['totalTradeProfit'] = totalProfit
+	try:
+		write_file_atomic(path.join(get_plugin_path(), "trade_backfill.json"), json.dumps(saved, default=list))  # Lots are deques
+	except Exception as e:
+		debug_log("Error saving trade backfill: {}", e)
+	debug_log("Trade backfill read {:,} new journal bytes from {} files in {:.2f}s", scanned, len(jobs), time.perf_counter() - started)
+	run_on_ui(lambda: finish_trade_backfill(history, totalProfit))
+
+def finish_trade_backfill(history, totalProfit):
+	"""Swap in the backfilled trade history and replay the trades made while it was being built"""
+	pending = this.backfillPending or []
+	this.backfillPending = None
+	this.purchaseHistory = history
+	this.totalTradeProfit = totalProfit
+	for entry, context in pending:
+		cargo_name, cost_basis, profit = cost_trade_entry(this.purchaseHistory, entry, this.costBasis)
+		this.totalTradeProfit += profit or 0
+		record_ledger(entry, cargo_name, cost_basis, profit, context)
+	debug_log("Trade backfill applied: {} commodities held, total profit {:+,.0f}", len(history), this.totalTradeProfit)
+	mark_dirty('Manifest')
+	if this.enableDiscordRPC:
+		update_discord_status()
+
 def update_captain_info_display():
+    from config import config
     if not hasattr(this, 'captainInfoLabel'):
         return  # UI not initialized yet
     lines = []
@@ -1886,25 +3320,24 @@ def update_captain_info_display():
 
 
 def update_cargo_manifest_display():
+    from config import config
     if not hasattr(this, 'cargoManifestLabel'):
         return  # UI not initialized yet
     
-    debug_log(f"Cargo manifest display - Type: {this.cargoType}, Capacity: {this.cargoCapacity}, Inventory: {len(this.inventory) if this.inventory else 0} items")
+    debug_log("Cargo manifest display - Type: {}, Capacity: {}, Inventory: {} items", this.cargoType, this.cargoCapacity, len(this.inventory) if this.inventory else 0)
     
     lines = []
     lines.append("   {type} Manifest ({curr}/{cap})".format(
         type=this.cargoType, curr=this.inventory and sum(int(i['Count']) for i in this.inventory) or 0, cap=this.cargoCapacity))
+    if this.newest == 0 and not config.get_bool("cm_hideUpdate"):
+        lines.append("   Update available!")
     
     # Total Trade Profit
     profit_text = "Total Trade Profit" if this.totalTradeProfit > 0 else "Total Trade Loss" if this.totalTradeProfit < 0 else "Total Trade Profit"
     lines.append(f"   {profit_text}: {this.totalTradeProfit:+,}")
     cargo_items = []
     for i in this.inventory:
-        line = ""
-        if i['Name'] in this.items:
-            line = "{quant} {name}".format(quant=i['Count'], name=this.items[i['Name']]['name'])
-        else:
-            line = "{quant} {name}".format(quant=i['Count'], name=(i['Name_Localised'] if 'Name_Localised' in i else i['Name']))
+        line = "{quant} {name}".format(quant=i['Count'], name=commodity_display_name(i['Name'], i.get('Name_Localised')))
         if 'Stolen' in i and i['Stolen'] > 0:
             line = line+", {} stolen".format(i['Stolen'])
         if 'MissionID' in i:
@@ -1912,7 +3345,7 @@ def update_cargo_manifest_display():
         cargo_items.append(line)
     if this.inventory == []:
         for i in this.cargoDict:
-            line = "{quant} {name}".format(name=(this.items[i]['name'] if i in this.items else i), quant=this.cargoDict[i])
+            line = "{quant} {name}".format(name=commodity_display_name(i), quant=this.cargoDict[i])
             cargo_items.append(line)
     
     lines.append("      Cargo Items:")
@@ -1930,7 +3363,7 @@ def update_budget_display():
 		return  # UI not initialized yet
 	
 	current_credits = getattr(this, 'credits', 0)  # Use 0 if credits not loaded yet
-	debug_log(f"Budget display - Credits: {current_credits:,}, Goal: {this.budgetGoal:,}, Enabled: {this.budgetEnabled}")
+	debug_log("Budget display - Credits: {:,}, Goal: {:,}, Enabled: {}", current_credits, this.budgetGoal, this.budgetEnabled)
 	
 	budget_text = ""
 	
@@ -1966,7 +3399,7 @@ def update_cargo_racks_display():
 	if not hasattr(this, 'cargoRacksLabel'):
 		return  # UI not initialized yet
 	
-	debug_log(f"Cargo racks display - Found {len(this.cargoRacks)} cargo racks")
+	debug_log("Cargo racks display - Found {} cargo racks", len(this.cargoRacks))
 	
 	racks_text = ""
 	
@@ -1994,16 +3427,16 @@ def update_cargo_racks_display():
 
 def handle_community_goal(entry):
 	"""Handle CommunityGoal journal event"""
-	debug_log(f"Processing community goal: {entry}")
-	debug_log(f"Community goal keys: {list(entry.keys())}")
+	debug_log("Processing community goal: {}", entry)
+	debug_log("Community goal keys: {}", entry.keys())
 	
 	# Check if the entry contains CurrentGoals array
 	if 'CurrentGoals' in entry and isinstance(entry['CurrentGoals'], list):
-		debug_log(f"Found CurrentGoals array with {len(entry['CurrentGoals'])} goals")
+		debug_log("Found CurrentGoals array with {} goals", len(entry['CurrentGoals']))
 		
 		for goal in entry['CurrentGoals']:
-			debug_log(f"Processing individual goal: {goal}")
-			debug_log(f"Individual goal keys: {list(goal.keys())}")
+			debug_log("Processing individual goal: {}", goal)
+			debug_log("Individual goal keys: {}", goal.keys())
 			
 			# Extract data from the individual goal object
 			goal_id = goal.get('CGID', 0)
@@ -2025,8 +3458,8 @@ def handle_community_goal(entry):
 			top_tier = goal.get('TopTier', {})
 			tier_name = top_tier.get('Name', '') if isinstance(top_tier, dict) else ''
 			
-			debug_log(f"Parsed goal data - ID: {goal_id}, Name: {goal_name}, System: {goal_system}, Station: {goal_station}")
-			debug_log(f"Player data - Contribution: {player_contribution}, Percent: {player_percent}, Tier: {tier_reached}")
+			debug_log("Parsed goal data - ID: {}, Name: {}, System: {}, Station: {}", goal_id, goal_name, goal_system, goal_station)
+			debug_log("Player data - Contribution: {}, Percent: {}, Tier: {}", player_contribution, player_percent, tier_reached)
 			
 			# Store community goal data
 			goal_data = {
@@ -2051,16 +3484,16 @@ def handle_community_goal(entry):
 				if existing_goal['id'] == goal_id:
 					this.communityGoals[i] = goal_data
 					found = True
-					debug_log(f"Updated existing community goal: {goal_name}")
+					debug_log("Updated existing community goal: {}", goal_name)
 					break
 			
 			if not found:
 				this.communityGoals.append(goal_data)
-				debug_log(f"Added new community goal: {goal_name}")
+				debug_log("Added new community goal: {}", goal_name)
 		
 		# Update display
-		update_community_goals_display()
-		debug_log(f"Community goals updated from CurrentGoals array")
+		mark_dirty('Community Goals')
+		debug_log("Community goals updated from CurrentGoals array")
 	else:
 		# Fallback to old format
 		debug_log("No CurrentGoals array found, using fallback parsing")
@@ -2082,8 +3515,8 @@ def handle_community_goal(entry):
 		tier = entry.get('Tier', entry.get('CurrentTier', 0))
 		target_tier = entry.get('TargetTier', entry.get('MaxTier', 0))
 		
-		debug_log(f"Parsed goal data - ID: {goal_id}, Name: {goal_name}, System: {goal_system}, Station: {goal_station}")
-		debug_log(f"Player data - Contribution: {player_contribution}, Rank: {player_rank}, Percent: {player_percent}")
+		debug_log("Parsed goal data - ID: {}, Name: {}, System: {}, Station: {}", goal_id, goal_name, goal_system, goal_station)
+		debug_log("Player data - Contribution: {}, Rank: {}, Percent: {}", player_contribution, player_rank, player_percent)
 		
 		# Store community goal data
 		goal_data = {
@@ -2107,16 +3540,16 @@ def handle_community_goal(entry):
 			if existing_goal['id'] == goal_id:
 				this.communityGoals[i] = goal_data
 				found = True
-				debug_log(f"Updated existing community goal: {goal_name}")
+				debug_log("Updated existing community goal: {}", goal_name)
 				break
 		
 		if not found:
 			this.communityGoals.append(goal_data)
-			debug_log(f"Added new community goal: {goal_name}")
+			debug_log("Added new community goal: {}", goal_name)
 		
 		# Update display
-		update_community_goals_display()
-		debug_log(f"Community goal updated: {goal_name}")
+		mark_dirty('Community Goals')
+		debug_log("Community goal updated: {}", goal_name)
 
 def load_community_goals_from_edmc():
 	"""Load community goals from EDMC state"""
@@ -2129,7 +3562,7 @@ def load_community_goals_from_edmc():
 		# Check if EDMC has community goals data
 		edmc_community_goals = config.get('communitygoals', [])
 		if edmc_community_goals:
-			debug_log(f"Found {len(edmc_community_goals)} community goals in EDMC state")
+			debug_log("Found {} community goals in EDMC state", len(edmc_community_goals))
 			
 			for goal in edmc_community_goals:
 				goal_data = {
@@ -2146,25 +3579,26 @@ def load_community_goals_from_edmc():
 				}
 				
 				this.communityGoals.append(goal_data)
-				debug_log(f"Added EDMC community goal: {goal_data['name']}")
+				debug_log("Added EDMC community goal: {}", goal_data['name'])
 			
 			# Update display
-			update_community_goals_display()
+			mark_dirty('Community Goals')
 		else:
 			debug_log("No community goals found in EDMC state")
 			
 	except Exception as e:
-		debug_log(f"Error loading community goals from EDMC: {e}")
+		debug_log("Error loading community goals from EDMC: {}", e)
 		# Fallback to external API if EDMC doesn't have data
 		fetch_community_goals_fallback()
 
 def fetch_community_goals_fallback():
 	"""Fallback to fetch community goals from external APIs if EDMC doesn't have data"""
+	if this.offline:
+		return
 	debug_log("Using fallback to external API for community goals")
 	
 	try:
 		import requests
-		import threading
 		
 		def fetch_inara_goals():
 			try:
@@ -2174,7 +3608,7 @@ def fetch_community_goals_fallback():
 					data = response.json()
 					if 'communityGoals' in data:
 						goals = data['communityGoals']
-						debug_log(f"Fetched {len(goals)} community goals from Inara")
+						debug_log("Fetched {} community goals from Inara", len(goals))
 						
 						# Process and store community goals
 						for goal in goals:
@@ -2201,43 +3635,43 @@ def fetch_community_goals_fallback():
 								
 								if not found:
 									this.communityGoals.append(goal_data)
-									debug_log(f"Added community goal: {goal_data['name']}")
+									debug_log("Added community goal: {}", goal_data['name'])
 						
 						# Update display
-						update_community_goals_display()
+						mark_dirty('Community Goals')
 					else:
 						debug_log("No community goals found in Inara response")
 				else:
-					debug_log(f"Inara API request failed with status {response.status_code}")
+					debug_log("Inara API request failed with status {}", response.status_code)
 			except Exception as e:
-				debug_log(f"Error fetching community goals from Inara: {e}")
+				debug_log("Error fetching community goals from Inara: {}", e)
 		
 		# Run the fetch in a background thread to avoid blocking startup
 		fetch_thread = threading.Thread(target=fetch_inara_goals, daemon=True)
 		fetch_thread.start()
 		
 	except Exception as e:
-		debug_log(f"Error setting up community goals fallback: {e}")
+		debug_log("Error setting up community goals fallback: {}", e)
 
 def check_state_for_community_goals(state):
 	"""Check for community goals in the game state"""
 	debug_log("Checking state for community goals")
-	debug_log(f"State keys: {list(state.keys())}")
+	debug_log("State keys: {}", state.keys())
 	
 	# Look for community goal related keys in state
 	community_goal_keys = [key for key in state.keys() if 'community' in key.lower() or 'goal' in key.lower()]
-	debug_log(f"Potential community goal keys: {community_goal_keys}")
+	debug_log("Potential community goal keys: {}", community_goal_keys)
 	
 	for key in community_goal_keys:
-		debug_log(f"Community goal key '{key}': {state[key]}")
+		debug_log("Community goal key '{}': {}", key, state[key])
 	
 	# Check if there are any community goals in the state
 	if 'CommunityGoals' in state:
-		debug_log(f"Found CommunityGoals in state: {state['CommunityGoals']}")
+		debug_log("Found CommunityGoals in state: {}", state['CommunityGoals'])
 		for goal in state['CommunityGoals']:
 			handle_community_goal(goal)
 	elif 'communitygoals' in state:
-		debug_log(f"Found communitygoals in state: {state['communitygoals']}")
+		debug_log("Found communitygoals in state: {}", state['communitygoals'])
 		for goal in state['communitygoals']:
 			handle_community_goal(goal)
 
@@ -2248,21 +3682,21 @@ def update_community_goals_display():
 	if not hasattr(this, 'communityGoalsLabel'):
 		return  # UI not initialized yet
 	
-	debug_log(f"Number of community goals: {len(this.communityGoals)}")
+	debug_log("Number of community goals: {}", len(this.communityGoals))
 	for i, goal in enumerate(this.communityGoals):
-		debug_log(f"Goal {i+1}: {goal}")
+		debug_log("Goal {}: {}", i+1, goal)
 	
 	goals_text = "🎯 Community Goals\n\n"
 	
-	debug_log(f"Building goals text. Number of goals: {len(this.communityGoals)}")
+	debug_log("Building goals text. Number of goals: {}", len(this.communityGoals))
 	
 	if not this.communityGoals:
 		goals_text += "No active community goals found.\n"
 		goals_text += "Check the mission board for available community goals."
 	else:
-		debug_log(f"Processing {len(this.communityGoals)} goals for display")
+		debug_log("Processing {} goals for display", len(this.communityGoals))
 		for i, goal in enumerate(this.communityGoals, 1):
-			debug_log(f"Processing goal {i}: {goal['name']}")
+			debug_log("Processing goal {}: {}", i, goal['name'])
 			try:
 				goals_text += f"🎯 {goal['name']}\n"
 				debug_log("Added goal name")
@@ -2311,28 +3745,113 @@ def update_community_goals_display():
 				goals_text += "\n"
 				debug_log("Finished processing goal")
 			except Exception as e:
-				debug_log(f"Error processing goal: {e}")
+				debug_log("Error processing goal: {}", e)
 				import traceback
-				debug_log(f"Traceback: {traceback.format_exc()}")
+				debug_log("Traceback: {}", traceback.format_exc())
 	
 	# Update the label
-	debug_log(f"About to update label with text length: {len(goals_text)}")
+	debug_log("About to update label with text length: {}", len(goals_text))
 	this.communityGoalsLabel.config(text=goals_text)
-	debug_log(f"Community goals display updated with text: {goals_text[:200]}...")
+	debug_log("Community goals display updated with text: {}...", goals_text[:200])
+
+def format_seconds(seconds):
+	"""Format a duration compactly for the Diagnostics table"""
+	if seconds < 1e-3:
+		return f"{seconds * 1e6:.0f}us"
+	if seconds < 1:
+		return f"{seconds * 1e3:.1f}ms"
+	return f"{seconds:.2f}s"
+
+def update_diagnostics_display():
+	# Update the diagnostics display
+	if not hasattr(this, 'diagnosticsLabel'):
+		return  # UI not initialized yet
+	
+	# Events per second over the last minute, from the trace buffer so nothing extra is recorded per event
+	now = time.time()
+	recent = [record[0] for record in this.traceBuffer if record[1] == 'journal' and record[0] >= now - 60]
+	window = 60
+	if len(this.traceBuffer) == this.traceBuffer.maxlen and this.traceBuffer[0][0] > now - 60:
+		window = max(now - this.traceBuffer[0][0], 1)  # Buffer holds less than a minute of events
+	totalEvents = sum(calls for calls, _ in this.journalStats.values())
+	
+	lines = ["📊 Diagnostics", ""]
+	lines.append(f"Events: {totalEvents:,} total, {len(recent) / window:.1f}/s (last minute)")
+	lines.append(f"Queues: UI {this.uiQueue.qsize()}, log {this.logQueue.qsize()}, webhooks {this.webhookQueued}, stale sections {len(this.dirtySections)}")
+	lines.append(f"Trade ledger: {'unavailable' if this.ledgerFailed else f'{this.ledgerWritten:,} trades written, {this.ledgerQueue.qsize()} waiting'}")
+	stats = this.webhookStats
+	lines.append(f"Webhooks: {stats['sent']:,} sent, {stats['failed']:,} failed, {stats['dropped']:,} dropped, {stats['expired']:,} expired, {stats['rateLimited']:,} rate limited, {stats['paced']:,} paced, {stats['batched']:,} batched, {stats['retried']:,} retried")
+	lines.append(f"Status updates: {stats['statusUnchanged']:,} unchanged skipped, {stats['statusCoalesced']:,} held back and coalesced, {stats['statusSuperseded']:,} superseded while queued, {stats['statusEdited']:,} edited in place")
+	for sink in this.sinks:
+		sinkStats = this.sinkStats.get(sink['url'], {'sent': 0, 'failed': 0})
+		lines.append(f"Sink {sink_label(sink)}: {sinkStats['sent']:,} sent, {sinkStats['failed']:,} failed")
+	for host, (requestCount, connectionCount) in http_session_stats().items():
+		reused = requestCount - connectionCount
+		lines.append(f"HTTP {host}: {requestCount:,} requests, {connectionCount:,} connections, {reused / requestCount if requestCount else 0:.0%} reused")
+	
+	titles = {'journal': "Journal events", 'render': "Renderers", 'webhook': "Webhooks"}
+	histograms = list(this.latency.items())  # Other threads add histograms while this runs
+	for kind, title in titles.items():
+		rows = sorted((name, histogram) for (histogramKind, name), histogram in histograms if histogramKind == kind)
+		if not rows:
+			continue
+		lines.append("")
+		lines.append(f"{title:<26}{'n':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}")
+		for name, histogram in rows:
+			p50, p95, p99 = latency_percentiles(histogram)
+			lines.append(f"{name[:26]:<26}{histogram[1]:>7,}{format_seconds(p50):>8}{format_seconds(p95):>8}{format_seconds(p99):>8}{format_seconds(histogram[2]):>8}")
+	
+	this.diagnosticsLabel.config(text="\n".join(lines))
 	
-	# Force update the display
-	this.communityGoalsLabel.update()
+	# Keep the numbers live while the section is shown; hidden sections are not redrawn
+	if this.diagnosticsTimer is None:
+		def refresh():
+			this.diagnosticsTimer = None
+			mark_dirty("Diagnostics")
+		this.diagnosticsTimer = this.frame.after(DIAGNOSTICS_REFRESH_MS, refresh)
 
 def update_display():
-	# Update both sections so switching is always instant
-	update_captain_info_display()
-	update_cargo_manifest_display()
-	update_budget_display()
-	update_cargo_racks_display()
-	update_community_goals_display()
-	# No need to set manifest or title here
-	# Frame switching is handled by the combobox
-	pass
+	# Mark every section stale; the visible one is redrawn on the next idle cycle, the rest when selected
+	mark_dirty()
+
+# Dropdown section name -> function that redraws it
+SECTION_RENDERERS = {
+	"Manifest": update_cargo_manifest_display,
+	"Captain Information": update_captain_info_display,
+	"Budget": update_budget_display,
+	"Cargo Racks": update_cargo_racks_display,
+	"Community Goals": update_community_goals_display,
+	"Diagnostics": update_diagnostics_display
+}
+
+def mark_dirty(*sections):
+	"""Flag sections (all if none given) as stale; only the visible one is redrawn, once per Tk idle cycle"""
+	if not hasattr(this, 'frame'):
+		this.dirtySections.update(sections or SECTION_RENDERERS)
+		return  # UI not initialized yet
+	if threading.current_thread() is not threading.main_thread():
+		# Only the Tk thread touches the dirty set and the scheduler
+		run_on_ui(lambda: mark_dirty(*sections))
+		return
+	this.dirtySections.update(sections or SECTION_RENDERERS)
+	# Hidden sections just stay stale until show_section() draws them
+	if this.visibleSection in this.dirtySections and not this.renderScheduled:
+		this.renderScheduled = True
+		this.frame.after_idle(flush_render)
+
+def flush_render():
+	"""Redraw the visible section if it was marked stale since the last flush"""
+	this.renderScheduled = False
+	render_section(this.visibleSection)
+
+def render_section(section):
+	"""Redraw section now if it is stale"""
+	if section in this.dirtySections:
+		this.dirtySections.discard(section)
+		renderer = SECTION_RENDERERS[section]
+		started = time.perf_counter()
+		renderer()
+		record_latency('render', renderer.__name__, time.perf_counter() - started)
 
 def init_discord_rpc():
 	"""Initialize Discord Status Updates"""
@@ -2349,13 +3868,14 @@ def discord_status_update_loop():
 
 def update_discord_status():
 	"""Update Discord status with current game state via webhook"""
+	from datetime import datetime
 	# Use status webhook if available, otherwise fall back to main webhook
 	webhook_url = this.discordStatusWebhook if this.discordStatusWebhook else this.webhookUrl
-	if not this.enableDiscordRPC or not webhook_url:
+	if not this.enableDiscordRPC or not (webhook_url or this.sinks):
 		return
 	
 	# Debug logging for status update
-	debug_log(f"Status update - Commander: {this.commanderName}, System: {this.currentSystem}, Station: {this.currentStation}")
+	debug_log("Status update - Commander: {}, System: {}, Station: {}", this.commanderName, this.currentSystem, this.currentStation)
 	
 	try:
 		# Determine current activity based on station presence and cargo
@@ -2387,17 +3907,17 @@ def update_discord_status():
 		captain_info = f"Commander {this.commanderName}" if this.commanderName != "Unknown" else "Unknown Commander"
 		
 		# Add ship info if available
-		debug_log(f"Activity tracker - Ship name: '{this.currentShipName}', Ship type: '{this.currentShipType}'")
+		debug_log("Activity tracker - Ship name: '{}', Ship type: '{}'", this.currentShipName, this.currentShipType)
 		if this.currentShipName and this.currentShipName != "Unknown" and this.currentShipName != "None":
 			ship_info = f"Ship: {this.currentShipName}"
 			if this.currentShipType != "Unknown" and this.currentShipType != this.currentShipName:
 				ship_info += f" ({this.currentShipType})"
 			state += f" | {ship_info}"
-			debug_log(f"Activity tracker - Added ship info: {ship_info}")
+			debug_log("Activity tracker - Added ship info: {}", ship_info)
 		elif this.currentShipType != "Unknown":
 			ship_info = f"Ship: {this.currentShipType}"
 			state += f" | {ship_info}"
-			debug_log(f"Activity tracker - Added ship type only: {ship_info}")
+			debug_log("Activity tracker - Added ship type only: {}", ship_info)
 		else:
 			debug_log("Activity tracker - No ship information available")
 		
@@ -2436,17 +3956,61 @@ def update_discord_status():
 			"timestamp": datetime.utcnow().isoformat()
 		}
 		
-		# Send status update via webhook
-		send_discord_webhook(webhook_url, None, embed)
-		
-		# Update last status update timestamp for debugging
-		this.lastStatusUpdate = time.time()
-		debug_log(f"Status update sent successfully")
+		# Send status update via webhook, unless Discord already shows exactly this
+		submit_status(webhook_url, embed, hash((webhook_url, embed["title"], embed["description"])))
 		
 	except Exception as e:
-		debug_log(f"Error updating Discord status: {e}")
+		debug_log("Error updating Discord status: {}", e)
+
+def submit_status(webhook_url, embed, fingerprint):
+	"""Send a status embed unless it matches the last one sent; within the minimum interval only the latest is kept"""
+	from datetime import datetime
+	with this.statusLock:
+		if fingerprint == this.lastStatusFingerprint:
+			this.pendingStatus = None  # Back to what Discord already shows
+			this.webhookStats['statusUnchanged'] += 1
+			return
+		remaining = this.lastStatusUpdate + this.statusMinInterval - time.time()
+		if remaining > 0:
+			this.pendingStatus = (webhook_url, embed, fingerprint)
+			this.webhookStats['statusCoalesced'] += 1
+			if this.statusTimer is None:
+				this.statusTimer = threading.Timer(remaining, flush_pending_status)
+				this.statusTimer.daemon = True
+				this.statusTimer.start()
+			return
+		sentAt = this.lastStatusUpdate = time.time()
+	embed["timestamp"] = datetime.utcnow().isoformat()
+	if not send_discord_webhook(webhook_url, None, embed, kind='status'):
+		return  # Dropped by a full queue, so Discord still shows the old status
+	with this.statusLock:
+		if this.lastStatusUpdate == sentAt:  # Not overtaken by a newer status meanwhile
+			this.lastStatusFingerprint = fingerprint
+	debug_log("Status update queued")
+
+def forget_status_fingerprint():
+	"""A queued status was dropped or expired unsent, so the next status must go out even if it looks the same"""
+	with this.statusLock:
+		this.lastStatusFingerprint = None
+
+def flush_pending_status():
+	"""Timer thread: send the latest status held back by the minimum interval"""
+	with this.statusLock:
+		this.statusTimer = None
+		pending = this.pendingStatus
+		this.pendingStatus = None
+	if pending is not None:
+		submit_status(*pending)
 
 def cleanup_discord_rpc():
 	"""Clean up Discord status updates on plugin shutdown"""
+	with this.statusLock:
+		if this.statusTimer is not None:
+			this.statusTimer.cancel()
+			this.statusTimer = None
+		this.pendingStatus = None
 	debug_log("Discord Status Updates cleaned up")
-	# No thread to clean up since we're using event-driven updates
\ No newline at end of file
+	# No thread to clean up since we're using event-driven updates
+
+# Keep this at the very end of the file so it covers the whole module body
+this.startupTimings['import'] = time.perf_counter() - _importStarted
@@ -0,0 +1,184 @@
+"""Local stand-in for Discord's webhook API, for load testing webhook delivery without Discord.
+
+Accepts what the plugin sends: POST /api/webhooks/<id>/<token> (with ?wait=true returning the
+created message) and PATCH /api/webhooks/<id>/<token>/messages/<message id>. Each webhook gets a
+rate limit bucket that answers with Discord's X-RateLimit-* headers and 429s once it is used up, and
+responses can be slowed down or failed on purpose.
+
+    python tools/discord_stub.py --port 8765 --limit 5 --window 2 --latency 50 --fail-rate 0.01
+
+then point the plugin's webhook URL at http://127.0.0.1:8765/api/webhooks/1/token.
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WEBHOOK_PATH = re.compile(r'^/api/webhooks/(\d+)/([^/?]+)(?:/messages/(\d+))?$')
+
+
+class DiscordStub(ThreadingHTTPServer):
+	"""HTTP server holding the stub's settings, rate limit buckets, stored messages and counters"""
+	daemon_threads = True
+
+	def __init__(self, address, limit=5, window=2.0, latency=0.0, jitter=0.0, fail_rate=0.0, seed=None):
+		super().__init__(address, StubHandler)
+		self.limit = limit
+		self.window = window
+		self.latency = latency
+		self.jitter = jitter
+		self.failRate = fail_rate
+		self.random = random.Random(seed)
+		self.lock = threading.Lock()
+		self.buckets = {}  # Webhook id -> [requests remaining, time.monotonic() the bucket resets]
+		self.messages = {}  # Message id -> stored payload
+		self.nextId = 1000
+		self.received = []  # (time.time() received, method, payload) for every accepted request
+		self.stats = {'requests': 0, 'posted': 0, 'edited': 0, 'rateLimited': 0, 'failed': 0, 'notFound': 0}
+
+	@property
+	def url(self):
+		return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+	def take(self, webhookId):
+		"""Count a request against the webhook's bucket; returns (allowed, remaining, seconds until reset)"""
+		now = time.monotonic()
+		with self.lock:
+			bucket = self.buckets.get(webhookId)
+			if bucket is None or bucket[1] <= now:
+				bucket = self.buckets[webhookId] = [self.limit, now + self.window]
+			if bucket[0] <= 0:
+				self.stats['rateLimited'] += 1
+				return False, 0, bucket[1] - now
+			bucket[0] -= 1
+			return True, bucket[0], bucket[1] - now
+
+
+class StubHandler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'  # Keep-alive, as Discord does
+
+	def do_POST(self):
+		self.handle_webhook('POST')
+
+	def do_PATCH(self):
+		self.handle_webhook('PATCH')
+
+	def do_GET(self):
+		if self.path == '/stats':
+			with self.server.lock:
+				self.reply(200, dict(self.server.stats))
+		else:
+			self.reply(404, {'message': '404: Not Found', 'code': 0})
+
+	def handle_webhook(self, method):
+		server = self.server
+		body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+		route, _, query = self.path.partition('?')
+		match = WEBHOOK_PATH.match(route)
+		with server.lock:
+			server.stats['requests'] += 1
+		if match is None or (method == 'PATCH') != (match.group(3) is not None):
+			self.reply(405 if match else 404, {'message': 'Unknown Webhook', 'code': 10015})
+			return
+		if server.latency or server.jitter:
+			time.sleep(max(server.latency + server.random.uniform(-server.jitter, server.jitter), 0) / 1000)
+
+		allowed, remaining, resetAfter = server.take(match.group(1))
+		headers = {
+			'X-RateLimit-Limit': str(server.limit),
+			'X-RateLimit-Remaining': str(remaining),
+			'X-RateLimit-Reset': f"{time.time() + resetAfter:.3f}",
+			'X-RateLimit-Reset-After': f"{resetAfter:.3f}",
+			'X-RateLimit-Bucket': f"stub-{match.group(1)}",
+		}
+		if not allowed:
+			headers['Retry-After'] = f"{resetAfter:.3f}"
+			headers['X-RateLimit-Scope'] = 'user'
+			self.reply(429, {'message': 'You are being rate limited.', 'retry_after': round(resetAfter, 3), 'global': False}, headers)
+			return
+		if server.failRate and server.random.random() < server.failRate:
+			with server.lock:
+				server.stats['failed'] += 1
+			self.reply(502, {'message': '502: Bad Gateway', 'code': 0}, headers)
+			return
+		try:
+			payload = json.loads(body)
+		except ValueError:
+			self.reply(400, {'message': 'Cannot send an empty message', 'code': 50006}, headers)
+			return
+
+		with server.lock:
+			if method == 'PATCH':
+				messageId = match.group(3)
+				if messageId not in server.messages:
+					server.stats['notFound'] += 1
+					self.reply(404, {'message': 'Unknown Message', 'code': 10008}, headers)
+					return
+				server.messages[messageId].update(payload)
+				server.stats['edited'] += 1
+			else:
+				messageId = str(server.nextId)
+				server.nextId += 1
+				server.messages[messageId] = payload
+				server.stats['posted'] += 1
+			server.received.append((time.time(), method, payload))
+			message = dict(server.messages[messageId], id=messageId, webhook_id=match.group(1))
+		if method == 'POST' and 'wait=true' not in query.split('&'):
+			self.reply(204, None, headers)
+		else:
+			self.reply(200, message, headers)
+
+	def reply(self, status, body, headers=None):
+		data = json.dumps(body).encode('utf-8') if body is not None else b''
+		self.send_response(status)
+		for name, value in (headers or {}).items():
+			self.send_header(name, value)
+		if body is not None:
+			self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(data)))
+		self.end_headers()
+		self.wfile.write(data)
+
+	def log_message(self, format, *args):
+		pass
+
+
+def start_stub(host='127.0.0.1', port=0, **options):
+	"""Start a stub server on a background thread and return it; port 0 picks a free port"""
+	server = DiscordStub((host, port), **options)
+	threading.Thread(target=server.serve_forever, name="DiscordStub", daemon=True).start()
+	return server
+
+
+def add_stub_arguments(parser):
+	"""Add the stub's behaviour options to an argument parser"""
+	parser.add_argument('--limit', type=int, default=5, help="requests each webhook may make per window before 429s (Discord: 5)")
+	parser.add_argument('--window', type=float, default=2.0, help="rate limit window in seconds (Discord: 2)")
+	parser.add_argument('--latency', type=float, default=0.0, help="milliseconds added to every response")
+	parser.add_argument('--jitter', type=float, default=0.0, help="random +/- milliseconds on top of --latency")
+	parser.add_argument('--fail-rate', type=float, default=0.0, help="fraction of accepted requests answered with 502")
+	parser.add_argument('--seed', type=int, default=None, help="random seed for jitter and failures")
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--host', default='127.0.0.1')
+	parser.add_argument('--port', type=int, default=8765)
+	add_stub_arguments(parser)
+	args = parser.parse_args()
+	server = DiscordStub((args.host, args.port), limit=args.limit, window=args.window, latency=args.latency, jitter=args.jitter, fail_rate=args.fail_rate, seed=args.seed)
+	print(f"Discord stub listening on {server.url}/api/webhooks/<id>/<token> (stats at {server.url}/stats)")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	print(json.dumps(server.stats))
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
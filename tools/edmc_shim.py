@@ -0,0 +1,90 @@
+"""Stand-ins for the EDMC modules load.py imports, for running the plugin outside EDMC.
+
+The offline tools in this folder use these so the plugin can be imported, started and fed
+journal events from a plain Python interpreter. Real EDMC modules always win: install() only
+fills in the ones that cannot be imported.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import types
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Config:
+	"""In-memory replacement for EDMC's config object"""
+
+	def __init__(self, plugin_dir, journal_dir='', settings=None):
+		self.plugin_dir = plugin_dir
+		self.default_journal_dir = journal_dir
+		self.settings = dict(settings or {})
+
+	def get(self, key, default=None):
+		return self.settings.get(key, default)
+
+	def get_str(self, key, default=None):
+		return self.settings.get(key, default)
+
+	def get_bool(self, key, default=False):
+		return bool(self.settings.get(key, default))
+
+	def get_int(self, key, default=0):
+		return int(self.settings.get(key, default))
+
+	def set(self, key, value):
+		self.settings[key] = value
+
+
+def make_plugin_dir():
+	"""Copy the plugin's data files into a scratch EDMC plugins folder so tools never write into the checkout"""
+	pluginsDir = tempfile.mkdtemp(prefix="cargo-manifest-")
+	pluginPath = os.path.join(pluginsDir, os.path.basename(PLUGIN_ROOT))
+	os.makedirs(pluginPath)
+	shutil.copy(os.path.join(PLUGIN_ROOT, "items.json"), pluginPath)
+	return pluginsDir
+
+
+def install(plugin_dir=None, journal_dir='', settings=None):
+	"""Register stand-in config, myNotebook and ttkHyperlinkLabel modules and return the config"""
+	if PLUGIN_ROOT not in sys.path:
+		sys.path.insert(0, PLUGIN_ROOT)
+	try:
+		from config import config
+		return config  # Running inside EDMC
+	except ImportError:
+		pass
+
+	config = Config(plugin_dir or make_plugin_dir(), journal_dir, settings)
+	configModule = types.ModuleType('config')
+	configModule.config = config
+	sys.modules['config'] = configModule
+
+	# tkinter is only imported when the plugin builds its UI, as it would be under EDMC
+	def notebook_attr(name):
+		import tkinter as tk
+		if name in ('Frame', 'Label'):
+			return getattr(tk, name)
+		raise AttributeError(name)
+
+	def hyperlink_attr(name):
+		import tkinter as tk
+		if name != 'HyperlinkLabel':
+			raise AttributeError(name)
+
+		class HyperlinkLabel(tk.Label):
+			def __init__(self, master=None, url=None, **kw):
+				super().__init__(master, **kw)
+				self.url = url
+
+		hyperlinkModule.HyperlinkLabel = HyperlinkLabel
+		return HyperlinkLabel
+
+	notebookModule = types.ModuleType('myNotebook')
+	notebookModule.__getattr__ = notebook_attr
+	sys.modules.setdefault('myNotebook', notebookModule)
+	hyperlinkModule = types.ModuleType('ttkHyperlinkLabel')
+	hyperlinkModule.__getattr__ = hyperlink_attr
+	sys.modules.setdefault('ttkHyperlinkLabel', hyperlinkModule)
+	return config
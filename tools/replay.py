@@ -0,0 +1,239 @@
+"""Replay Elite Dangerous journal files through the plugin without the game or EDMC.
+
+Each journal line is passed to load.journal_entry() together with a `state` dict built the way
+EDMC's monitor builds it (Cargo, Modules, Credits, Rank, ship and location), so recorded sessions
+can be reproduced, timed and profiled offline.
+
+    python tools/replay.py "%USERPROFILE%/Saved Games/Frontier Developments/Elite Dangerous"
+    python tools/replay.py --speed 60 Journal.2024-05-01T180000.01.log
+    python tools/replay.py --speed 0 --profile replay.prof <journal folder>
+
+--speed 1 replays in real time, N replays N times faster and 0 (the default) as fast as possible.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import edmc_shim
+
+
+class JournalState:
+	"""Build the EDMC `state` dict the plugin receives alongside each journal entry"""
+
+	def __init__(self):
+		self.cmdr = None
+		self.is_beta = False
+		self.state = {
+			'Captain': None,
+			'Cargo': {},
+			'CargoJSON': None,
+			'Credits': 0,
+			'Modules': {},
+			'Rank': {},
+			'ShipID': None,
+			'ShipIdent': None,
+			'ShipName': None,
+			'ShipType': None,
+			'StarSystem': None,
+			'StationName': None,
+		}
+
+	def update(self, entry):
+		"""Apply entry to the state, as EDMC does before notifying plugins"""
+		state = self.state
+		event = entry['event']
+		if event == 'Fileheader':
+			self.is_beta = 'beta' in entry.get('gameversion', '').lower()
+		elif event in ('LoadGame', 'Commander'):
+			self.cmdr = entry.get('Commander', entry.get('Name', self.cmdr))
+			if event == 'LoadGame':
+				state['Credits'] = entry.get('Credits', state['Credits'])
+				state['ShipType'] = entry.get('Ship', state['ShipType'])
+				state['ShipName'] = entry.get('ShipName', state['ShipName'])
+				state['ShipIdent'] = entry.get('ShipIdent', state['ShipIdent'])
+				state['ShipID'] = entry.get('ShipID', state['ShipID'])
+				state['Cargo'] = {}
+		elif event == 'Rank':
+			for rank, value in entry.items():
+				if rank not in ('timestamp', 'event'):
+					state['Rank'][rank] = (value, state['Rank'].get(rank, (0, 0))[1])
+		elif event == 'Progress':
+			for rank, progress in entry.items():
+				if rank not in ('timestamp', 'event'):
+					state['Rank'][rank] = (state['Rank'].get(rank, (0, 0))[0], progress)
+		elif event == 'Loadout':
+			state['ShipType'] = entry.get('Ship', state['ShipType'])
+			state['ShipName'] = entry.get('ShipName', state['ShipName'])
+			state['ShipIdent'] = entry.get('ShipIdent', state['ShipIdent'])
+			state['ShipID'] = entry.get('ShipID', state['ShipID'])
+			state['CargoCapacity'] = entry.get('CargoCapacity', 0)
+			state['Modules'] = {module['Slot']: module for module in entry.get('Modules', [])}
+		elif event == 'Cargo' and entry.get('Vessel', 'Ship') == 'Ship':
+			if 'Inventory' in entry:
+				state['Cargo'] = {}
+				for item in entry['Inventory']:
+					self.add_cargo(item['Name'], item['Count'])
+			else:
+				# Since 3.3 the inventory lives in Cargo.json; give the plugin what EDMC would
+				entry['Inventory'] = [{'Name': name, 'Count': count} for name, count in state['Cargo'].items()]
+			state['CargoJSON'] = entry
+		elif event == 'MarketBuy':
+			self.add_cargo(entry['Type'], entry['Count'])
+			state['Credits'] -= entry.get('TotalCost', 0)
+		elif event == 'MarketSell':
+			self.add_cargo(entry['Type'], -entry['Count'])
+			state['Credits'] += entry.get('TotalSale', 0)
+		elif event in ('CollectCargo', 'MiningRefined'):
+			self.add_cargo(entry['Type'], 1)
+		elif event == 'EjectCargo':
+			self.add_cargo(entry['Type'], -entry.get('Count', 1))
+		elif event in ('Location', 'FSDJump', 'CarrierJump'):
+			state['StarSystem'] = entry.get('StarSystem', state['StarSystem'])
+			state['StationName'] = entry.get('StationName') if entry.get('Docked') else None
+		elif event == 'Docked':
+			state['StarSystem'] = entry.get('StarSystem', state['StarSystem'])
+			state['StationName'] = entry.get('StationName')
+		elif event in ('Undocked', 'Liftoff'):
+			state['StationName'] = None
+
+	def add_cargo(self, name, count):
+		symbol = name.lower()
+		if symbol.startswith('$') and symbol.endswith('_name;'):
+			symbol = symbol[1:-6]
+		total = self.state['Cargo'].get(symbol, 0) + count
+		if total > 0:
+			self.state['Cargo'][symbol] = total
+		else:
+			self.state['Cargo'].pop(symbol, None)
+
+
+def iter_journal_entries(paths, events=None, jobs=1):
+	"""Yield parsed entries from journal files or folders, oldest file first, optionally only those for events"""
+	import load
+	files = []
+	for journalPath in paths:
+		if os.path.isdir(journalPath):
+			files.extend(load.list_journal_files(journalPath))
+		else:
+			files.append(journalPath)
+	if jobs > 1 and len(files) > 1:
+		from concurrent.futures import ProcessPoolExecutor
+		# Files are parsed in parallel but map() returns them in order, so dispatch order is unchanged
+		with ProcessPoolExecutor(max_workers=jobs) as executor:
+			for entries in executor.map(read_journal_file, files, [events] * len(files)):
+				yield from entries
+		return
+	for filePath in files:
+		yield from iter_file_entries(filePath, events)
+
+
+def read_journal_file(filePath, events):
+	return list(iter_file_entries(filePath, events))
+
+
+def iter_file_entries(filePath, events=None):
+	"""Yield the entries of one journal; with events, only lines for those events are decoded"""
+	import load
+	import mmap
+	if events:
+		if os.path.getsize(filePath) == 0:
+			return
+		with open(filePath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+			end = data.rfind(b'\n') + 1
+			for _, entry in load.decode_journal_lines(load.iter_matching_lines(data, 0, end, load.journal_event_pattern(events))):
+				yield entry
+		return
+	with open(filePath, 'r', encoding='utf-8') as f:
+		for line in f:
+			line = line.strip()
+			if not line:
+				continue
+			try:
+				yield json.loads(line)
+			except ValueError:
+				continue  # Partially written line at the end of a live journal
+
+
+def parse_timestamp(entry):
+	try:
+		return datetime.strptime(entry['timestamp'], '%Y-%m-%dT%H:%M:%SZ').timestamp()
+	except (KeyError, ValueError):
+		return None
+
+
+def replay(paths, speed=0.0, max_gap=None, root=None, events=None, jobs=1):
+	"""Feed every journal entry under paths to the plugin; returns (entries replayed, seconds taken)"""
+	import load
+	journal = JournalState()
+	count = 0
+	started = time.perf_counter()
+	previous = None
+	for entry in iter_journal_entries(paths, events, jobs):
+		if speed > 0:
+			timestamp = parse_timestamp(entry)
+			if timestamp is not None and previous is not None and timestamp > previous:
+				delay = (timestamp - previous) / speed
+				time.sleep(min(delay, max_gap) if max_gap is not None else delay)
+			previous = timestamp if timestamp is not None else previous
+		journal.update(entry)
+		state = journal.state
+		load.journal_entry(journal.cmdr, journal.is_beta, state['StarSystem'], state['StationName'], entry, state)
+		if root is not None:
+			root.update()  # Let queued redraws run, as EDMC's main loop would
+		count += 1
+	return count, time.perf_counter() - started
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('paths', nargs='+', help="journal files or folders containing Journal.*.log files")
+	parser.add_argument('--speed', type=float, default=0.0, help="1 = real time, N = N times faster, 0 = as fast as possible")
+	parser.add_argument('--max-gap', type=float, default=None, help="cap any single wait between events at this many seconds")
+	parser.add_argument('--ui', action='store_true', help="build the plugin's Tk frame so redraws are included (needs a display)")
+	parser.add_argument('--profile', metavar='FILE', help="write cProfile stats for the replay to FILE")
+	parser.add_argument('--only', metavar='EVENTS', help="comma separated events to replay, e.g. MarketBuy,MarketSell; other lines are skipped unparsed, so state built from them is missing")
+	parser.add_argument('--jobs', type=int, default=1, help="parse journal files in this many worker processes; entries are still dispatched in order")
+	parser.add_argument('--online', action='store_true', help="allow catalog, community goal, webhook and HTTP sink traffic; file sinks are written either way")
+	parser.add_argument('--setting', action='append', default=[], metavar='KEY=VALUE', help="EDMC config value for the plugin, e.g. cm_enableDebugLogging=1")
+	args = parser.parse_args()
+	events = tuple(args.only.split(',')) if args.only else None
+
+	settings = {}
+	for setting in args.setting:
+		key, _, value = setting.partition('=')
+		settings[key] = value
+	config = edmc_shim.install(settings=settings)
+	import load
+	load.offline = not args.online
+	load.plugin_start3(config.plugin_dir)
+
+	root = None
+	if args.ui:
+		import tkinter as tk
+		root = tk.Tk()
+		load.plugin_app(root).pack()
+
+	if args.profile:
+		import cProfile
+		import pstats
+		profiler = cProfile.Profile()
+		count, elapsed = profiler.runcall(replay, args.paths, args.speed, args.max_gap, root, events, args.jobs)
+		profiler.dump_stats(args.profile)
+		pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+	else:
+		count, elapsed = replay(args.paths, args.speed, args.max_gap, root, events, args.jobs)
+	load.plugin_stop()
+
+	print(f"Replayed {count:,} journal entries in {elapsed:.3f} s ({count / elapsed if elapsed else 0:,.0f} events/s)")
+	print(f"{'event':24} {'calls':>8} {'total ms':>10} {'mean us':>10}")
+	for event, (calls, seconds) in sorted(load.journalStats.items(), key=lambda item: -item[1][1]):
+		print(f"{event:24} {calls:8,} {seconds * 1000:10.2f} {seconds / calls * 1e6:10.1f}")
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
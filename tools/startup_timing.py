@@ -0,0 +1,77 @@
+"""Measure how much the plugin adds to EDMC's launch time.
+
+Each run imports load.py and calls plugin_start3() in a fresh interpreter, so module caches from
+earlier runs do not hide import cost. "import" is the wall time of the import statement, which
+includes compiling load.py when no bytecode cache can be written; "import_module_body" is the
+time spent executing the module itself. Exits non-zero when the median of either measurement goes
+over its budget, so it can gate changes that slow EDMC down.
+
+    python tools/startup_timing.py --runs 10 --import-budget 50 --start-budget 100
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+def child():
+	"""Run inside the fresh interpreter: start the plugin once and print its timings as JSON"""
+	sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+	import edmc_shim
+	import time
+	config = edmc_shim.install()
+
+	alreadyLoaded = set(sys.modules)
+	started = time.perf_counter()
+	import load
+	importWall = time.perf_counter() - started
+	heavyModules = sorted(name for name in ('requests', 'tkinter', 'tkinter.ttk', 'datetime', 'csv', 'hashlib') if name in sys.modules and name not in alreadyLoaded)
+
+	started = time.perf_counter()
+	load.plugin_start3(config.plugin_dir)
+	startWall = time.perf_counter() - started
+
+	print(json.dumps({
+		'import': importWall,
+		'import_module_body': load.startupTimings['import'],
+		'plugin_start3': startWall,
+		'modules_loaded': heavyModules,
+	}))
+	sys.stdout.flush()
+	os._exit(0)  # Do not wait for the background catalog refresh
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--runs', type=int, default=5, help="number of fresh interpreters to time")
+	parser.add_argument('--import-budget', type=float, default=50.0, help="median import budget in ms")
+	parser.add_argument('--start-budget', type=float, default=100.0, help="median plugin_start3 budget in ms")
+	parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.child:
+		child()
+		return 0
+
+	results = []
+	for _ in range(args.runs):
+		output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'], capture_output=True, text=True, check=True).stdout
+		results.append(json.loads(output.strip().splitlines()[-1]))
+
+	failed = False
+	for key, budget in (('import', args.import_budget), ('import_module_body', None), ('plugin_start3', args.start_budget)):
+		samples = [r[key] * 1000 for r in results]
+		median = statistics.median(samples)
+		line = f"{key:18} median {median:8.2f} ms  min {min(samples):8.2f} ms  max {max(samples):8.2f} ms"
+		if budget is not None:
+			failed = failed or median > budget
+			line += f"  budget {budget:.0f} ms  {'ok' if median <= budget else 'OVER BUDGET'}"
+		print(line)
+	print(f"modules imported by load.py at startup: {', '.join(results[-1]['modules_loaded']) or 'none'}")
+	return 1 if failed else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
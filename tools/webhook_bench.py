@@ -0,0 +1,123 @@
+"""Load test webhook delivery against the local Discord stub.
+
+Feeds a burst of MarketSell events through load.journal_entry() with the trade webhook pointed at
+tools/discord_stub.py, waits for the queue to drain, and reports how long journal handling took,
+delivery throughput, end-to-end latency percentiles and how many sales never reached the stub.
+
+    python tools/webhook_bench.py --events 2000
+    python tools/webhook_bench.py --events 5000 --rate 200 --latency 80 --jitter 40 --fail-rate 0.02
+    python tools/webhook_bench.py --url http://127.0.0.1:8765/api/webhooks/1/token  (already running stub)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import discord_stub
+import edmc_shim
+from replay import JournalState
+
+
+def percentile(samples, fraction):
+	"""Nearest-rank percentile of a sorted list"""
+	if not samples:
+		return 0.0
+	return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def sale_number(embed):
+	"""Read back which generated sale an embed belongs to from its quantity field"""
+	for field in embed.get('fields', []):
+		if field.get('name', '').endswith('Quantity'):
+			return int(field['value'].split()[0].replace(',', ''))
+	return None
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--events', type=int, default=2000, help="MarketSell events to send")
+	parser.add_argument('--rate', type=float, default=0.0, help="events per second, 0 = as fast as possible")
+	parser.add_argument('--batch-window', default='3', help="cm_webhookBatchWindow for the run, in seconds")
+	parser.add_argument('--timeout', type=float, default=600.0, help="give up waiting for the queue to drain after this many seconds")
+	parser.add_argument('--url', help="webhook URL of a stub that is already running; latency is then not measured")
+	discord_stub.add_stub_arguments(parser)
+	args = parser.parse_args()
+
+	stub = None
+	webhookUrl = args.url
+	if webhookUrl is None:
+		stub = discord_stub.start_stub(limit=args.limit, window=args.window, latency=args.latency, jitter=args.jitter, fail_rate=args.fail_rate, seed=args.seed)
+		webhookUrl = f"{stub.url}/api/webhooks/1/bench-token"
+
+	config = edmc_shim.install(settings={
+		'cm_enableWebhooks': True,
+		'cm_webhookUrl': webhookUrl,
+		'cm_webhookBatchWindow': args.batch_window,
+	})
+	import load
+	load.offline = True  # No catalog or update traffic while starting
+	load.plugin_start3(config.plugin_dir)
+	# Webhooks have to go out to the stub, but sales must not fetch community goals from the internet
+	load.offline = False
+	load.fetch_community_goals_fallback = lambda: None
+
+	journal = JournalState()
+	journal.cmdr = "Bench"
+	journal.state.update({'StarSystem': "Sol", 'StationName': "Abraham Lincoln", 'ShipType': "type9", 'ShipName': "Bench Hauler"})
+	sentAt = {}
+	handling = []
+	started = time.perf_counter()
+	for number in range(1, args.events + 1):
+		if args.rate > 0:
+			delay = started + (number - 1) / args.rate - time.perf_counter()
+			if delay > 0:
+				time.sleep(delay)
+		entry = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()), 'event': 'MarketSell', 'MarketID': 128016640, 'Type': 'gold', 'Type_Localised': 'Gold', 'Count': number, 'SellPrice': 9400, 'TotalSale': 9400 * number, 'AvgPricePaid': 0}
+		journal.state['Cargo']['gold'] = number  # Something to sell
+		journal.update(entry)
+		sentAt[number] = time.time()
+		callStarted = time.perf_counter()
+		load.journal_entry(journal.cmdr, False, journal.state['StarSystem'], journal.state['StationName'], entry, journal.state)
+		handling.append(time.perf_counter() - callStarted)
+	fedIn = time.perf_counter() - started
+
+	deadline = time.monotonic() + args.timeout
+	while time.monotonic() < deadline:
+		with load.webhookCondition:
+			if not load.webhookQueued and not load.webhookInFlight:
+				break
+		time.sleep(0.05)
+	drained = time.perf_counter() - started
+	load.plugin_stop()
+
+	stats = load.webhookStats
+	handling.sort()
+	print(f"Fed {args.events:,} MarketSell events in {fedIn:.2f} s; queue drained after {drained:.2f} s")
+	print(f"journal_entry()  p50 {percentile(handling, 0.5) * 1e6:8.1f} us  p95 {percentile(handling, 0.95) * 1e6:8.1f} us  p99 {percentile(handling, 0.99) * 1e6:8.1f} us  max {handling[-1] * 1e6:8.1f} us")
+	print(f"Plugin: {stats['queued']:,} queued, {stats['sent']:,} messages sent, {stats['batched']:,} embeds batched, {stats['rateLimited']:,} rate limited, {stats['paced']:,} paced, {stats['retried']:,} retried, {stats['failed']:,} failed, {stats['dropped']:,} dropped, {stats['expired']:,} expired")
+	if stub is None:
+		return 0
+
+	latencies = []
+	delivered = set()
+	for receivedAt, _, payload in stub.received:
+		for embed in payload.get('embeds', []):
+			number = sale_number(embed)
+			if number in sentAt and number not in delivered:
+				delivered.add(number)
+				latencies.append(receivedAt - sentAt[number])
+	latencies.sort()
+	lastDelivery = max((receivedAt for receivedAt, _, _ in stub.received), default=time.time())
+	span = lastDelivery - min(sentAt.values())
+	print(f"Stub: {json.dumps(stub.stats)}")
+	print(f"Delivered {len(delivered):,} of {args.events:,} sales ({args.events - len(delivered):,} lost), {len(delivered) / span if span > 0 else 0:,.1f} sales/s, {len(stub.received) / span if span > 0 else 0:,.2f} messages/s")
+	if latencies:
+		print(f"End to end      p50 {percentile(latencies, 0.5) * 1000:8.1f} ms  p95 {percentile(latencies, 0.95) * 1000:8.1f} ms  p99 {percentile(latencies, 0.99) * 1000:8.1f} ms  max {latencies[-1] * 1000:8.1f} ms")
+	stub.shutdown()
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())